@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Generic, Optional, TypeVar
+
+from app.core.metrics import MetricsRegistry
+from app.core.ports import AsyncRunner
+from app.core.single_flight import SingleFlight, call_key
+
+U = TypeVar("U")
+
+
+class AsyncUseCase(Generic[U]):
+    """
+    Versão awaitable de um use case síncrono: execute() roda no DBExecutor
+    (threads que leem pelas conexões do pool), sem bloquear o event loop do Flet.
+    O use case original continua em `inner` (testes, composição em transação).
+
+    Com `flights`:
+    - read_only=True: chamadas iguais e simultâneas viram uma execução só
+    - read_only=False (escrita): ao terminar, invalida as leituras em andamento
+
+    Com `metrics`: "use_case.<Nome>" mede o execute() síncrono na thread do
+    banco; "use_case.<Nome>.await" o tempo visto pela UI (fila + execução).
+    """
+
+    __slots__ = ("inner", "_runner", "_flights", "_read_only", "_name", "_metrics")
+
+    def __init__(
+        self,
+        inner: U,
+        runner: AsyncRunner,
+        flights: Optional[SingleFlight] = None,
+        read_only: bool = False,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        self.inner = inner
+        self._runner = runner
+        self._flights = flights
+        self._read_only = read_only
+        self._name = type(inner).__qualname__
+        self._metrics = metrics
+
+    async def execute(self, *args: Any, **kwargs: Any) -> Any:
+        metrics = self._metrics
+        if metrics is None or not metrics.enabled:
+            return await self._execute(args, kwargs)
+        t0 = time.perf_counter()
+        try:
+            return await self._execute(args, kwargs)
+        except Exception:
+            metrics.counter(f"use_case.{self._name}.errors").inc()
+            raise
+        finally:
+            metrics.record_duration(f"use_case.{self._name}.await", t0)
+
+    async def _execute(self, args: tuple, kwargs: dict) -> Any:
+        if self._flights is None:
+            return await self._run(args, kwargs)
+
+        if self._read_only:
+            return await self._flights.do(
+                call_key(self._name, args, kwargs),
+                lambda: self._run(args, kwargs),
+            )
+
+        try:
+            return await self._run(args, kwargs)
+        finally:
+            self._flights.invalidate()
+
+    async def _run(self, args: tuple, kwargs: dict) -> Any:
+        if self._metrics is not None and self._metrics.enabled:
+            return await self._runner.run(self._timed_inner, *args, **kwargs)
+        return await self._runner.run(self.inner.execute, *args, **kwargs)  # type: ignore[attr-defined]
+
+    def _timed_inner(self, *args: Any, **kwargs: Any) -> Any:
+        # roda na thread do DBExecutor
+        with self._metrics.timer(f"use_case.{self._name}"):  # type: ignore[union-attr]
+            return self.inner.execute(*args, **kwargs)  # type: ignore[attr-defined]
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass(frozen=True, slots=True)
+class LRUStats:
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+    evictions: int
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class LRUCache(Generic[K, V]):
+    """LRU limitado e thread-safe (OrderedDict: o fim é o mais recente)."""
+
+    def __init__(self, maxsize: int = 128) -> None:
+        if maxsize < 1:
+            raise ValueError("LRUCache precisa de maxsize >= 1.")
+        self.maxsize = maxsize
+        self._data: OrderedDict[K, V] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: K) -> Optional[V]:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self._misses += 1
+                return None
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: K, value: V) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def pop(self, key: K) -> Optional[V]:
+        with self._lock:
+            return self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> LRUStats:
+        with self._lock:
+            return LRUStats(
+                size=len(self._data),
+                maxsize=self.maxsize,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+            )
+
+
+class VersionedCache(Generic[K, V]):
+    """
+    LRU de entradas versionadas (ex.: quote_id -> updated_at). Cada entrada
+    guarda várias partes derivadas da mesma versão (resumo, janelas de itens);
+    put com outra versão descarta as partes antigas.
+    """
+
+    def __init__(self, maxsize: int = 64, max_parts: int = 32) -> None:
+        self._entries: LRUCache[K, tuple[str, dict[Hashable, V]]] = LRUCache(maxsize)
+        self.max_parts = max_parts
+        self._lock = threading.Lock()
+
+    def version(self, key: K) -> Optional[str]:
+        """Versão guardada (None = nada em cache para a chave)."""
+        entry = self._entries.get(key)
+        return entry[0] if entry is not None else None
+
+    def get(self, key: K, version: str, part: Hashable) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != version:
+            return None
+        with self._lock:
+            return entry[1].get(part)
+
+    def put(self, key: K, version: str, part: Hashable, value: V) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                entry = (version, {})
+                self._entries.put(key, entry)
+            parts = entry[1]
+            parts[part] = value
+            while len(parts) > self.max_parts:
+                del parts[next(iter(parts))]
+
+    def pop(self, key: K) -> None:
+        self._entries.pop(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> LRUStats:
+        return self._entries.stats()
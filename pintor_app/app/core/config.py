@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -10,6 +11,17 @@ class AppConfig:
     data_dir: Path
     db_path: Path
     timezone: str = "America/Sao_Paulo"
+    db_readers: int = 4  # conexões somente leitura do pool
+    db_workers: int = 4  # threads do DBExecutor (leem pelas db_readers do pool)
+    # instrumenta as conexões do pool (app/db/tracing.py); desligado em produção:
+    # custa em todo statement. Ligar: PINTOR_SQL_TRACE=1, testes, benchmarks --trace
+    sql_trace: bool = False
+    sql_trace_buffer: int = 2000  # últimos statements guardados em memória
+    slow_query_ms: float = 100.0  # a partir daqui vai para o slow log
+
+    @property
+    def slow_query_log(self) -> Path:
+        return self.data_dir / "slow_queries.log"
 
 
 def load_config() -> AppConfig:
@@ -17,4 +29,9 @@ def load_config() -> AppConfig:
     project_root = Path(__file__).resolve().parents[2]
     data_dir = project_root / "data"
     db_path = data_dir / "app.db"
-    return AppConfig(project_root=project_root, data_dir=data_dir, db_path=db_path)
+    return AppConfig(
+        project_root=project_root,
+        data_dir=data_dir,
+        db_path=db_path,
+        sql_trace=os.environ.get("PINTOR_SQL_TRACE") == "1",
+    )
@@ -21,3 +21,29 @@ class QuoteDetailsDTO:
     materials_included: bool
     total_sale_cents: int
     items: list[QuoteItemDTO]
+    notes_client: str = ""
+    notes_internal: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class QuoteSummaryDTO:
+    """Cabeçalho e totais sem itens (itens vêm por janela/página)."""
+
+    id: str
+    customer_name: str
+    status: str
+    materials_included: bool
+    subtotal_sale_cents: int
+    adjustments_cents: int
+    total_sale_cents: int
+    item_count: int
+    updated_at: str  # versão: dois summaries iguais => nada mudou
+
+
+@dataclass(frozen=True, slots=True)
+class QuoteNotesDTO:
+    """Observações do orçamento (só na abertura; fora do cabeçalho e da lista)."""
+
+    quote_id: str
+    notes_client: str
+    notes_internal: str
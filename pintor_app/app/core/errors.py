@@ -8,3 +8,7 @@ class ValidationError(ApplicationError):
 
 class NotFoundError(ApplicationError):
     pass
+
+
+class ConsistencyError(ApplicationError):
+    pass
@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import functools
+import inspect
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# HDR simplificado: 64 sub-buckets por potência de 2 (erro relativo < 1,6%),
+# valores até 127 exatos. Índice e limite do bucket são só operações de bits.
+_SUB_BITS = 6
+_SUB = 1 << _SUB_BITS
+
+
+def _bucket(value: int) -> int:
+    if value < 2 * _SUB:
+        return value
+    shift = value.bit_length() - _SUB_BITS - 1
+    return (shift + 1) * _SUB + (value >> shift) - _SUB
+
+
+def _bucket_value(index: int) -> int:
+    """Maior valor que cai no bucket (como no HDR: percentil nunca subestima)."""
+    if index < 2 * _SUB:
+        return index
+    shift = index // _SUB - 1
+    sub = index % _SUB + _SUB
+    return ((sub + 1) << shift) - 1
+
+
+@dataclass(frozen=True, slots=True)
+class HistogramSnapshot:
+    name: str
+    unit: str
+    count: int
+    total: int
+    min: int
+    max: int
+    p50: int
+    p95: int
+    p99: int
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class Histogram:
+    """
+    Histograma de inteiros não negativos (tempo em µs, contagem de controles...):
+    buckets esparsos log-lineares, record() O(1), memória limitada pela faixa
+    de valores (não pelo número de amostras).
+    """
+
+    __slots__ = ("name", "unit", "_lock", "_counts", "_count", "_total", "_min", "_max")
+
+    def __init__(self, name: str, unit: str = "us") -> None:
+        self.name = name
+        self.unit = unit
+        self._lock = threading.Lock()
+        self._counts: dict[int, int] = {}
+        self._count = 0
+        self._total = 0
+        self._min = 0
+        self._max = 0
+
+    def record(self, value: int) -> None:
+        value = int(value) if value > 0 else 0
+        b = _bucket(value)
+        with self._lock:
+            self._counts[b] = self._counts.get(b, 0) + 1
+            if self._count == 0 or value < self._min:
+                self._min = value
+            if value > self._max:
+                self._max = value
+            self._count += 1
+            self._total += value
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def percentile(self, q: float) -> int:
+        with self._lock:
+            return self._percentiles((q,))[0]
+
+    def snapshot(self) -> HistogramSnapshot:
+        with self._lock:
+            p50, p95, p99 = self._percentiles((50.0, 95.0, 99.0))
+            return HistogramSnapshot(
+                name=self.name,
+                unit=self.unit,
+                count=self._count,
+                total=self._total,
+                min=self._min,
+                max=self._max,
+                p50=p50,
+                p95=p95,
+                p99=p99,
+            )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self._count = self._total = self._min = self._max = 0
+
+    def _percentiles(self, qs: tuple[float, ...]) -> list[int]:
+        # chamado com o lock; qs em ordem crescente
+        if self._count == 0:
+            return [0] * len(qs)
+        targets = [max(1, -(-self._count * q // 100)) for q in qs]  # ceil
+        out: list[int] = []
+        seen = 0
+        it = iter(sorted(self._counts.items()))
+        b = 0
+        for target in targets:
+            while seen < target:
+                b, n = next(it)
+                seen += n
+            # limite do bucket, sem passar do máximo observado
+            out.append(min(_bucket_value(b), self._max))
+        return out
+
+
+class Counter:
+    __slots__ = ("name", "_lock", "value")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self.value = 0
+
+    def inc(self, n: int = 1) -> None:
+        with self._lock:
+            self.value += n
+
+
+class MetricsRegistry:
+    """
+    Métricas do processo (compartilhadas por todas as sessões, via metrics_for):
+    - histogram(name): criado no primeiro uso; timer()/timed() gravam em µs
+    - counter(name): contadores simples (erros, cancelamentos)
+    enabled=False desliga a coleta (timer/timed viram quase no-op).
+    """
+
+    def __init__(self) -> None:
+        self.enabled = True
+        self._lock = threading.Lock()
+        self._histograms: dict[str, Histogram] = {}
+        self._counters: dict[str, Counter] = {}
+
+    def histogram(self, name: str, unit: str = "us") -> Histogram:
+        h = self._histograms.get(name)
+        if h is None:
+            with self._lock:
+                h = self._histograms.setdefault(name, Histogram(name, unit))
+        return h
+
+    def counter(self, name: str) -> Counter:
+        c = self._counters.get(name)
+        if c is None:
+            with self._lock:
+                c = self._counters.setdefault(name, Counter(name))
+        return c
+
+    def record_duration(self, name: str, started: float) -> None:
+        """started = time.perf_counter() do início."""
+        self.histogram(name).record(int((time.perf_counter() - started) * 1_000_000))
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_duration(name, t0)
+
+    def timed(self, name: Optional[str] = None) -> Callable[[F], F]:
+        """Decorator (sync ou async); nome padrão: __qualname__ da função."""
+
+        def decorate(fn: F) -> F:
+            metric = name or fn.__qualname__
+
+            if inspect.iscoroutinefunction(fn):
+
+                @functools.wraps(fn)
+                async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                    if not self.enabled:
+                        return await fn(*args, **kwargs)
+                    t0 = time.perf_counter()
+                    try:
+                        return await fn(*args, **kwargs)
+                    finally:
+                        self.record_duration(metric, t0)
+
+                return async_wrapper  # type: ignore[return-value]
+
+            @functools.wraps(fn)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                t0 = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.record_duration(metric, t0)
+
+            return wrapper  # type: ignore[return-value]
+
+        return decorate
+
+    def snapshot(self) -> list[HistogramSnapshot]:
+        with self._lock:
+            histograms = list(self._histograms.values())
+        return sorted((h.snapshot() for h in histograms), key=lambda s: s.name)
+
+    def counters(self) -> dict[str, int]:
+        with self._lock:
+            return {name: c.value for name, c in sorted(self._counters.items())}
+
+    def reset(self) -> None:
+        with self._lock:
+            histograms = list(self._histograms.values())
+            counters = list(self._counters.values())
+        for h in histograms:
+            h.reset()
+        for c in counters:
+            with c._lock:
+                c.value = 0
+
+
+# ---------- registro compartilhado por dono (ex.: o pool do processo) ----------
+
+_shared_lock = threading.Lock()
+_shared: "weakref.WeakKeyDictionary[object, MetricsRegistry]" = weakref.WeakKeyDictionary()
+
+
+def metrics_for(owner: object) -> MetricsRegistry:
+    with _shared_lock:
+        registry = _shared.get(owner)
+        if registry is None:
+            registry = MetricsRegistry()
+            _shared[owner] = registry
+        return registry
@@ -1,16 +1,13 @@
 # core/money_calc.py
-from decimal import Decimal, ROUND_HALF_UP
+from decimal import Decimal
+
+from app.domain.pricing import line_subtotal_cents, mul_decimal_cents
 
 
 def subtotal_cents(price_cents: int, qty: Decimal) -> int:
-    # price_cents * qty => Decimal de cents
-    raw = (Decimal(price_cents) * qty)
-    rounded = raw.quantize(Decimal("1"), rounding=ROUND_HALF_UP)
-    return int(rounded)
+    # price_cents * qty arredondado ROUND_HALF_UP, em inteiros (app/domain/pricing.py)
+    return mul_decimal_cents(price_cents, qty)
 
-# app/domain/money.py  (adição segura)
 
-def mul_decimal(self, qty: Decimal) -> "Money":
-    raw = Decimal(self.cents) * qty
-    rounded = raw.quantize(Decimal("1"), rounding=ROUND_HALF_UP)
-    return Money(int(rounded))
+def subtotal_cents_thousandths(price_cents: int, qty_thousandths: int) -> int:
+    return line_subtotal_cents(price_cents, qty_thousandths)
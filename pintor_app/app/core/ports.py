@@ -1,5 +1,24 @@
 from __future__ import annotations
-from typing import Protocol, Optional
+from typing import Awaitable, Callable, Protocol, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class UnitOfWork(Protocol):
+    """
+    Executa `work` numa única transação de escrita (BEGIN IMMEDIATE ... COMMIT).
+    Tudo que os repositórios fizerem dentro de `work` é atômico; exceção => rollback.
+    """
+
+    def run(self, work: Callable[[], T]) -> T:
+        ...
+
+
+class AsyncRunner(Protocol):
+    """Roda trabalho bloqueante (SQLite) fora do event loop e devolve um awaitable."""
+
+    def run(self, fn: Callable[..., T], *args, **kwargs) -> Awaitable[T]:
+        ...
 
 
 class ServicesRepositoryPort(Protocol):
@@ -15,9 +34,33 @@ class QuickQuotesRepositoryPort(Protocol):
     def get_by_id(self, quote_id: str):
         ...
 
+    def get_updated_at(self, quote_id: str) -> str:
+        ...
+
+    def add_change_listener(self, fn: Callable[[str], None]) -> None:
+        ...
+
     def list_history(self, status: Optional[str] = None, limit: int = 50):
         ...
 
+    def list_history_page(self, status: Optional[str] = None, limit: int = 50, cursor: Optional[str] = None):
+        ...
+
+    def iter_history(self, status: Optional[str] = None, chunk_size: int = 200):
+        ...
+
+    def list_history_summaries(self, status: Optional[str] = None, limit: int = 50, cursor: Optional[str] = None):
+        ...
+
+    def get_notes(self, quote_id: str):
+        ...
+
+    def search_quotes(self, text: str, limit: int = 20, offset: int = 0):
+        ...
+
+    def rebuild_search_index(self) -> None:
+        ...
+
     def update_status(self, quote_id: str, status: str) -> None:
         ...
 
@@ -27,13 +70,22 @@ class QuickQuotesRepositoryPort(Protocol):
     def set_totals(self, quote_id: str, subtotal_sale_cents: int, adjustments_cents: int, total_sale_cents: int) -> None:
         ...
 
+    def set_totals_many(self, rows) -> int:
+        ...
+
+    def load_totals_columns(self, after_id: Optional[str] = None, limit: int = 500):
+        ...
+
+    def apply_totals_delta(self, quote_id: str, subtotal_delta_cents: int, adjustments_delta_cents: int) -> None:
+        ...
+
     # Items
     def add_item(
         self,
         quote_id: str,
         service_name: str,
         unit: str,
-        quantity: int,
+        quantity_thousandths: int,
         unit_price_cents: int,
         adjustment_cents: int = 0,
         description_client: str = "",
@@ -41,8 +93,35 @@ class QuickQuotesRepositoryPort(Protocol):
     ) -> str:
         ...
 
+    def add_items_many(self, quote_id: str, items) -> list[str]:
+        ...
+
     def list_items(self, quote_id: str):
         ...
 
+    def count_items(self, quote_id: str) -> int:
+        ...
+
+    def list_items_window(self, quote_id: str, offset: int = 0, limit: int = 100):
+        ...
+
+    def get_items_window(self, quote_id: str, offset: int = 0, limit: int = 100):
+        ...
+
+    def list_items_page(self, quote_id: str, limit: int = 200, after_position: Optional[int] = None):
+        ...
+
+    def iter_items(self, quote_id: str, chunk_size: int = 500):
+        ...
+
+    def get_item(self, item_id: str):
+        ...
+
+    def delete_item(self, item_id: str) -> None:
+        ...
+
+    def get_quote_summary(self, quote_id: str):
+        ...
+
     def get_quote_with_items(self, quote_id: str):
         ...
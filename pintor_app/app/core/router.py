@@ -1,5 +1,8 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
 import flet as ft
-from typing import Callable, Dict, Optional
 
 from app.ui.pages.home_page import HomePage
 from app.ui.pages.login_page import LoginPage
@@ -18,49 +21,116 @@ from app.ui.controllers.quote_edit_controller import QuoteEditController
 # NOVO
 
 from app.ui.pages.settings_page import SettingsPage
+from app.ui.pages.perf_page import PerfPage
+
+from app.ui.pages.quick_quote_history_page import QuickQuoteHistoryPage
+from app.ui.viewmodels.quote_history_vm import QuoteHistoryVM
+from app.ui.controllers.quick_quote_history_controller import QuickQuoteHistoryController
+
+
+@dataclass(slots=True)
+class _View:
+    control: ft.Control
+    controller: Any = None  # quem recebe on_route_reenter (opcional)
 
 
 class Router:
-    def __init__(self, page: ft.Page, routes: Dict[str, Callable[[], ft.Control]]):
+    """
+    Navegação por path com cache keep-alive:
+    - rotas marcadas com keep_alive(...) guardam a view montada (LRU, max_alive)
+    - voltar para uma delas reaproveita controles/VM/controller e chama
+      on_route_reenter() (checagem barata de frescor) em vez de remontar
+    - evict()/go(rebuild=True) descartam a view guardada
+    """
+
+    def __init__(self, page: ft.Page, routes: Dict[str, Callable[[], ft.Control]], max_alive: int = 8):
         self.page = page
         self.routes = routes
         self.container: ft.Container | None = None
         self.current_path: str = "/"
+        self.max_alive = max_alive
+        self._keep_alive_keys: set[str] = set()
+        self._alive: "OrderedDict[str, _View]" = OrderedDict()
 
     def set_container(self, container: ft.Container):
         self.container = container
 
-    def go(self, path: str):
+    def keep_alive(self, *route_keys: str) -> None:
+        """Opt-in por rota: path fixo ("/history") ou padrão ("/quotes/{id}")."""
+        self._keep_alive_keys.update(route_keys)
+
+    def evict(self, path: str) -> None:
+        self._alive.pop(path, None)
+
+    def go(self, path: str, rebuild: bool = False):
         self.current_path = path
+        if rebuild:
+            self.evict(path)
+
+        view = self._alive.get(path)
+        if view is not None:
+            self._alive.move_to_end(path)
+            self._show(view.control)
+            self._reenter(view)
+            return
+
         view = self._resolve(path)
-        if self.container:
-            self.container.content = view
-            self.page.update()
+        if self._route_key(path) in self._keep_alive_keys:
+            self._alive[path] = view
+            while len(self._alive) > self.max_alive:
+                self._alive.popitem(last=False)
+        self._show(view.control)
 
     def refresh(self):
+        # view guardada: só checa frescor; demais: remonta
         self.go(self.current_path)
 
-    def _resolve(self, path: str) -> ft.Control:
+    def _show(self, control: ft.Control) -> None:
+        if self.container:
+            self.container.content = control
+            self.page.update()
+
+    def _reenter(self, view: _View) -> None:
+        hook = getattr(view.controller, "on_route_reenter", None) or getattr(view.control, "on_route_reenter", None)
+        if hook is not None:
+            hook()
+
+    def _route_key(self, path: str) -> str:
+        if path in self.routes:
+            return path
+        if self._match_quote_edit(path):
+            return "/quotes/{id}/edit"
+        if self._match_quote_details(path):
+            return "/quotes/{id}"
+        return path
+
+    def _resolve(self, path: str) -> _View:
         builder = self.routes.get(path)
         if builder:
-            return builder()
+            built = builder()
+            # builder pode devolver (control, controller) para receber on_route_reenter
+            if isinstance(built, tuple):
+                return _View(*built)
+            return _View(built)
 
         edit_id = self._match_quote_edit(path)
         if edit_id:
             vm = QuoteEditVM(items=[])
             controller = QuoteEditController(self.page, vm, edit_id)
-            return QuoteEditPage(self.page, self, vm, controller)
+            return _View(QuoteEditPage(self.page, self, vm, controller), controller)
 
         quote_id = self._match_quote_details(path)
         if quote_id:
             vm = QuoteDetailsVM(items=[])
             controller = QuoteDetailsController(self.page, vm, quote_id)
-            return QuoteDetailsPage(self.page, self, vm, controller)
-
-        return ft.Container(
-            expand=True,
-            alignment=ft.Alignment.CENTER,
-            content=ft.Text(f"404 — rota não encontrada: {path}"),
+            return _View(QuoteDetailsPage(self.page, self, vm, controller), controller)
+
+        return _View(
+            ft.Container(
+                expand=True,
+                alignment=ft.Alignment.CENTER,
+                content=ft.Text(f"404 — rota não encontrada: {path}"),
+            )
         )
 
     def _match_quote_details(self, path: str) -> Optional[str]:
@@ -89,4 +159,17 @@ def build_router(page: ft.Page) -> Router:
     # NOVA ROTA
     routes["/settings"] = lambda: SettingsPage(page)
 
+    def history_page():
+        vm = QuoteHistoryVM()
+        controller = QuickQuoteHistoryController(page, vm)
+        return QuickQuoteHistoryPage(page, router, vm, controller), controller
+
+    routes["/history"] = history_page
+
+    # rota de diagnóstico, sem link no menu (p50/p95/p99 por operação, SQL)
+    routes["/debug/perf"] = lambda: PerfPage(page)
+
+    # views mantidas vivas (voltar para elas não remonta nem reconsulta tudo)
+    router.keep_alive("/history", "/settings", "/quotes/{id}", "/quotes/{id}/edit")
+
     return router
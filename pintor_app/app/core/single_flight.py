@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True, slots=True)
+class SingleFlightStats:
+    executions: int
+    shared: int  # chamadas que pegaram carona numa execução em andamento
+    in_flight: int
+
+
+class SingleFlight:
+    """
+    Coalescência de leituras concorrentes: chamadas com a mesma chave, enquanto
+    a primeira ainda roda, aguardam o mesmo resultado (uma query só).
+    - por event loop (asyncio.Task não atravessa loops)
+    - shield: cancelar um dos interessados não cancela a execução dos outros
+    - invalidate(): depois de uma escrita, novas chamadas não reaproveitam
+      execuções que começaram antes dela (read-your-writes)
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[Hashable, asyncio.Task]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._executions = 0
+        self._shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            flights = self._flights.setdefault(loop, {})
+            task = flights.get(key)
+            if task is None:
+                task = loop.create_task(fn())
+                flights[key] = task
+                task.add_done_callback(lambda t: self._forget(loop, key, t))
+                self._executions += 1
+            else:
+                self._shared += 1
+        return await asyncio.shield(task)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            for flights in self._flights.values():
+                flights.clear()
+
+    def stats(self) -> SingleFlightStats:
+        with self._lock:
+            return SingleFlightStats(
+                executions=self._executions,
+                shared=self._shared,
+                in_flight=sum(len(f) for f in self._flights.values()),
+            )
+
+    def _forget(self, loop: asyncio.AbstractEventLoop, key: Hashable, task: asyncio.Task) -> None:
+        with self._lock:
+            flights = self._flights.get(loop)
+            if flights is not None and flights.get(key) is task:
+                del flights[key]
+        if not task.cancelled():
+            task.exception()  # marca como observada (sem "exception was never retrieved")
+
+
+def call_key(name: str, args: tuple[Any, ...], kwargs: dict[str, Any]) -> Hashable:
+    return (name, args, tuple(sorted(kwargs.items())))
+
+
+# ---------- uma instância por pool: sessões do mesmo banco coalescem juntas ----------
+
+_shared_lock = threading.Lock()
+_shared: "weakref.WeakKeyDictionary[object, SingleFlight]" = weakref.WeakKeyDictionary()
+
+
+def single_flight_for(owner: object) -> SingleFlight:
+    with _shared_lock:
+        flights = _shared.get(owner)
+        if flights is None:
+            flights = SingleFlight()
+            _shared[owner] = flights
+        return flights
@@ -1,69 +1,141 @@
 from __future__ import annotations
 
-import sqlite3
-from dataclasses import dataclass
-
-from app.core.config import load_config
-from app.db.database import connect_sqlite
+from dataclasses import dataclass, field
+from typing import Optional
+
+from app.core.async_use_case import AsyncUseCase
+from app.core.cache import VersionedCache
+from app.core.config import AppConfig, load_config
+from app.core.metrics import MetricsRegistry, metrics_for
+from app.core.single_flight import SingleFlight, single_flight_for
+from app.db.executor import DBExecutor, db_executor_for
+from app.db.pool import SQLitePool, release_shared_pool, shared_pool
+from app.db.tracing import SQLTracer
+from app.db.unit_of_work import SQLiteUnitOfWork
 
 from app.db.repos.services_repo import ServicesRepo
+from app.db.repos.services_cache import CachedServicesRepo
 from app.db.repos.quick_quotes_repo import QuickQuotesRepo
 
 from app.core.use_cases.create_quick_quote_draft import CreateQuickQuoteDraft
 from app.core.use_cases.add_item_to_quote import AddItemToQuote
-from app.core.use_cases.get_quote_details import GetQuoteDetails
+from app.core.use_cases.add_items_to_quote import AddItemsToQuote
+from app.core.use_cases.get_quote_notes import GetQuoteNotes
+from app.core.use_cases.get_quote_summary import GetQuoteSummary
+from app.core.use_cases.list_quote_history import ListQuoteHistory
+from app.core.use_cases.list_quote_items import ListQuoteItems
+from app.core.use_cases.search_quotes import SearchQuotes
+from app.core.use_cases.remove_item_from_quote import RemoveItemFromQuote
+from app.core.use_cases.recalculate_quote_totals import RecalculateQuoteTotals
+from app.core.use_cases.recalculate_all_totals import RecalculateAllTotals
 
 # NOVOS USE CASES
 from app.core.use_cases.list_services import ListServicesUseCase
+from app.core.use_cases.search_services import SearchServicesUseCase
 from app.core.use_cases.create_service import CreateServiceUseCase
 from app.core.use_cases.delete_service import DeleteServiceUseCase
 
 
 @dataclass(slots=True)
 class AppContainer:
-    conn: sqlite3.Connection
+    pool: SQLitePool
+    db: DBExecutor
+    flights: SingleFlight
+    metrics: MetricsRegistry
 
     services_repo: ServicesRepo
     quotes_repo: QuickQuotesRepo
 
-    create_quick_quote_draft: CreateQuickQuoteDraft
-    add_item_to_quote: AddItemToQuote
-    get_quote_details: GetQuoteDetails
+    # use cases expostos à UI já awaitable (rodam no DBExecutor, fora do event loop);
+    # o use case síncrono fica em `.inner`
+    create_quick_quote_draft: AsyncUseCase[CreateQuickQuoteDraft]
+    add_item_to_quote: AsyncUseCase[AddItemToQuote]
+    add_items_to_quote: AsyncUseCase[AddItemsToQuote]
+    remove_item_from_quote: AsyncUseCase[RemoveItemFromQuote]
+    recalculate_quote_totals: AsyncUseCase[RecalculateQuoteTotals]
+    recalculate_all_totals: AsyncUseCase[RecalculateAllTotals]
+    get_quote_summary: AsyncUseCase[GetQuoteSummary]
+    get_quote_notes: AsyncUseCase[GetQuoteNotes]
+    list_quote_items: AsyncUseCase[ListQuoteItems]
+    list_quote_history: AsyncUseCase[ListQuoteHistory]
+    search_quotes: AsyncUseCase[SearchQuotes]
 
     # NOVOS
-    list_services: ListServicesUseCase
-    create_service: CreateServiceUseCase
-    delete_service: DeleteServiceUseCase
-
-    @classmethod
-    def build(cls) -> "AppContainer":
-        cfg = load_config()
-        conn = connect_sqlite(cfg.db_path)
+    list_services: AsyncUseCase[ListServicesUseCase]
+    search_services: AsyncUseCase[SearchServicesUseCase]
+    create_service: AsyncUseCase[CreateServiceUseCase]
+    delete_service: AsyncUseCase[DeleteServiceUseCase]
 
-        services_repo = ServicesRepo(conn)
-        quotes_repo = QuickQuotesRepo(conn)
+    _closed: bool = field(default=False, init=False)
 
-        # NOVOS USE CASES
-        list_services = ListServicesUseCase(services_repo)
-        create_service = CreateServiceUseCase(services_repo)
-        delete_service = DeleteServiceUseCase(services_repo)
+    @classmethod
+    def build(cls, cfg: Optional[AppConfig] = None) -> "AppContainer":
+        # cfg explícito: ferramentas (load replay) apontando para outro banco
+        cfg = cfg or load_config()
+        tracer = (
+            SQLTracer(
+                capacity=cfg.sql_trace_buffer,
+                slow_ms=cfg.slow_query_ms,
+                slow_log_path=cfg.slow_query_log,
+            )
+            if cfg.sql_trace
+            else None
+        )
+        # pool compartilhado entre todas as sessões do processo
+        pool = shared_pool(cfg.db_path, readers=cfg.db_readers, tracer=tracer)
+        db = db_executor_for(pool, workers=cfg.db_workers)
+        # leituras iguais e simultâneas (de qualquer sessão) viram uma query só
+        flights = single_flight_for(pool)
+        # latências (use cases, cargas, renders) somadas de todas as sessões
+        metrics = metrics_for(pool)
+
+        # catálogo em memória, compartilhado por todas as sessões do mesmo pool
+        services_repo = CachedServicesRepo(pool)
+        quotes_repo = QuickQuotesRepo(pool)
+        uow = SQLiteUnitOfWork(pool)
+        # resumo, observações e janelas de itens já montados, por (quote_id, updated_at)
+        quote_views: VersionedCache = VersionedCache(maxsize=64)
+        quotes_repo.add_change_listener(quote_views.pop)
+
+        def wrap(use_case):
+            # escrita: invalida as leituras em andamento ao terminar
+            return AsyncUseCase(use_case, db, flights=flights, metrics=metrics)
+
+        def wrap_read(use_case):
+            return AsyncUseCase(use_case, db, flights=flights, read_only=True, metrics=metrics)
 
         return cls(
-            conn=conn,
+            pool=pool,
+            db=db,
+            flights=flights,
+            metrics=metrics,
             services_repo=services_repo,
             quotes_repo=quotes_repo,
-            create_quick_quote_draft=CreateQuickQuoteDraft(quotes_repo),
-            add_item_to_quote=AddItemToQuote(quotes_repo),
-            get_quote_details=GetQuoteDetails(quotes_repo),
+            create_quick_quote_draft=wrap(CreateQuickQuoteDraft(quotes_repo, uow)),
+            add_item_to_quote=wrap(AddItemToQuote(quotes_repo, uow)),
+            add_items_to_quote=wrap(AddItemsToQuote(quotes_repo, uow)),
+            remove_item_from_quote=wrap(RemoveItemFromQuote(quotes_repo, uow)),
+            recalculate_quote_totals=wrap(RecalculateQuoteTotals(quotes_repo, uow)),
+            recalculate_all_totals=wrap(RecalculateAllTotals(quotes_repo, uow)),
+            get_quote_summary=wrap_read(GetQuoteSummary(quotes_repo, quote_views)),
+            get_quote_notes=wrap_read(GetQuoteNotes(quotes_repo, quote_views)),
+            list_quote_items=wrap_read(ListQuoteItems(quotes_repo, quote_views)),
+            list_quote_history=wrap_read(ListQuoteHistory(quotes_repo)),
+            search_quotes=wrap_read(SearchQuotes(quotes_repo)),
 
             # NOVOS
-            list_services=list_services,
-            create_service=create_service,
-            delete_service=delete_service,
+            list_services=wrap_read(ListServicesUseCase(services_repo)),
+            search_services=wrap_read(SearchServicesUseCase(services_repo)),
+            create_service=wrap(CreateServiceUseCase(services_repo, uow)),
+            delete_service=wrap(DeleteServiceUseCase(services_repo, uow)),
         )
 
     def close(self) -> None:
+        # uma referência do pool compartilhado por container: liberar uma vez só
+        if self._closed:
+            return
+        self._closed = True
         try:
-            self.conn.close()
+            release_shared_pool(self.pool)
         except Exception:
             pass
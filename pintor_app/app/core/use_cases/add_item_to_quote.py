@@ -2,9 +2,9 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 from app.core.errors import ValidationError, NotFoundError
-from app.core.ports import QuickQuotesRepositoryPort
+from app.core.ports import QuickQuotesRepositoryPort, UnitOfWork
+from app.core.use_cases.recalculate_quote_totals import RecalculateQuoteTotals
 from app.domain.money import Money
-from app.domain.models import QuoteItem, calculate_quote_totals
 from decimal import Decimal
 from app.domain.quantity import Quantity
 
@@ -21,70 +21,101 @@ class AddItemToQuoteInput:
     description_client: str = ""
 
 
+UNITS = ("M2", "DAY", "ROOM", "UNIT")
+MAX_THOUSANDTHS = 2**63 - 1
+
+
+def _as_decimal(quantity: Decimal) -> Decimal:
+    if isinstance(quantity, Decimal):
+        return quantity
+    try:
+        return Decimal(str(quantity))
+    except (ArithmeticError, ValueError):
+        raise ValidationError("Quantidade inválida.") from None
+
+
+def validate_item_line(service_name: str, quantity: Decimal, unit_price_cents: int) -> None:
+    if (service_name or "").strip() == "":
+        raise ValidationError("Nome do serviço é obrigatório.")
+
+    # float/str viram Decimal antes: NaN/Infinity (ex.: colado de planilha)
+    # não comparam com "> 0"
+    quantity = _as_decimal(quantity)
+    if not quantity.is_finite():
+        raise ValidationError("Quantidade inválida.")
+
+    if quantity <= 0:
+        raise ValidationError("Quantidade deve ser maior que zero.")
+
+    if unit_price_cents < 0:
+        raise ValidationError("Preço unitário inválido.")
+
+
+def normalize_unit(unit: str) -> str:
+    code = (unit or "").strip().upper()
+    if code not in UNITS:
+        raise ValidationError(f"Unidade inválida: {unit!r} (use {', '.join(UNITS)}).")
+    return code
+
+
+def to_quantity(quantity: Decimal, unit: str) -> Quantity:
+    qty = Quantity.from_decimal(_as_decimal(quantity), unit=unit)
+    if qty.thousandths > MAX_THOUSANDTHS:
+        # não cabe no INTEGER do SQLite
+        raise ValidationError("Quantidade inválida.")
+    return qty
+
+
 class AddItemToQuote:
-    def __init__(self, quotes_repo: QuickQuotesRepositoryPort) -> None:
+    def __init__(
+        self,
+        quotes_repo: QuickQuotesRepositoryPort,
+        uow: UnitOfWork,
+        verify_totals: bool = False,
+    ) -> None:
         self.quotes_repo = quotes_repo
+        self.uow = uow
+        # verify_totals=True: confere o delta com o recálculo completo (O(N));
+        # divergência levanta ConsistencyError e desfaz a transação
+        self.verify_totals = verify_totals
+        self._recalculate = RecalculateQuoteTotals(quotes_repo, uow)
 
     def execute(self, inp: AddItemToQuoteInput) -> str:
         if not (inp.quote_id or "").strip():
             raise ValidationError("quote_id é obrigatório.")
 
-        if (inp.service_name or "").strip() == "":
-            raise ValidationError("Nome do serviço é obrigatório.")
+        validate_item_line(inp.service_name, inp.quantity, inp.unit_price_cents)
+        # mesmo código de unidade que a colagem grava ("m2" -> "M2")
+        unit = normalize_unit(inp.unit)
+        qty = to_quantity(inp.quantity, unit)
 
-        if inp.quantity <= 0:
-            raise ValidationError("Quantidade deve ser maior que zero.")
+        # item + totals numa única transação (um fsync, totals nunca ficam velhos)
+        return self.uow.run(lambda: self._add_and_apply_delta(inp, unit, qty))
 
-        if inp.unit_price_cents < 0:
-            raise ValidationError("Preço unitário inválido.")
+    def _add_and_apply_delta(self, inp: AddItemToQuoteInput, unit: str, qty: Quantity) -> str:
+        line_subtotal = Money(int(inp.unit_price_cents)).mul_thousandths(qty.thousandths)
 
-        # garante que quote existe
+        # delta primeiro: o UPDATE também garante que o quote existe
         try:
-            self.quotes_repo.get_by_id(inp.quote_id)
+            self.quotes_repo.apply_totals_delta(
+                quote_id=inp.quote_id,
+                subtotal_delta_cents=line_subtotal.cents,
+                adjustments_delta_cents=int(inp.adjustment_cents),
+            )
         except ValueError:
             raise NotFoundError("Orçamento não encontrado.")
 
-        # adiciona item no repositório
-        qty_dec = inp.quantity if isinstance(inp.quantity, Decimal) else Decimal(str(inp.quantity))
-        qty = Quantity.from_decimal(qty_dec, unit=inp.unit)
-
-
         item_id = self.quotes_repo.add_item(
             quote_id=inp.quote_id,
             service_name=inp.service_name.strip(),
-            unit=inp.unit,
+            unit=unit,
             quantity_thousandths=qty.to_thousandths(),
             unit_price_cents=int(inp.unit_price_cents),
             adjustment_cents=int(inp.adjustment_cents),
             description_client=inp.description_client or "",
         )
 
-        # recalcula totals a partir dos itens persistidos
-        item_rows = self.quotes_repo.list_items(inp.quote_id)
-
-        domain_items = [
-            QuoteItem(
-                id=r.id,
-                quote_id=r.quote_id,
-                service_name=r.service_name,
-                unit=r.unit,
-                quantity=Quantity.from_thousandths(int(r.quantity_thousandths), unit=r.unit),
-                unit_price=Money(int(r.unit_price_cents)),
-                adjustment=Money(int(r.adjustment_cents)),
-                description_client=r.description_client,
-            )
-            for r in item_rows
-        ]
-
-
-
-        totals = calculate_quote_totals(domain_items)
-
-        self.quotes_repo.set_totals(
-            quote_id=inp.quote_id,
-            subtotal_sale_cents=totals.subtotal_sale.cents,
-            adjustments_cents=totals.adjustments.cents,
-            total_sale_cents=totals.total_sale.cents,
-        )
+        if self.verify_totals:
+            self._recalculate.verify(inp.quote_id)
 
         return item_id
@@ -0,0 +1,123 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from decimal import Decimal
+
+from app.core.errors import ValidationError, NotFoundError
+from app.core.ports import QuickQuotesRepositoryPort, UnitOfWork
+from app.core.use_cases.add_item_to_quote import normalize_unit, to_quantity, validate_item_line
+from app.core.use_cases.recalculate_quote_totals import RecalculateQuoteTotals
+from app.domain.money import Money
+
+
+@dataclass(frozen=True, slots=True)
+class QuoteItemLine:
+    service_name: str
+    unit: str
+    quantity: Decimal
+    unit_price_cents: int
+    adjustment_cents: int = 0
+    description_client: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class AddItemsToQuoteInput:
+    quote_id: str
+    lines: list[QuoteItemLine]
+
+
+@dataclass(frozen=True, slots=True)
+class AddItemsToQuoteOutput:
+    item_ids: list[str]
+    subtotal_delta_cents: int
+    adjustments_delta_cents: int
+
+    @property
+    def added_count(self) -> int:
+        return len(self.item_ids)
+
+
+class AddItemsToQuote:
+    """
+    Adiciona várias linhas (colar planilha/importação) de uma vez:
+    - valida todas as linhas antes de gravar qualquer coisa
+    - um executemany + um único delta de totals, numa transação
+    """
+
+    def __init__(
+        self,
+        quotes_repo: QuickQuotesRepositoryPort,
+        uow: UnitOfWork,
+        verify_totals: bool = False,
+    ) -> None:
+        self.quotes_repo = quotes_repo
+        self.uow = uow
+        self.verify_totals = verify_totals
+        self._recalculate = RecalculateQuoteTotals(quotes_repo, uow)
+
+    def execute(self, inp: AddItemsToQuoteInput) -> AddItemsToQuoteOutput:
+        if not (inp.quote_id or "").strip():
+            raise ValidationError("quote_id é obrigatório.")
+
+        if not inp.lines:
+            raise ValidationError("Nenhum item para adicionar.")
+
+        rows: list[tuple[str, str, int, int, int, str]] = []
+        errors: list[str] = []
+        subtotal_delta = 0
+        adjustments_delta = 0
+
+        for n, line in enumerate(inp.lines, start=1):
+            try:
+                validate_item_line(line.service_name, line.quantity, line.unit_price_cents)
+                unit = normalize_unit(line.unit)
+                qty = to_quantity(line.quantity, unit)
+            except (ValidationError, ValueError) as e:
+                errors.append(f"Linha {n}: {e}")
+                continue
+
+            subtotal_delta += Money(int(line.unit_price_cents)).mul_thousandths(qty.thousandths).cents
+            adjustments_delta += int(line.adjustment_cents)
+            rows.append(
+                (
+                    line.service_name.strip(),
+                    unit,
+                    qty.to_thousandths(),
+                    int(line.unit_price_cents),
+                    int(line.adjustment_cents),
+                    line.description_client or "",
+                )
+            )
+
+        if errors:
+            raise ValidationError("\n".join(errors))
+
+        item_ids = self.uow.run(lambda: self._insert_all(inp.quote_id, rows, subtotal_delta, adjustments_delta))
+
+        return AddItemsToQuoteOutput(
+            item_ids=item_ids,
+            subtotal_delta_cents=subtotal_delta,
+            adjustments_delta_cents=adjustments_delta,
+        )
+
+    def _insert_all(
+        self,
+        quote_id: str,
+        rows: list[tuple[str, str, int, int, int, str]],
+        subtotal_delta: int,
+        adjustments_delta: int,
+    ) -> list[str]:
+        try:
+            self.quotes_repo.apply_totals_delta(
+                quote_id=quote_id,
+                subtotal_delta_cents=subtotal_delta,
+                adjustments_delta_cents=adjustments_delta,
+            )
+        except ValueError:
+            raise NotFoundError("Orçamento não encontrado.")
+
+        item_ids = self.quotes_repo.add_items_many(quote_id, rows)
+
+        if self.verify_totals:
+            self._recalculate.verify(quote_id)
+
+        return item_ids
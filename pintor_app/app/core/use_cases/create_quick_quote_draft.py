@@ -1,7 +1,7 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from app.core.errors import ValidationError
-from app.core.ports import QuickQuotesRepositoryPort
+from app.core.ports import QuickQuotesRepositoryPort, UnitOfWork
 
 
 @dataclass(frozen=True, slots=True)
@@ -11,16 +11,19 @@ class CreateQuickQuoteDraftInput:
 
 
 class CreateQuickQuoteDraft:
-    def __init__(self, quotes_repo: QuickQuotesRepositoryPort) -> None:
+    def __init__(self, quotes_repo: QuickQuotesRepositoryPort, uow: UnitOfWork) -> None:
         self.quotes_repo = quotes_repo
+        self.uow = uow
 
     def execute(self, inp: CreateQuickQuoteDraftInput) -> str:
         name = (inp.customer_name or "").strip()
         if not name:
             raise ValidationError("Nome do cliente é obrigatório.")
 
-        quote_id = self.quotes_repo.create_draft(
-            customer_name=name,
-            materials_included=inp.materials_included,
+        quote_id = self.uow.run(
+            lambda: self.quotes_repo.create_draft(
+                customer_name=name,
+                materials_included=inp.materials_included,
+            )
         )
         return quote_id
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+from app.core.ports import UnitOfWork
 from app.db.repos.services_repo import ServicesRepo
 
 
@@ -18,10 +19,11 @@ class CreateServiceResponse:
 
 
 class CreateServiceUseCase:
-    def __init__(self, services_repo: ServicesRepo) -> None:
+    def __init__(self, services_repo: ServicesRepo, uow: UnitOfWork) -> None:
         self._repo = services_repo
+        self._uow = uow
 
-    async def execute(self, req: CreateServiceRequest) -> CreateServiceResponse:
+    def execute(self, req: CreateServiceRequest) -> CreateServiceResponse:
         name = (req.name or "").strip()
         unit = (req.unit or "").strip()
 
@@ -32,10 +34,12 @@ class CreateServiceUseCase:
         if req.default_unit_price_cents < 0:
             raise ValueError("Preço não pode ser negativo.")
 
-        sid = self._repo.create(
-            name=name,
-            unit=unit,
-            default_unit_price_cents=req.default_unit_price_cents,
+        sid = self._uow.run(
+            lambda: self._repo.create(
+                name=name,
+                unit=unit,
+                default_unit_price_cents=req.default_unit_price_cents,
+            )
         )
 
         return CreateServiceResponse(service_id=sid)
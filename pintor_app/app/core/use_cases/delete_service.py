@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+from app.core.ports import UnitOfWork
 from app.db.repos.services_repo import ServicesRepo
 
 
@@ -16,12 +17,13 @@ class DeleteServiceResponse:
 
 
 class DeleteServiceUseCase:
-    def __init__(self, services_repo: ServicesRepo) -> None:
+    def __init__(self, services_repo: ServicesRepo, uow: UnitOfWork) -> None:
         self._repo = services_repo
+        self._uow = uow
 
-    async def execute(self, req: DeleteServiceRequest) -> DeleteServiceResponse:
+    def execute(self, req: DeleteServiceRequest) -> DeleteServiceResponse:
         if not req.service_id:
             raise ValueError("service_id é obrigatório.")
 
-        self._repo.delete(req.service_id)
+        self._uow.run(lambda: self._repo.delete(req.service_id))
         return DeleteServiceResponse(deleted=True)
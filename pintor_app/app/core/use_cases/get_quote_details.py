@@ -1,12 +1,17 @@
 from __future__ import annotations
 
-from decimal import Decimal, ROUND_HALF_UP
-
 from app.core.dtos import QuoteDetailsDTO, QuoteItemDTO
 from app.core.errors import NotFoundError
 from app.core.ports import QuickQuotesRepositoryPort
+from app.domain.pricing import THOUSANDTHS, line_total_cents
 
 class GetQuoteDetails:
+    """
+    Orçamento completo (cabeçalho + todos os itens). As telas abrem pelo
+    GetQuoteSummary + ListQuoteItems (janelas, com cache versionado); este
+    fica para quem precisa do orçamento inteiro de uma vez.
+    """
+
     def __init__(self, quotes_repo: QuickQuotesRepositoryPort) -> None:
         self.quotes_repo = quotes_repo
 
@@ -16,51 +21,52 @@ class GetQuoteDetails:
         except ValueError:
             raise NotFoundError("Orçamento não encontrado.")
 
-        item_dtos: list[QuoteItemDTO] = []
-        for it in items:
-            unit_price_cents = int(it.unit_price_cents)
-            adjustment_cents = int(it.adjustment_cents)
-
-            # aceita tanto quantity antigo quanto quantity_thousandths novo
-            qty_thousandths = getattr(it, "quantity_thousandths", None)
-            if qty_thousandths is None:
-                qty_thousandths = int(getattr(it, "quantity")) * 1000
-
-            # cálculo correto em cents usando Decimal
-            raw = Decimal(unit_price_cents) * (Decimal(int(qty_thousandths)) / Decimal(1000))
-            line_subtotal_cents = int(raw.quantize(Decimal("1"), rounding=ROUND_HALF_UP))
-            line_total = line_subtotal_cents + adjustment_cents
-
-            # para exibir no DTO, manter compatibilidade inteira
-            # valor decimal real para exibição
-            qty_thousandths = getattr(it, "quantity_thousandths", None)
-
-            if qty_thousandths is None:
-                # legado: quantity inteiro
-                display_quantity = int(getattr(it, "quantity"))
-            else:
-                if it.unit == "M2":
-                    display_quantity = float(Decimal(int(qty_thousandths)) / Decimal(1000))
-                else:
-                    display_quantity = int(int(qty_thousandths) // 1000)
-
-            item_dtos.append(
-                QuoteItemDTO(
-                    id=it.id,
-                    service_name=it.service_name,
-                    unit=it.unit,
-                    quantity=display_quantity,
-                    unit_price_cents=unit_price_cents,
-                    adjustment_cents=adjustment_cents,
-                    line_total_cents=line_total,
-                )
-            )
+        return self._build(quote, items)
 
+    def _build(self, quote, items) -> QuoteDetailsDTO:
         return QuoteDetailsDTO(
             id=quote.id,
             customer_name=quote.customer_name,
             status=quote.status,
             materials_included=bool(quote.materials_included),
             total_sale_cents=int(quote.total_sale_cents),
-            items=item_dtos,
+            items=[build_item_dto(it) for it in items],
+            notes_client=quote.notes_client,
+            notes_internal=quote.notes_internal,
         )
+
+
+def build_item_dto(it) -> QuoteItemDTO:
+    unit_price_cents = int(it.unit_price_cents)
+    adjustment_cents = int(it.adjustment_cents)
+
+    # aceita tanto quantity antigo quanto quantity_thousandths novo
+    qty_thousandths = getattr(it, "quantity_thousandths", None)
+    if qty_thousandths is None:
+        qty_thousandths = int(getattr(it, "quantity")) * 1000
+
+    # ROUND_HALF_UP em inteiros (mesmo resultado do Decimal)
+    line_total = line_total_cents(unit_price_cents, int(qty_thousandths), adjustment_cents)
+
+    # para exibir no DTO, manter compatibilidade inteira
+    # valor decimal real para exibição
+    qty_thousandths = getattr(it, "quantity_thousandths", None)
+
+    if qty_thousandths is None:
+        # legado: quantity inteiro
+        display_quantity = int(getattr(it, "quantity"))
+    else:
+        if it.unit == "M2":
+            display_quantity = int(qty_thousandths) / THOUSANDTHS
+        else:
+            display_quantity = int(int(qty_thousandths) // THOUSANDTHS)
+
+    return QuoteItemDTO(
+        id=it.id,
+        service_name=it.service_name,
+        unit=it.unit,
+        quantity=display_quantity,
+        unit_price_cents=unit_price_cents,
+        adjustment_cents=adjustment_cents,
+        line_total_cents=line_total,
+    )
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from app.core.cache import VersionedCache
+from app.core.dtos import QuoteNotesDTO
+from app.core.errors import NotFoundError
+from app.core.ports import QuickQuotesRepositoryPort
+from app.core.use_cases.get_quote_summary import current_version
+
+
+class GetQuoteNotes:
+    """
+    Observações do orçamento, lidas só quando ele é aberto (cabeçalho e
+    histórico não carregam notes_*). Com cache, reaproveita a entrada aberta
+    por GetQuoteSummary: update_notes muda updated_at e invalida.
+    """
+
+    def __init__(
+        self,
+        quotes_repo: QuickQuotesRepositoryPort,
+        cache: Optional[VersionedCache[str, object]] = None,
+    ) -> None:
+        self.quotes_repo = quotes_repo
+        self.cache = cache
+
+    def execute(self, quote_id: str) -> QuoteNotesDTO:
+        version = current_version(self.quotes_repo, self.cache, quote_id)
+        if version is not None:
+            cached = self.cache.get(quote_id, version, "notes")
+            if cached is not None:
+                return cached
+
+        try:
+            row = self.quotes_repo.get_notes(quote_id)
+        except ValueError:
+            raise NotFoundError("Orçamento não encontrado.")
+
+        dto = QuoteNotesDTO(
+            quote_id=row.quote_id,
+            notes_client=row.notes_client,
+            notes_internal=row.notes_internal,
+        )
+        if version is not None:
+            # lido depois da validação: nunca mais velho que a versão
+            self.cache.put(quote_id, version, "notes", dto)
+        return dto
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from app.core.cache import VersionedCache
+from app.core.dtos import QuoteSummaryDTO
+from app.core.errors import NotFoundError
+from app.core.ports import QuickQuotesRepositoryPort
+
+
+def current_version(
+    quotes_repo: QuickQuotesRepositoryPort, cache: Optional[VersionedCache], quote_id: str
+) -> Optional[str]:
+    """
+    Versão atual se há algo em cache para o orçamento (um SELECT updated_at pela PK);
+    None quando não há entrada (não vale pagar a validação).
+    """
+    if cache is None or cache.version(quote_id) is None:
+        return None
+    try:
+        return quotes_repo.get_updated_at(quote_id)
+    except ValueError:
+        cache.pop(quote_id)
+        raise NotFoundError("Orçamento não encontrado.")
+
+
+class GetQuoteSummary:
+    """
+    Abrir um orçamento sem carregar itens: cabeçalho, totais e item_count
+    (observações ficam em GetQuoteNotes).
+    Com cache (compartilhado com ListQuoteItems), reabrir um orçamento sem
+    mudanças custa só a validação por updated_at.
+    """
+
+    def __init__(
+        self,
+        quotes_repo: QuickQuotesRepositoryPort,
+        cache: Optional[VersionedCache[str, object]] = None,
+    ) -> None:
+        self.quotes_repo = quotes_repo
+        self.cache = cache
+
+    def execute(self, quote_id: str) -> QuoteSummaryDTO:
+        version = current_version(self.quotes_repo, self.cache, quote_id)
+        if version is not None:
+            cached = self.cache.get(quote_id, version, "summary")
+            if cached is not None:
+                return cached
+
+        try:
+            quote, item_count = self.quotes_repo.get_quote_summary(quote_id)
+        except ValueError:
+            raise NotFoundError("Orçamento não encontrado.")
+
+        dto = QuoteSummaryDTO(
+            id=quote.id,
+            customer_name=quote.customer_name,
+            status=quote.status,
+            materials_included=bool(quote.materials_included),
+            subtotal_sale_cents=int(quote.subtotal_sale_cents),
+            adjustments_cents=int(quote.adjustments_cents),
+            total_sale_cents=int(quote.total_sale_cents),
+            item_count=item_count,
+            updated_at=quote.updated_at,
+        )
+        if self.cache is not None:
+            # versão do snapshot lido
+            self.cache.put(quote_id, quote.updated_at, "summary", dto)
+        return dto
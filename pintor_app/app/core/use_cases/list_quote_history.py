@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+from app.core.errors import ValidationError
+from app.core.ports import QuickQuotesRepositoryPort
+from app.db.repos.quick_quotes_repo import QuoteSummaryRow
+
+
+@dataclass(frozen=True, slots=True)
+class ListQuoteHistoryRequest:
+    status: Optional[str] = None
+    limit: int = 50
+    cursor: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class ListQuoteHistoryResponse:
+    quotes: Sequence[QuoteSummaryRow]
+    next_cursor: Optional[str]
+
+
+class ListQuoteHistory:
+    def __init__(self, quotes_repo: QuickQuotesRepositoryPort) -> None:
+        self.quotes_repo = quotes_repo
+
+    def execute(self, req: ListQuoteHistoryRequest) -> ListQuoteHistoryResponse:
+        try:
+            page = self.quotes_repo.list_history_summaries(
+                status=req.status,
+                limit=req.limit,
+                cursor=req.cursor,
+            )
+        except ValueError:
+            raise ValidationError("Cursor do histórico inválido.")
+
+        return ListQuoteHistoryResponse(quotes=page.rows, next_cursor=page.next_cursor)
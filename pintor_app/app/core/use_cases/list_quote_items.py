@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+from app.core.cache import VersionedCache
+from app.core.dtos import QuoteItemDTO
+from app.core.errors import NotFoundError, ValidationError
+from app.core.ports import QuickQuotesRepositoryPort
+from app.core.use_cases.get_quote_details import build_item_dto
+from app.core.use_cases.get_quote_summary import current_version
+
+MAX_WINDOW = 500
+
+
+@dataclass(frozen=True, slots=True)
+class ListQuoteItemsRequest:
+    quote_id: str
+    offset: int = 0
+    limit: int = 100
+
+
+@dataclass(frozen=True, slots=True)
+class ListQuoteItemsResponse:
+    items: Sequence[QuoteItemDTO]
+    total: int  # itens do orçamento inteiro (altura da lista virtual)
+
+
+class ListQuoteItems:
+    """
+    Janela de itens de um orçamento (lista virtualizada: só o que está na tela).
+    Com cache, janelas já vistas da mesma versão voltam sem ler os itens; só
+    cacheia depois que GetQuoteSummary abriu a entrada (é quem sabe a versão).
+    """
+
+    def __init__(
+        self,
+        quotes_repo: QuickQuotesRepositoryPort,
+        cache: Optional[VersionedCache[str, object]] = None,
+    ) -> None:
+        self.quotes_repo = quotes_repo
+        self.cache = cache
+
+    def execute(self, req: ListQuoteItemsRequest) -> ListQuoteItemsResponse:
+        if req.offset < 0 or not 0 < req.limit <= MAX_WINDOW:
+            raise ValidationError("Janela de itens inválida.")
+
+        part = ("items", req.offset, req.limit)
+        version = current_version(self.quotes_repo, self.cache, req.quote_id)
+        if version is not None:
+            cached = self.cache.get(req.quote_id, version, part)
+            if cached is not None:
+                return cached
+
+        try:
+            # total e janela vêm do mesmo snapshot
+            total, rows = self.quotes_repo.get_items_window(req.quote_id, offset=req.offset, limit=req.limit)
+        except ValueError:
+            raise NotFoundError("Orçamento não encontrado.")
+
+        # tupla: a resposta pode ser compartilhada pelo cache
+        resp = ListQuoteItemsResponse(items=tuple(build_item_dto(it) for it in rows), total=total)
+        if version is not None:
+            # janela lida depois da validação: nunca mais velha que a versão
+            self.cache.put(req.quote_id, version, part, resp)
+        return resp
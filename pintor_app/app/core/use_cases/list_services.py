@@ -20,6 +20,6 @@ class ListServicesUseCase:
     def __init__(self, services_repo: ServicesRepo) -> None:
         self._repo = services_repo
 
-    async def execute(self, req: ListServicesRequest) -> ListServicesResponse:
+    def execute(self, req: ListServicesRequest) -> ListServicesResponse:
         services = self._repo.list_all()
         return ListServicesResponse(services=services)
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+from app.core.errors import ValidationError
+from app.core.ports import QuickQuotesRepositoryPort, UnitOfWork
+from app.domain.batch_totals import compute_batch_totals, normalize_quantities, numpy_available
+
+
+@dataclass(frozen=True, slots=True)
+class RecalculateAllTotalsOutput:
+    quotes_scanned: int
+    items_scanned: int
+    quotes_updated: int
+    engine: str  # "numpy" | "python"
+
+
+@dataclass(frozen=True, slots=True)
+class _ChunkResult:
+    last_id: Optional[str]
+    quotes: int
+    items: int
+    updated: int
+
+
+class RecalculateAllTotals:
+    """
+    Recalcula os totals de todos os orçamentos (mudança de regra de
+    arredondamento, correção de bug de preço):
+    - blocos de `chunk_size` orçamentos por keyset, itens já em colunas
+    - conta vetorizada (NumPy se houver) e um executemany por bloco
+    - cada bloco é lido e gravado na mesma transação (não sobrescreve item
+      adicionado no meio do caminho); só regrava quem mudou
+    """
+
+    def __init__(
+        self,
+        quotes_repo: QuickQuotesRepositoryPort,
+        uow: UnitOfWork,
+        chunk_size: int = 500,
+        use_numpy: Optional[bool] = None,
+    ) -> None:
+        if chunk_size < 1:
+            raise ValidationError("Tamanho do bloco deve ser maior que zero.")
+        self.quotes_repo = quotes_repo
+        self.uow = uow
+        self.chunk_size = chunk_size
+        self.use_numpy = numpy_available() if use_numpy is None else use_numpy
+
+    def execute(self) -> RecalculateAllTotalsOutput:
+        quotes = items = updated = 0
+        after_id: Optional[str] = None
+
+        while True:
+            res = self.uow.run(lambda: self._run_chunk(after_id))
+            if res.quotes == 0:
+                break
+            quotes += res.quotes
+            items += res.items
+            updated += res.updated
+            after_id = res.last_id
+            if res.quotes < self.chunk_size:
+                break
+
+        return RecalculateAllTotalsOutput(
+            quotes_scanned=quotes,
+            items_scanned=items,
+            quotes_updated=updated,
+            engine="numpy" if self.use_numpy else "python",
+        )
+
+    def _run_chunk(self, after_id: Optional[str]) -> _ChunkResult:
+        cols = self.quotes_repo.load_totals_columns(after_id=after_id, limit=self.chunk_size)
+        n = len(cols.quote_ids)
+        if n == 0:
+            return _ChunkResult(last_id=after_id, quotes=0, items=0, updated=0)
+
+        subtotals, adjustments = compute_batch_totals(
+            n,
+            cols.item_owner,
+            cols.unit_price_cents,
+            normalize_quantities(cols.quantity_thousandths, cols.item_unit),
+            cols.adjustment_cents,
+            use_numpy=self.use_numpy,
+        )
+
+        changed = [
+            (cols.quote_ids[i], sub, adj, sub + adj)
+            for i, (sub, adj) in enumerate(zip(subtotals, adjustments))
+            if (sub, adj, sub + adj)
+            != (cols.subtotal_sale_cents[i], cols.adjustments_cents[i], cols.total_sale_cents[i])
+        ]
+        self.quotes_repo.set_totals_many(changed)
+
+        return _ChunkResult(
+            last_id=cols.quote_ids[-1],
+            quotes=n,
+            items=len(cols.item_owner),
+            updated=len(changed),
+        )
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from app.core.errors import ConsistencyError, NotFoundError
+from app.core.ports import QuickQuotesRepositoryPort, UnitOfWork
+from app.domain.models import QuoteItem, QuoteTotals, calculate_quote_totals
+from app.domain.money import Money
+from app.domain.quantity import Quantity
+
+
+class RecalculateQuoteTotals:
+    """
+    Recalcula os totals do zero a partir dos itens persistidos.
+    Caminho de verificação/correção; o fluxo normal usa deltas (AddItemToQuote).
+    """
+
+    def __init__(self, quotes_repo: QuickQuotesRepositoryPort, uow: UnitOfWork) -> None:
+        self.quotes_repo = quotes_repo
+        self.uow = uow
+
+    def execute(self, quote_id: str) -> QuoteTotals:
+        return self.uow.run(lambda: self.recalculate(quote_id))
+
+    def recalculate(self, quote_id: str) -> QuoteTotals:
+        # sem UnitOfWork próprio: chamado também de dentro de outras transações
+        totals = self.compute(quote_id)
+
+        try:
+            self.quotes_repo.set_totals(
+                quote_id=quote_id,
+                subtotal_sale_cents=totals.subtotal_sale.cents,
+                adjustments_cents=totals.adjustments.cents,
+                total_sale_cents=totals.total_sale.cents,
+            )
+        except ValueError:
+            raise NotFoundError("Orçamento não encontrado.")
+
+        return totals
+
+    def verify(self, quote_id: str) -> QuoteTotals:
+        """
+        Confere os totals gravados (caminho por delta) com o recálculo completo.
+        Divergência => ConsistencyError; dentro de um UnitOfWork a transação é desfeita.
+        """
+        totals = self.compute(quote_id)
+        try:
+            quote = self.quotes_repo.get_by_id(quote_id)
+        except ValueError:
+            raise NotFoundError("Orçamento não encontrado.")
+
+        stored = (quote.subtotal_sale_cents, quote.adjustments_cents, quote.total_sale_cents)
+        expected = (totals.subtotal_sale.cents, totals.adjustments.cents, totals.total_sale.cents)
+        if tuple(int(v) for v in stored) != expected:
+            raise ConsistencyError(
+                f"Totais divergentes no orçamento {quote_id}: gravado {stored}, recalculado {expected}."
+            )
+        return totals
+
+    def compute(self, quote_id: str) -> QuoteTotals:
+        """Totais a partir dos itens persistidos, sem gravar."""
+        item_rows = self.quotes_repo.list_items(quote_id)
+
+        domain_items = [
+            QuoteItem(
+                id=r.id,
+                quote_id=r.quote_id,
+                service_name=r.service_name,
+                unit=r.unit,
+                quantity=Quantity.from_thousandths(int(r.quantity_thousandths), unit=r.unit),
+                unit_price=Money(int(r.unit_price_cents)),
+                adjustment=Money(int(r.adjustment_cents)),
+                description_client=r.description_client,
+            )
+            for r in item_rows
+        ]
+
+        return calculate_quote_totals(domain_items)
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from app.core.errors import NotFoundError, ValidationError
+from app.core.ports import QuickQuotesRepositoryPort, UnitOfWork
+from app.core.use_cases.recalculate_quote_totals import RecalculateQuoteTotals
+from app.domain.money import Money
+from app.domain.quantity import Quantity
+
+
+class RemoveItemFromQuote:
+    def __init__(
+        self,
+        quotes_repo: QuickQuotesRepositoryPort,
+        uow: UnitOfWork,
+        verify_totals: bool = False,
+    ) -> None:
+        self.quotes_repo = quotes_repo
+        self.uow = uow
+        self.verify_totals = verify_totals
+        self._recalculate = RecalculateQuoteTotals(quotes_repo, uow)
+
+    def execute(self, item_id: str) -> None:
+        if not (item_id or "").strip():
+            raise ValidationError("item_id é obrigatório.")
+
+        self.uow.run(lambda: self._remove_and_apply_delta(item_id))
+
+    def _remove_and_apply_delta(self, item_id: str) -> None:
+        try:
+            row = self.quotes_repo.get_item(item_id)
+        except ValueError:
+            raise NotFoundError("Item não encontrado.")
+
+        qty = Quantity.from_thousandths(int(row.quantity_thousandths), unit=row.unit)
+        line_subtotal = Money(int(row.unit_price_cents)).mul_thousandths(qty.thousandths)
+
+        self.quotes_repo.delete_item(item_id)
+        self.quotes_repo.apply_totals_delta(
+            quote_id=row.quote_id,
+            subtotal_delta_cents=-line_subtotal.cents,
+            adjustments_delta_cents=-int(row.adjustment_cents),
+        )
+
+        if self.verify_totals:
+            self._recalculate.verify(row.quote_id)
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+from app.core.errors import ValidationError
+from app.core.ports import QuickQuotesRepositoryPort
+from app.db.repos.quick_quotes_repo import QuoteSummaryRow
+
+
+@dataclass(frozen=True, slots=True)
+class SearchQuotesRequest:
+    text: str
+    limit: int = 20
+    offset: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class SearchQuotesResponse:
+    quotes: Sequence[QuoteSummaryRow]
+    next_offset: Optional[int]  # None => não há mais resultados
+
+
+class SearchQuotes:
+    def __init__(self, quotes_repo: QuickQuotesRepositoryPort) -> None:
+        self.quotes_repo = quotes_repo
+
+    def execute(self, req: SearchQuotesRequest) -> SearchQuotesResponse:
+        text = (req.text or "").strip()
+        if not text:
+            raise ValidationError("Digite algo para buscar.")
+        if req.limit <= 0 or req.offset < 0:
+            raise ValidationError("Paginação da busca inválida.")
+
+        # pede 1 a mais só para saber se existe próxima página
+        rows = self.quotes_repo.search_quotes(text, limit=req.limit + 1, offset=req.offset)
+        has_more = len(rows) > req.limit
+        return SearchQuotesResponse(
+            quotes=rows[: req.limit],
+            next_offset=req.offset + req.limit if has_more else None,
+        )
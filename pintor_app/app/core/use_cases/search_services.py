@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence
+
+from app.core.errors import ValidationError
+from app.db.repos.services_repo import ServiceRow, ServicesRepo
+
+
+@dataclass(frozen=True, slots=True)
+class SearchServicesRequest:
+    text: str
+    limit: int = 20
+
+
+@dataclass(frozen=True, slots=True)
+class SearchServicesResponse:
+    services: Sequence[ServiceRow]
+
+
+class SearchServicesUseCase:
+    """Type-ahead do catálogo: top-K por nome (índice em memória, sem acento)."""
+
+    def __init__(self, services_repo: ServicesRepo) -> None:
+        self._repo = services_repo
+
+    def execute(self, req: SearchServicesRequest) -> SearchServicesResponse:
+        if req.limit <= 0:
+            raise ValidationError("Limite da busca inválido.")
+        text = (req.text or "").strip()
+        if not text:
+            return SearchServicesResponse(services=[])
+        return SearchServicesResponse(services=self._repo.search(text, limit=req.limit))
@@ -8,15 +8,29 @@ from pathlib import Path
 import sqlite3
 from typing import Union
 
+from app.db.tracing import SQLTracer, TracedConnection
 
 
 
-def connect_sqlite(db_path: Union[str, Path]) -> sqlite3.Connection:
+
+def connect_sqlite(
+    db_path: Union[str, Path],
+    check_same_thread: bool = True,
+    tracer: Optional[SQLTracer] = None,
+) -> sqlite3.Connection:
     db_path = Path(db_path)
     db_path.parent.mkdir(parents=True, exist_ok=True)
 
     # timeout aumenta a tolerância antes de levantar "database is locked"
-    conn = sqlite3.connect(db_path, timeout=30)
+    # check_same_thread=False só para conexões do pool (acesso serializado por lock)
+    if tracer is None:
+        conn = sqlite3.connect(db_path, timeout=30, check_same_thread=check_same_thread)
+    else:
+        # conexão instrumentada: tempo/linhas/fingerprint de cada statement no tracer
+        conn = sqlite3.connect(
+            db_path, timeout=30, check_same_thread=check_same_thread, factory=TracedConnection
+        )
+        conn.attach_tracer(tracer)
 
     # se você usa acesso por nome nas rows
     conn.row_factory = sqlite3.Row
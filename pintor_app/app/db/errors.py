@@ -0,0 +1,2 @@
+class DatabaseClosedError(RuntimeError):
+    """Pool, fila de escrita ou DBExecutor já encerrados (sessão fechando)."""
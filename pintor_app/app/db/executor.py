@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, TypeVar
+
+from app.db.errors import DatabaseClosedError
+from app.db.pool import ConnectionPool
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True, slots=True)
+class ExecutorStats:
+    workers: int
+    in_flight: int
+    completed: int
+
+
+class DBExecutor:
+    """
+    Tira o SQLite do event loop do Flet:
+    - ThreadPoolExecutor com número fixo de workers
+    - leituras pegam conexão das `readers` do pool (checkout por chamada, com
+      espera medida em pool.stats()); nenhuma conexão extra por worker
+    - escritas seguem para a thread de escrita do pool (WriteQueue); o worker
+      só espera o Future, sem segurar conexão de leitura
+    - workers > readers só ajuda quando parte deles está esperando escrita
+    - run() é awaitable: o loop continua livre enquanto a query roda
+    """
+
+    def __init__(self, pool: ConnectionPool, workers: int = 4) -> None:
+        if workers < 1:
+            raise ValueError("DBExecutor precisa de pelo menos 1 worker.")
+        self.pool = pool
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="sqlite-io",
+        )
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+
+    def submit(self, fn: Callable[..., T], *args, **kwargs) -> Future:
+        try:
+            fut = self._executor.submit(fn, *args, **kwargs)
+        except RuntimeError:
+            # submit depois do shutdown (pool fechado)
+            raise DatabaseClosedError("DB executor is shut down") from None
+        with self._lock:
+            self._in_flight += 1
+        fut.add_done_callback(self._done)
+        return fut
+
+    async def run(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        fut = self.submit(functools.partial(fn, *args, **kwargs))
+        try:
+            return await asyncio.wrap_future(fut)
+        except asyncio.CancelledError:
+            task = asyncio.current_task()
+            if fut.cancelled() and not (task is not None and task.cancelling()):
+                # cancelado pelo shutdown(cancel_futures=True), não por quem espera
+                raise DatabaseClosedError("DB executor is shut down") from None
+            raise
+
+    def stats(self) -> ExecutorStats:
+        with self._lock:
+            return ExecutorStats(workers=self.workers, in_flight=self._in_flight, completed=self._completed)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _done(self, _fut: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._completed += 1
+
+
+# ---------- um executor por pool (compartilhado pelas sessões) ----------
+
+_executors_lock = threading.Lock()
+_executors: "weakref.WeakKeyDictionary[ConnectionPool, DBExecutor]" = weakref.WeakKeyDictionary()
+
+
+def db_executor_for(pool: ConnectionPool, workers: int = 4) -> DBExecutor:
+    with _executors_lock:
+        executor = _executors.get(pool)
+        if executor is None:
+            executor = DBExecutor(pool, workers=workers)
+            _executors[pool] = executor
+            # fecha os workers antes das conexões do pool
+            pool.add_close_hook(executor.shutdown)
+        return executor
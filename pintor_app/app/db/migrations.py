@@ -107,8 +107,108 @@ def get_migrations() -> list[Migration]:
       ON quote_items(quote_id, quantity_thousandths);
     """
 
+    # histórico: keyset pagination por (updated_at, id) com desempate estável e
+    # projeção compacta; os índices cobrem todas as colunas da lista (sem visitar
+    # a tabela, sem ler notes_*). A versão 3 foi absorvida aqui: bancos que já a
+    # aplicaram perdem os índices dela, instalação nova não cria nem apaga nada.
+    m004 = """
+    DROP INDEX IF EXISTS idx_quotes_status_updated;
+    DROP INDEX IF EXISTS idx_quotes_updated_id;
+    DROP INDEX IF EXISTS idx_quotes_status_updated_id;
+
+    CREATE INDEX IF NOT EXISTS idx_quotes_history_cover
+      ON quotes(updated_at DESC, id DESC, customer_name, status, total_sale_cents, created_at);
+
+    CREATE INDEX IF NOT EXISTS idx_quotes_status_history_cover
+      ON quotes(status, updated_at DESC, id DESC, customer_name, total_sale_cents, created_at);
+    """
+
+    # busca textual (FTS5, external content): triggers mantêm os índices em dia.
+    # remove_diacritics: "joao" encontra "João". Após VACUUM os rowids podem
+    # mudar: rodar QuickQuotesRepo.rebuild_search_index().
+    m005 = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS quotes_fts USING fts5(
+      customer_name, notes_client,
+      content='quotes', content_rowid='rowid',
+      tokenize='unicode61 remove_diacritics 2'
+    );
+
+    CREATE VIRTUAL TABLE IF NOT EXISTS quote_items_fts USING fts5(
+      service_name, description_client,
+      content='quote_items', content_rowid='rowid',
+      tokenize='unicode61 remove_diacritics 2'
+    );
+
+    -- nome do cliente pesa mais que observações
+    INSERT INTO quotes_fts(quotes_fts, rank) VALUES('rank', 'bm25(10.0, 1.0)');
+    INSERT INTO quote_items_fts(quote_items_fts, rank) VALUES('rank', 'bm25(4.0, 1.0)');
+
+    CREATE TRIGGER IF NOT EXISTS quotes_fts_ai AFTER INSERT ON quotes BEGIN
+      INSERT INTO quotes_fts(rowid, customer_name, notes_client)
+      VALUES (new.rowid, new.customer_name, new.notes_client);
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS quotes_fts_ad AFTER DELETE ON quotes BEGIN
+      INSERT INTO quotes_fts(quotes_fts, rowid, customer_name, notes_client)
+      VALUES ('delete', old.rowid, old.customer_name, old.notes_client);
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS quotes_fts_au AFTER UPDATE OF customer_name, notes_client ON quotes BEGIN
+      INSERT INTO quotes_fts(quotes_fts, rowid, customer_name, notes_client)
+      VALUES ('delete', old.rowid, old.customer_name, old.notes_client);
+      INSERT INTO quotes_fts(rowid, customer_name, notes_client)
+      VALUES (new.rowid, new.customer_name, new.notes_client);
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS quote_items_fts_ai AFTER INSERT ON quote_items BEGIN
+      INSERT INTO quote_items_fts(rowid, service_name, description_client)
+      VALUES (new.rowid, new.service_name, new.description_client);
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS quote_items_fts_ad AFTER DELETE ON quote_items BEGIN
+      INSERT INTO quote_items_fts(quote_items_fts, rowid, service_name, description_client)
+      VALUES ('delete', old.rowid, old.service_name, old.description_client);
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS quote_items_fts_au AFTER UPDATE OF service_name, description_client ON quote_items BEGIN
+      INSERT INTO quote_items_fts(quote_items_fts, rowid, service_name, description_client)
+      VALUES ('delete', old.rowid, old.service_name, old.description_client);
+      INSERT INTO quote_items_fts(rowid, service_name, description_client)
+      VALUES (new.rowid, new.service_name, new.description_client);
+    END;
+
+    -- indexa o que já existia
+    INSERT INTO quotes_fts(quotes_fts) VALUES('rebuild');
+    INSERT INTO quote_items_fts(quote_items_fts) VALUES('rebuild');
+    """
+
+    # posição estável do item dentro do orçamento (0..n-1, sem buracos):
+    # janelas e páginas de itens viram seek no índice em vez de OFFSET
+    m006 = """
+    ALTER TABLE quote_items
+      ADD COLUMN position INTEGER NOT NULL DEFAULT 0;
+
+    -- ordem de exibição até aqui era a de inserção (rowid)
+    UPDATE quote_items
+       SET position = r.pos
+      FROM (
+            SELECT rowid AS rid,
+                   ROW_NUMBER() OVER (PARTITION BY quote_id ORDER BY rowid) - 1 AS pos
+              FROM quote_items
+           ) AS r
+     WHERE quote_items.rowid = r.rid;
+
+    -- (quote_id, position) também atende buscas só por quote_id
+    DROP INDEX IF EXISTS idx_quote_items_quote;
+    CREATE INDEX IF NOT EXISTS idx_quote_items_quote_position
+      ON quote_items(quote_id, position);
+    """
+
     return [
         (1, m001),
         (2, m002),
+        (4, m004),
+        (5, m005),
+        (6, m006),
     ]
 
@@ -0,0 +1,405 @@
+from __future__ import annotations
+
+import queue
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator, Optional, TypeVar, Union
+
+from app.db.database import close_quietly, connect_sqlite
+from app.db.errors import DatabaseClosedError
+from app.db.tracing import SQLTracer
+from app.db.write_queue import WriteQueue, WriteQueueStats, run_callbacks
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True, slots=True)
+class CheckoutStats:
+    size: int
+    in_use: int
+    checkouts: int
+    wait_total_ms: float
+    wait_max_ms: float
+
+    @property
+    def wait_avg_ms(self) -> float:
+        return self.wait_total_ms / self.checkouts if self.checkouts else 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class PoolStats:
+    reader: CheckoutStats
+    writer: WriteQueueStats
+
+
+class _Counter:
+    """Acumulador mutável por tipo de conexão (protegido pelo lock do pool)."""
+
+    __slots__ = ("size", "in_use", "checkouts", "wait_total_ms", "wait_max_ms")
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.in_use = 0
+        self.checkouts = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+
+    def checkout(self, waited_ms: float) -> None:
+        self.in_use += 1
+        self.checkouts += 1
+        self.wait_total_ms += waited_ms
+        self.wait_max_ms = max(self.wait_max_ms, waited_ms)
+
+    def snapshot(self) -> CheckoutStats:
+        return CheckoutStats(
+            size=self.size,
+            in_use=self.in_use,
+            checkouts=self.checkouts,
+            wait_total_ms=self.wait_total_ms,
+            wait_max_ms=self.wait_max_ms,
+        )
+
+
+class _BasePool(ABC):
+    """
+    Contrato comum dos pools:
+    - reader(): conexão para leitura (snapshot=True abre transação de leitura)
+    - write(fn): executa fn(conn) numa transação de escrita e devolve o resultado
+    - submit_write(fn): idem, mas devolve um Future
+    - a conexão emprestada fica associada à thread, então chamadas aninhadas
+      de repositórios reaproveitam a mesma conexão (read-your-writes)
+    - after_commit(cb): dentro de uma escrita, adia cb até o COMMIT (caches
+      em memória só refletem o que foi gravado de fato); fora dela, roda já
+    - submit_write/after_commit/_writer_stats são abstratos: pool incompleto
+      falha ao ser construído, não na primeira escrita
+    """
+
+    def __init__(self, readers: int) -> None:
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._reader_stats = _Counter(readers)
+        self._close_hooks: list[Callable[[], None]] = []
+
+    # ---------- binding por thread ----------
+
+    def _bound(self) -> sqlite3.Connection | None:
+        return getattr(self._local, "conn", None)
+
+    def _bound_is_writer(self) -> bool:
+        return bool(getattr(self._local, "is_writer", False))
+
+    @contextmanager
+    def _bind(self, conn: sqlite3.Connection, is_writer: bool) -> Iterator[sqlite3.Connection]:
+        prev = (self._bound(), self._bound_is_writer())
+        self._local.conn, self._local.is_writer = conn, is_writer
+        try:
+            yield conn
+        finally:
+            self._local.conn, self._local.is_writer = prev
+
+    # ---------- transações ----------
+
+    @staticmethod
+    @contextmanager
+    def _transaction(conn: sqlite3.Connection, begin: str) -> Iterator[sqlite3.Connection]:
+        # só quem abriu a transação faz commit/rollback
+        owns = not conn.in_transaction
+        if owns:
+            conn.execute(begin)
+        try:
+            yield conn
+        except BaseException:
+            if owns and conn.in_transaction:
+                conn.rollback()
+            raise
+        if owns and conn.in_transaction:
+            conn.commit()
+
+    # ---------- stats ----------
+
+    def _record_checkout(self, counter: _Counter, started: float) -> None:
+        waited_ms = (time.perf_counter() - started) * 1000.0
+        with self._stats_lock:
+            counter.checkout(waited_ms)
+
+    def _record_release(self, counter: _Counter) -> None:
+        with self._stats_lock:
+            counter.in_use -= 1
+
+    def in_write(self) -> bool:
+        """True se esta thread está dentro de uma transação de escrita do pool."""
+        return self._bound() is not None and self._bound_is_writer()
+
+    def write(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        bound = self._bound()
+        if bound is not None and self._bound_is_writer():
+            # já dentro de uma escrita nesta thread: mesma transação
+            return fn(bound)
+        return self.submit_write(fn).result()
+
+    @abstractmethod
+    def submit_write(self, fn: Callable[[sqlite3.Connection], T]) -> Future:
+        ...
+
+    @abstractmethod
+    def after_commit(self, cb: Callable[[], None]) -> None:
+        ...
+
+    def add_close_hook(self, fn: Callable[[], None]) -> None:
+        """fn roda no close(), antes de fechar as conexões (ex.: parar o DBExecutor)."""
+        self._close_hooks.append(fn)
+
+    def _run_close_hooks(self) -> None:
+        hooks, self._close_hooks = self._close_hooks, []
+        for fn in hooks:
+            try:
+                fn()
+            except Exception:
+                pass
+
+    @abstractmethod
+    def _writer_stats(self) -> WriteQueueStats:
+        ...
+
+    def stats(self) -> PoolStats:
+        writer = self._writer_stats()
+        with self._stats_lock:
+            return PoolStats(reader=self._reader_stats.snapshot(), writer=writer)
+
+
+class SQLitePool(_BasePool):
+    """
+    Pool compartilhado para o modo web:
+    - 1 conexão de escrita, dona de uma thread dedicada (WriteQueue, group commit)
+    - N conexões somente leitura (PRAGMA query_only), leituras em snapshot do WAL
+    """
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        readers: int = 4,
+        checkout_timeout: float = 30.0,
+        write_queue_size: int = 256,
+        write_batch: int = 32,
+        tracer: Optional[SQLTracer] = None,
+    ) -> None:
+        if readers < 1:
+            raise ValueError("Pool precisa de pelo menos 1 conexão de leitura.")
+        super().__init__(readers)
+        self.db_path = Path(db_path)
+        self.checkout_timeout = checkout_timeout
+        self.tracer = tracer
+        self._closed = False
+
+        self._writes = WriteQueue(
+            self._open(query_only=False),
+            bind=lambda conn: self._bind(conn, is_writer=True),
+            maxsize=write_queue_size,
+            max_batch=write_batch,
+            submit_timeout=checkout_timeout,
+        )
+
+        self._all_readers: list[sqlite3.Connection] = []
+        self._readers: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        for _ in range(readers):
+            conn = self._open(query_only=True)
+            self._all_readers.append(conn)
+            self._readers.put(conn)
+
+    def _open(self, query_only: bool) -> sqlite3.Connection:
+        conn = connect_sqlite(self.db_path, check_same_thread=False, tracer=self.tracer)
+        # controle explícito de transação (sem BEGIN implícito do módulo sqlite3)
+        conn.isolation_level = None
+        if query_only:
+            conn.execute("PRAGMA query_only = ON;")
+        return conn
+
+    @contextmanager
+    def reader(self, snapshot: bool = False) -> Iterator[sqlite3.Connection]:
+        bound = self._bound()
+        if bound is not None:
+            # dentro de writer/reader na mesma thread (ou conexão fixa): reaproveita
+            # (vê as próprias escritas); snapshot só abre transação se não houver uma
+            if snapshot:
+                with self._transaction(bound, "BEGIN;"):
+                    yield bound
+            else:
+                yield bound
+            return
+
+        self._ensure_open()
+        started = time.perf_counter()
+        try:
+            conn = self._readers.get(timeout=self.checkout_timeout)
+        except queue.Empty:
+            raise TimeoutError("Timeout waiting for a reader connection") from None
+        self._record_checkout(self._reader_stats, started)
+
+        try:
+            with self._bind(conn, is_writer=False):
+                if snapshot:
+                    # BEGIN DEFERRED fixa o snapshot do WAL na primeira leitura
+                    with self._transaction(conn, "BEGIN;"):
+                        yield conn
+                else:
+                    yield conn
+        finally:
+            self._record_release(self._reader_stats)
+            self._readers.put(conn)
+
+    def submit_write(self, fn: Callable[[sqlite3.Connection], T]) -> Future:
+        self._ensure_open()
+        return self._writes.submit(fn)
+
+    def after_commit(self, cb: Callable[[], None]) -> None:
+        if self._writes.on_writer_thread():
+            self._writes.after_commit(cb)
+        else:
+            cb()
+
+    def _writer_stats(self) -> WriteQueueStats:
+        return self._writes.stats()
+
+    def _ensure_open(self) -> None:
+        if self._closed:
+            raise DatabaseClosedError("Pool is closed")
+
+    def close(self) -> None:
+        self._run_close_hooks()
+        self._closed = True
+        self._writes.close()
+        close_quietly(self._writes.conn)
+        for conn in self._all_readers:
+            close_quietly(conn)
+
+
+class SingleConnectionPool(_BasePool):
+    """
+    Adapta uma conexão avulsa (scripts, testes) ao contrato do pool.
+    Leitura e escrita usam a mesma conexão, serializadas por um RLock.
+    """
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        super().__init__(readers=1)
+        self.conn = conn
+        self._lock = threading.RLock()
+        self._writes_done = 0
+        self._writes_failed = 0
+        self._pending_callbacks: list[Callable[[], None]] | None = None
+
+    @contextmanager
+    def reader(self, snapshot: bool = False) -> Iterator[sqlite3.Connection]:
+        with self._checkout(self._reader_stats, is_writer=False):
+            if snapshot:
+                with self._transaction(self.conn, "BEGIN;"):
+                    yield self.conn
+            else:
+                yield self.conn
+
+    def submit_write(self, fn: Callable[[sqlite3.Connection], T]) -> Future:
+        # sem thread de escrita: executa já, na thread de quem chamou
+        fut: Future = Future()
+        fut.set_running_or_notify_cancel()
+        callbacks: list[Callable[[], None]] = []
+        try:
+            with self._lock, self._bind(self.conn, is_writer=True):
+                self._pending_callbacks = callbacks
+                try:
+                    with self._transaction(self.conn, "BEGIN IMMEDIATE;"):
+                        result = fn(self.conn)
+                finally:
+                    self._pending_callbacks = None
+        except BaseException as e:
+            self._writes_failed += 1
+            fut.set_exception(e)
+        else:
+            run_callbacks(callbacks)
+            fut.set_result(result)
+        self._writes_done += 1
+        return fut
+
+    def after_commit(self, cb: Callable[[], None]) -> None:
+        pending = self._pending_callbacks
+        if pending is not None and self._bound_is_writer():
+            pending.append(cb)
+        else:
+            cb()
+
+    def _writer_stats(self) -> WriteQueueStats:
+        return WriteQueueStats(
+            submitted=self._writes_done,
+            completed=self._writes_done,
+            failed=self._writes_failed,
+            batches=self._writes_done,
+            max_batch=1 if self._writes_done else 0,
+            queue_depth=0,
+            wait_total_ms=0.0,
+            wait_max_ms=0.0,
+        )
+
+    @contextmanager
+    def _checkout(self, counter: _Counter, is_writer: bool) -> Iterator[None]:
+        started = time.perf_counter()
+        with self._lock:
+            self._record_checkout(counter, started)
+            try:
+                with self._bind(self.conn, is_writer=is_writer or self._bound_is_writer()):
+                    yield
+            finally:
+                self._record_release(counter)
+
+    def close(self) -> None:
+        self._run_close_hooks()
+        close_quietly(self.conn)
+
+
+ConnectionPool = Union[SQLitePool, SingleConnectionPool]
+
+
+def as_pool(source: Union[sqlite3.Connection, ConnectionPool]) -> ConnectionPool:
+    """Repositórios aceitam conexão avulsa ou pool; normaliza para pool."""
+    if isinstance(source, sqlite3.Connection):
+        return SingleConnectionPool(source)
+    return source
+
+
+# ---------- pool compartilhado por processo (todas as sessões Flet) ----------
+
+_shared_lock = threading.Lock()
+_shared: dict[Path, tuple[SQLitePool, int]] = {}
+
+
+def shared_pool(
+    db_path: Union[str, Path], readers: int = 4, tracer: Optional[SQLTracer] = None
+) -> SQLitePool:
+    # readers/tracer valem para quem cria o pool; os demais recebem o existente
+    key = Path(db_path).resolve()
+    with _shared_lock:
+        entry = _shared.get(key)
+        if entry is None:
+            pool = SQLitePool(key, readers=readers, tracer=tracer)
+            _shared[key] = (pool, 1)
+            return pool
+        pool, refs = entry
+        _shared[key] = (pool, refs + 1)
+        return pool
+
+
+def release_shared_pool(pool: SQLitePool) -> None:
+    key = pool.db_path.resolve()
+    with _shared_lock:
+        entry = _shared.get(key)
+        if entry is None or entry[0] is not pool:
+            return
+        refs = entry[1] - 1
+        if refs > 0:
+            _shared[key] = (pool, refs)
+            return
+        del _shared[key]
+    pool.close()
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import base64
+import json
+from array import array
+import re
 import sqlite3
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Generic, Iterable, Iterator, Optional, TypeVar
 from uuid import uuid4
 
+from app.db.pool import ConnectionPool, as_pool
+
 
 @dataclass(frozen=True, slots=True)
 class QuoteRow:
@@ -33,9 +39,151 @@ class QuoteItemRow:
     unit_price_cents: int
     adjustment_cents: int
     description_client: str
+    position: int = 0  # ordem estável dentro do orçamento (0..n-1)
+
+
+@dataclass(frozen=True, slots=True)
+class ItemsPage:
+    rows: list[QuoteItemRow]
+    next_position: Optional[int]  # None => acabou; senão passar como after_position
+
+
+@dataclass(frozen=True, slots=True)
+class QuoteSummaryRow:
+    """Projeção da lista/histórico: sem notes_*, sem colunas de cálculo."""
+
+    id: str
+    customer_name: str
+    status: str
+    total_sale_cents: int
+    created_at: str
+    updated_at: str
+
+
+@dataclass(frozen=True, slots=True)
+class QuoteHeaderRow:
+    """Cabeçalho da tela do orçamento: totais sem notes_* (vêm de get_notes)."""
+
+    id: str
+    customer_name: str
+    status: str
+    materials_included: int
+    subtotal_sale_cents: int
+    adjustments_cents: int
+    total_sale_cents: int
+    created_at: str
+    updated_at: str
+
+
+@dataclass(frozen=True, slots=True)
+class QuoteNotesRow:
+    quote_id: str
+    notes_client: str
+    notes_internal: str
+
+
+@dataclass(frozen=True, slots=True)
+class TotalsColumns:
+    """
+    Bloco colunar para recálculo em lote: uma posição por orçamento (quote_*)
+    e uma por item (item_*); item_owner aponta o índice do orçamento.
+    quantity_thousandths vem como gravado: a normalização por unidade é do
+    domain (batch_totals.normalize_quantities).
+    """
+
+    quote_ids: list[str]
+    subtotal_sale_cents: array  # totals gravados hoje (para regravar só o que mudou)
+    adjustments_cents: array
+    total_sale_cents: array
+    item_owner: array
+    unit_price_cents: array
+    quantity_thousandths: array
+    adjustment_cents: array
+    item_unit: list[str]
+
+
+RowT = TypeVar("RowT")
+
 
+@dataclass(frozen=True, slots=True)
+class HistoryPage(Generic[RowT]):
+    rows: list[RowT]
+    next_cursor: Optional[str]  # opaco; passar de volta na próxima chamada
+
+
+def _encode_cursor(updated_at: str, quote_id: str) -> str:
+    raw = json.dumps([updated_at, quote_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple[str, str]:
+    try:
+        updated_at, quote_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return str(updated_at), str(quote_id)
+    except (ValueError, TypeError):
+        raise ValueError(f"Invalid history cursor: {cursor!r}") from None
+
+
+def _quote_row(r: sqlite3.Row) -> QuoteRow:
+    return QuoteRow(
+        id=r["id"],
+        customer_name=r["customer_name"],
+        status=r["status"],
+        materials_included=int(r["materials_included"]),
+        notes_client=r["notes_client"],
+        notes_internal=r["notes_internal"],
+        subtotal_sale_cents=int(r["subtotal_sale_cents"]),
+        adjustments_cents=int(r["adjustments_cents"]),
+        total_sale_cents=int(r["total_sale_cents"]),
+        created_at=r["created_at"],
+        updated_at=r["updated_at"],
+    )
+
+
+def _item_row(r: sqlite3.Row) -> QuoteItemRow:
+    return QuoteItemRow(
+        id=r["id"],
+        quote_id=r["quote_id"],
+        service_name=r["service_name"],
+        unit=r["unit"],
+        quantity=int(r["quantity"]),
+        quantity_thousandths=int(r["quantity_thousandths"]),
+        unit_price_cents=int(r["unit_price_cents"]),
+        adjustment_cents=int(r["adjustment_cents"]),
+        description_client=r["description_client"],
+        position=int(r["position"]),
+    )
+
+
+def _next_position(conn: sqlite3.Connection, quote_id: str) -> int:
+    # MAX no índice (quote_id, position): O(log n); roda dentro da transação de escrita
+    return int(
+        conn.execute(
+            "SELECT COALESCE(MAX(position) + 1, 0) FROM quote_items WHERE quote_id = ?;", (quote_id,)
+        ).fetchone()[0]
+    )
+
+
+def _fts_match(text: str) -> Optional[str]:
+    """
+    Texto livre -> expressão MATCH do FTS5 (cada palavra vira prefixo, OR entre elas;
+    o bm25 coloca no topo quem casa mais palavras). Sem sintaxe FTS do usuário.
+    """
+    tokens = re.findall(r"\w+", text or "")
+    if not tokens:
+        return None
+    return " OR ".join(f'"{t}"*' for t in tokens)
 
 
+def _summary_row(r: sqlite3.Row) -> QuoteSummaryRow:
+    return QuoteSummaryRow(
+        id=r["id"],
+        customer_name=r["customer_name"],
+        status=r["status"],
+        total_sale_cents=int(r["total_sale_cents"]),
+        created_at=r["created_at"],
+        updated_at=r["updated_at"],
+    )
 
 
 class QuickQuotesRepo:
@@ -43,13 +191,29 @@ class QuickQuotesRepo:
     Repositório puro para o MVP de orçamentos rápidos.
 
     Importante:
-    - aqui NÃO calcula totals (isso será domain/core depois).
-    - aqui apenas persiste quote e itens.
+    - as regras de cálculo (arredondamento, normalização de quantidade)
+      ficam no domain; aqui nada é recalculado a partir dos itens.
+    - persiste quote e itens e grava os totals que o core calculou
+      (apply_totals_delta, set_totals, set_totals_many).
     """
 
-    def __init__(self, conn: sqlite3.Connection, now_fn=lambda: datetime.utcnow()) -> None:
-        self.conn = conn
+    def __init__(self, conn: sqlite3.Connection | ConnectionPool, now_fn=lambda: datetime.utcnow()) -> None:
+        # conexão avulsa ou pool; cada chamada empresta a conexão certa (leitura/escrita)
+        self.pool = as_pool(conn)
         self.now_fn = now_fn
+        self._listeners: list[Callable[[str], None]] = []
+
+    # -------- Listeners --------
+
+    def add_change_listener(self, fn: Callable[[str], None]) -> None:
+        """fn(quote_id) é chamado após o COMMIT de qualquer mudança no orçamento ou nos itens."""
+        self._listeners.append(fn)
+
+    def _changed(self, quote_id: str) -> None:
+        if not self._listeners:
+            return
+        listeners = list(self._listeners)
+        self.pool.after_commit(lambda: [fn(quote_id) for fn in listeners])
 
     # -------- Quotes --------
 
@@ -62,52 +226,60 @@ class QuickQuotesRepo:
         now = self.now_fn().isoformat()
         qid = quote_id or str(uuid4())
 
-        self.conn.execute(
-            """
-            INSERT INTO quotes (
-              id, customer_name, status, materials_included,
-              notes_client, notes_internal,
-              subtotal_sale_cents, adjustments_cents, total_sale_cents,
-              created_at, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
-            """,
-            (
-                qid,
-                customer_name,
-                "DRAFT",
-                1 if materials_included else 0,
-                "",
-                "",
-                0,
-                0,
-                0,
-                now,
-                now,
-            ),
+        self.pool.write(
+            lambda conn: conn.execute(
+                """
+                INSERT INTO quotes (
+                  id, customer_name, status, materials_included,
+                  notes_client, notes_internal,
+                  subtotal_sale_cents, adjustments_cents, total_sale_cents,
+                  created_at, updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+                """,
+                (
+                    qid,
+                    customer_name,
+                    "DRAFT",
+                    1 if materials_included else 0,
+                    "",
+                    "",
+                    0,
+                    0,
+                    0,
+                    now,
+                    now,
+                ),
+            )
         )
         return qid
 
     def update_status(self, quote_id: str, status: str) -> None:
         now = self.now_fn().isoformat()
-        cur = self.conn.execute(
-            "UPDATE quotes SET status = ?, updated_at = ? WHERE id = ?;",
-            (status, now, quote_id),
+        updated = self.pool.write(
+            lambda conn: conn.execute(
+                "UPDATE quotes SET status = ?, updated_at = ? WHERE id = ?;",
+                (status, now, quote_id),
+            ).rowcount
         )
-        if cur.rowcount == 0:
+        if updated == 0:
             raise ValueError(f"Quote not found: {quote_id}")
+        self._changed(quote_id)
 
     def update_notes(self, quote_id: str, notes_client: str, notes_internal: str = "") -> None:
         now = self.now_fn().isoformat()
-        cur = self.conn.execute(
-            """
-            UPDATE quotes
-               SET notes_client = ?, notes_internal = ?, updated_at = ?
-             WHERE id = ?;
-            """,
-            (notes_client, notes_internal, now, quote_id),
+        updated = self.pool.write(
+            lambda conn: conn.execute(
+                """
+                UPDATE quotes
+                   SET notes_client = ?, notes_internal = ?, updated_at = ?
+                 WHERE id = ?;
+                """,
+                (notes_client, notes_internal, now, quote_id),
+            ).rowcount
         )
-        if cur.rowcount == 0:
+        if updated == 0:
             raise ValueError(f"Quote not found: {quote_id}")
+        self._changed(quote_id)
 
     def set_totals(
         self,
@@ -121,96 +293,327 @@ class QuickQuotesRepo:
         O cálculo real virá do domain/core.
         """
         now = self.now_fn().isoformat()
-        cur = self.conn.execute(
-            """
-            UPDATE quotes
-               SET subtotal_sale_cents = ?,
-                   adjustments_cents   = ?,
-                   total_sale_cents    = ?,
-                   updated_at          = ?
-             WHERE id = ?;
-            """,
-            (int(subtotal_sale_cents), int(adjustments_cents), int(total_sale_cents), now, quote_id),
+        updated = self.pool.write(
+            lambda conn: conn.execute(
+                """
+                UPDATE quotes
+                   SET subtotal_sale_cents = ?,
+                       adjustments_cents   = ?,
+                       total_sale_cents    = ?,
+                       updated_at          = ?
+                 WHERE id = ?;
+                """,
+                (int(subtotal_sale_cents), int(adjustments_cents), int(total_sale_cents), now, quote_id),
+            ).rowcount
+        )
+        if updated == 0:
+            raise ValueError(f"Quote not found: {quote_id}")
+        self._changed(quote_id)
+
+    def apply_totals_delta(
+        self,
+        quote_id: str,
+        subtotal_delta_cents: int,
+        adjustments_delta_cents: int,
+    ) -> None:
+        """
+        Soma deltas aos totals gravados (sem reler os itens).
+        O valor do delta vem do domain/core; aqui só persiste.
+        """
+        now = self.now_fn().isoformat()
+        d_sub, d_adj = int(subtotal_delta_cents), int(adjustments_delta_cents)
+        updated = self.pool.write(
+            lambda conn: conn.execute(
+                """
+                UPDATE quotes
+                   SET subtotal_sale_cents = subtotal_sale_cents + ?,
+                       adjustments_cents   = adjustments_cents + ?,
+                       total_sale_cents    = total_sale_cents + ?,
+                       updated_at          = ?
+                 WHERE id = ?;
+                """,
+                (d_sub, d_adj, d_sub + d_adj, now, quote_id),
+            ).rowcount
         )
-        if cur.rowcount == 0:
+        if updated == 0:
             raise ValueError(f"Quote not found: {quote_id}")
+        self._changed(quote_id)
+
+    def set_totals_many(self, rows: Iterable[tuple[str, int, int, int]]) -> int:
+        """
+        Grava vários snapshots de totals num único executemany.
+        rows: (quote_id, subtotal_sale_cents, adjustments_cents, total_sale_cents)
+        """
+        now = self.now_fn().isoformat()
+        params = [(int(sub), int(adj), int(total), now, qid) for qid, sub, adj, total in rows]
+        if not params:
+            return 0
+
+        updated = self.pool.write(
+            lambda conn: conn.executemany(
+                """
+                UPDATE quotes
+                   SET subtotal_sale_cents = ?,
+                       adjustments_cents   = ?,
+                       total_sale_cents    = ?,
+                       updated_at          = ?
+                 WHERE id = ?;
+                """,
+                params,
+            ).rowcount
+        )
+        for p in params:
+            self._changed(p[-1])
+        return updated
+
+    def load_totals_columns(self, after_id: Optional[str] = None, limit: int = 500) -> TotalsColumns:
+        """
+        Próximo bloco de até `limit` orçamentos (keyset por id) com todos os
+        itens, já em colunas. Orçamento sem itens aparece sem linhas de item.
+        """
+        # keyset explícito: "? IS NULL OR id > ?" impediria o range na PK
+        where, params = ("WHERE id > ?", [after_id]) if after_id is not None else ("", [])
+        params.append(max(1, int(limit)))
+
+        with self.pool.reader() as conn:
+            rows = conn.execute(
+                f"""
+                WITH chunk AS (
+                    SELECT id, subtotal_sale_cents, adjustments_cents, total_sale_cents
+                      FROM quotes
+                     {where}
+                     ORDER BY id
+                     LIMIT ?
+                )
+                SELECT c.id, c.subtotal_sale_cents, c.adjustments_cents, c.total_sale_cents,
+                       qi.unit_price_cents, qi.quantity_thousandths, qi.adjustment_cents, qi.unit
+                  FROM chunk c
+                  LEFT JOIN quote_items qi ON qi.quote_id = c.id
+                 ORDER BY c.id;
+                """,
+                params,
+            ).fetchall()
+
+        cols = TotalsColumns(
+            quote_ids=[],
+            subtotal_sale_cents=array("q"),
+            adjustments_cents=array("q"),
+            total_sale_cents=array("q"),
+            item_owner=array("q"),
+            unit_price_cents=array("q"),
+            quantity_thousandths=array("q"),
+            adjustment_cents=array("q"),
+            item_unit=[],
+        )
+        last_id: Optional[str] = None
+        for r in rows:
+            if r[0] != last_id:
+                last_id = r[0]
+                cols.quote_ids.append(last_id)
+                cols.subtotal_sale_cents.append(int(r[1]))
+                cols.adjustments_cents.append(int(r[2]))
+                cols.total_sale_cents.append(int(r[3]))
+            if r[4] is None:
+                continue  # LEFT JOIN: orçamento sem itens
+            cols.item_owner.append(len(cols.quote_ids) - 1)
+            cols.unit_price_cents.append(int(r[4]))
+            cols.quantity_thousandths.append(int(r[5]))
+            cols.adjustment_cents.append(int(r[6]))
+            cols.item_unit.append(r[7])
+        return cols
 
     def get_by_id(self, quote_id: str) -> QuoteRow:
-        cur = self.conn.execute(
+        with self.pool.reader() as conn:
+            row = conn.execute(
+                """
+                SELECT id, customer_name, status, materials_included,
+                       notes_client, notes_internal,
+                       subtotal_sale_cents, adjustments_cents, total_sale_cents,
+                       created_at, updated_at
+                  FROM quotes
+                 WHERE id = ?;
+                """,
+                (quote_id,),
+            ).fetchone()
+        if row is None:
+            raise ValueError(f"Quote not found: {quote_id}")
+
+        return _quote_row(row)
+
+    def get_updated_at(self, quote_id: str) -> str:
+        """Versão do orçamento (lookup pela PK, sem ler o resto da linha)."""
+        with self.pool.reader() as conn:
+            row = conn.execute("SELECT updated_at FROM quotes WHERE id = ?;", (quote_id,)).fetchone()
+        if row is None:
+            raise ValueError(f"Quote not found: {quote_id}")
+        return row["updated_at"]
+
+    def list_history(self, status: Optional[str] = None, limit: int = 50) -> list[QuoteRow]:
+        return self.list_history_page(status=status, limit=limit).rows
+
+    def list_history_page(
+        self,
+        status: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> HistoryPage[QuoteRow]:
+        """
+        Keyset pagination por (updated_at, id) DESC:
+        - cursor=None => primeira página
+        - next_cursor=None => acabou
+        Custo por página constante (índice em updated_at, id), sem OFFSET.
+        """
+        return self._history_page(
             """
             SELECT id, customer_name, status, materials_included,
                    notes_client, notes_internal,
                    subtotal_sale_cents, adjustments_cents, total_sale_cents,
                    created_at, updated_at
               FROM quotes
-             WHERE id = ?;
             """,
-            (quote_id,),
+            _quote_row,
+            status,
+            limit,
+            cursor,
+        )
+
+    def list_history_summaries(
+        self,
+        status: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> HistoryPage[QuoteSummaryRow]:
+        """
+        Igual a list_history_page, mas só com as colunas da lista
+        (resolvido inteiro pelo índice de cobertura; notes ficam no disco).
+        """
+        return self._history_page(
+            """
+            SELECT id, customer_name, status, total_sale_cents, created_at, updated_at
+              FROM quotes
+            """,
+            _summary_row,
+            status,
+            limit,
+            cursor,
         )
-        row = cur.fetchone()
+
+    def iter_history(self, status: Optional[str] = None, chunk_size: int = 200) -> Iterator[QuoteRow]:
+        """
+        Stream do histórico em blocos de chunk_size (export, telas longas).
+        Cada bloco empresta uma conexão de leitura só durante a consulta.
+        """
+        return self._iter_pages(self.list_history_page, status, chunk_size)
+
+    def iter_history_summaries(self, status: Optional[str] = None, chunk_size: int = 200) -> Iterator[QuoteSummaryRow]:
+        return self._iter_pages(self.list_history_summaries, status, chunk_size)
+
+    def get_notes(self, quote_id: str) -> QuoteNotesRow:
+        # carregado só quando o quote é aberto (lista e cabeçalho não leem notes_*)
+        with self.pool.reader() as conn:
+            row = conn.execute(
+                "SELECT id, notes_client, notes_internal FROM quotes WHERE id = ?;",
+                (quote_id,),
+            ).fetchone()
         if row is None:
             raise ValueError(f"Quote not found: {quote_id}")
+        return QuoteNotesRow(quote_id=row["id"], notes_client=row["notes_client"], notes_internal=row["notes_internal"])
 
-        return QuoteRow(
-            id=row["id"],
-            customer_name=row["customer_name"],
-            status=row["status"],
-            materials_included=int(row["materials_included"]),
-            notes_client=row["notes_client"],
-            notes_internal=row["notes_internal"],
-            subtotal_sale_cents=int(row["subtotal_sale_cents"]),
-            adjustments_cents=int(row["adjustments_cents"]),
-            total_sale_cents=int(row["total_sale_cents"]),
-            created_at=row["created_at"],
-            updated_at=row["updated_at"],
-        )
+    def search_quotes(self, text: str, limit: int = 20, offset: int = 0) -> list[QuoteSummaryRow]:
+        """
+        Busca ranqueada (bm25) em cliente, observações e itens (serviço/descrição).
+        Um único UNION ALL com todos os hits dos dois índices, agrupado por
+        orçamento (soma dos scores) e paginado numa ordem total (score, id):
+        sem corte por índice, páginas seguidas não pulam nem repetem resultado
+        e orçamentos achados só pelos itens entram no ranking como os outros.
+        """
+        match = _fts_match(text)
+        if match is None:
+            return []
 
-    def list_history(self, status: Optional[str] = None, limit: int = 50) -> list[QuoteRow]:
-        if status:
-            cur = self.conn.execute(
-                """
-                SELECT id, customer_name, status, materials_included,
-                       notes_client, notes_internal,
-                       subtotal_sale_cents, adjustments_cents, total_sale_cents,
-                       created_at, updated_at
-                  FROM quotes
-                 WHERE status = ?
-                 ORDER BY updated_at DESC
-                 LIMIT ?;
-                """,
-                (status, int(limit)),
-            )
-        else:
-            cur = self.conn.execute(
+        limit, offset = max(1, int(limit)), max(0, int(offset))
+
+        with self.pool.reader() as conn:
+            rows = conn.execute(
                 """
-                SELECT id, customer_name, status, materials_included,
-                       notes_client, notes_internal,
-                       subtotal_sale_cents, adjustments_cents, total_sale_cents,
-                       created_at, updated_at
-                  FROM quotes
-                 ORDER BY updated_at DESC
-                 LIMIT ?;
+                WITH hits(quote_id, score) AS (
+                    SELECT q.id, f.rank
+                      FROM quotes_fts f
+                      JOIN quotes q ON q.rowid = f.rowid
+                     WHERE quotes_fts MATCH ?
+                    UNION ALL
+                    SELECT qi.quote_id, f.rank
+                      FROM quote_items_fts f
+                      JOIN quote_items qi ON qi.rowid = f.rowid
+                     WHERE quote_items_fts MATCH ?
+                )
+                SELECT q.id, q.customer_name, q.status, q.total_sale_cents, q.created_at, q.updated_at,
+                       SUM(h.score) AS score
+                  FROM hits h
+                  JOIN quotes q ON q.id = h.quote_id
+                 GROUP BY q.id
+                 ORDER BY score ASC, q.id ASC
+                 LIMIT ? OFFSET ?;
                 """,
-                (int(limit),),
-            )
+                (match, match, limit, offset),
+            ).fetchall()
+        return [_summary_row(r) for r in rows]
 
-        rows = cur.fetchall()
-        return [
-            QuoteRow(
-                id=r["id"],
-                customer_name=r["customer_name"],
-                status=r["status"],
-                materials_included=int(r["materials_included"]),
-                notes_client=r["notes_client"],
-                notes_internal=r["notes_internal"],
-                subtotal_sale_cents=int(r["subtotal_sale_cents"]),
-                adjustments_cents=int(r["adjustments_cents"]),
-                total_sale_cents=int(r["total_sale_cents"]),
-                created_at=r["created_at"],
-                updated_at=r["updated_at"],
-            )
-            for r in rows
-        ]
+    def rebuild_search_index(self) -> None:
+        def _tx(conn: sqlite3.Connection) -> None:
+            conn.execute("INSERT INTO quotes_fts(quotes_fts) VALUES('rebuild');")
+            conn.execute("INSERT INTO quote_items_fts(quote_items_fts) VALUES('rebuild');")
+
+        self.pool.write(_tx)
+
+    def _history_page(
+        self,
+        select_sql: str,
+        row_fn: Callable[[sqlite3.Row], RowT],
+        status: Optional[str],
+        limit: int,
+        cursor: Optional[str],
+    ) -> HistoryPage[RowT]:
+        limit = max(1, int(limit))
+        where: list[str] = []
+        params: list[object] = []
+
+        if status:
+            where.append("status = ?")
+            params.append(status)
+        if cursor:
+            where.append("(updated_at, id) < (?, ?)")
+            params.extend(_decode_cursor(cursor))
+
+        sql = (
+            select_sql
+            + (" WHERE " + " AND ".join(where) if where else "")
+            + " ORDER BY updated_at DESC, id DESC LIMIT ?;"
+        )
+        params.append(limit + 1)  # +1 só para saber se existe próxima página
+
+        with self.pool.reader() as conn:
+            rows = conn.execute(sql, params).fetchall()
+
+        has_more = len(rows) > limit
+        page_rows = [row_fn(r) for r in rows[:limit]]
+        last = rows[limit - 1] if has_more else None
+        next_cursor = _encode_cursor(last["updated_at"], last["id"]) if last is not None else None
+        return HistoryPage(rows=page_rows, next_cursor=next_cursor)
+
+    @staticmethod
+    def _iter_pages(
+        fetch: Callable[..., HistoryPage[RowT]],
+        status: Optional[str],
+        chunk_size: int,
+    ) -> Iterator[RowT]:
+        cursor: Optional[str] = None
+        while True:
+            page = fetch(status=status, limit=chunk_size, cursor=cursor)
+            yield from page.rows
+            if page.next_cursor is None:
+                return
+            cursor = page.next_cursor
 
     # -------- Quote Items --------
 
@@ -228,79 +631,231 @@ class QuickQuotesRepo:
         iid = item_id or str(uuid4())
         quantity_int = int(int(quantity_thousandths) // 1000)  # legado
 
-        self.conn.execute(
-            """
-            INSERT INTO quote_items (
-            id, quote_id, service_name, unit,
-            quantity, quantity_thousandths,
-            unit_price_cents, adjustment_cents, description_client
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?);
-            """,
-            (
-                iid,
-                quote_id,
-                service_name,
-                unit,
-                quantity_int,
-                int(quantity_thousandths),
-                int(unit_price_cents),
-                int(adjustment_cents),
-                description_client,
-            ),
-        )
-
         now = self.now_fn().isoformat()
-        self.conn.execute("UPDATE quotes SET updated_at = ? WHERE id = ?;", (now, quote_id))
+
+        def _tx(conn: sqlite3.Connection) -> None:
+            conn.execute(
+                """
+                INSERT INTO quote_items (
+                id, quote_id, service_name, unit,
+                quantity, quantity_thousandths,
+                unit_price_cents, adjustment_cents, description_client,
+                position
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+                """,
+                (
+                    iid,
+                    quote_id,
+                    service_name,
+                    unit,
+                    quantity_int,
+                    int(quantity_thousandths),
+                    int(unit_price_cents),
+                    int(adjustment_cents),
+                    description_client,
+                    _next_position(conn, quote_id),
+                ),
+            )
+            conn.execute("UPDATE quotes SET updated_at = ? WHERE id = ?;", (now, quote_id))
+
+        self.pool.write(_tx)
+        self._changed(quote_id)
         return iid
 
 
-    def list_items(self, quote_id: str) -> list[QuoteItemRow]:
-        cur = self.conn.execute(
-            """
-            SELECT id, quote_id, service_name, unit,
-                quantity,
-                quantity_thousandths,
-                unit_price_cents, adjustment_cents, description_client
-            FROM quote_items
-            WHERE quote_id = ?
-            ORDER BY rowid ASC;
+    def add_items_many(
+        self,
+        quote_id: str,
+        items: Iterable[tuple[str, str, int, int, int, str]],
+    ) -> list[str]:
+        """
+        Inserção em lote (colar/importar):
+        items: (service_name, unit, quantity_thousandths, unit_price_cents, adjustment_cents, description_client)
+        """
+        params = []
+        for service_name, unit, qty_thousandths, price_cents, adj_cents, description in items:
+            params.append(
+                (
+                    str(uuid4()),
+                    quote_id,
+                    service_name,
+                    unit,
+                    int(int(qty_thousandths) // 1000),  # legado
+                    int(qty_thousandths),
+                    int(price_cents),
+                    int(adj_cents),
+                    description,
+                )
+            )
+        if not params:
+            return []
 
-            """,
-            (quote_id,),
-        )
-        rows = cur.fetchall()
-        return [
-            QuoteItemRow(
-                id=r["id"],
-                quote_id=r["quote_id"],
-                service_name=r["service_name"],
-                unit=r["unit"],
-                quantity=int(r["quantity"]),
-                quantity_thousandths=int(r["quantity_thousandths"]),
-                unit_price_cents=int(r["unit_price_cents"]),
-                adjustment_cents=int(r["adjustment_cents"]),
-                description_client=r["description_client"],
+        now = self.now_fn().isoformat()
+
+        def _tx(conn: sqlite3.Connection) -> None:
+            base = _next_position(conn, quote_id)
+            conn.executemany(
+                """
+                INSERT INTO quote_items (
+                id, quote_id, service_name, unit,
+                quantity, quantity_thousandths,
+                unit_price_cents, adjustment_cents, description_client,
+                position
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+                """,
+                [(*p, base + n) for n, p in enumerate(params)],
             )
-            for r in rows
-        ]
+            conn.execute("UPDATE quotes SET updated_at = ? WHERE id = ?;", (now, quote_id))
 
+        self.pool.write(_tx)
+        self._changed(quote_id)
+        return [p[0] for p in params]
 
+    def list_items(self, quote_id: str) -> list[QuoteItemRow]:
+        with self.pool.reader() as conn:
+            rows = conn.execute(
+                """
+                SELECT id, quote_id, service_name, unit,
+                    quantity,
+                    quantity_thousandths,
+                    unit_price_cents, adjustment_cents, description_client,
+                    position
+                FROM quote_items
+                WHERE quote_id = ?
+                ORDER BY position ASC;
+                """,
+                (quote_id,),
+            ).fetchall()
+        return [_item_row(r) for r in rows]
 
+    def count_items(self, quote_id: str) -> int:
+        with self.pool.reader() as conn:
+            # só o índice (quote_id, position), sem ler as linhas
+            return int(conn.execute("SELECT COUNT(*) FROM quote_items WHERE quote_id = ?;", (quote_id,)).fetchone()[0])
 
-    def delete_item(self, item_id: str) -> None:
-        # encontra quote_id para tocar updated_at
-        cur = self.conn.execute("SELECT quote_id FROM quote_items WHERE id = ?;", (item_id,))
-        row = cur.fetchone()
-        if row is None:
-            raise ValueError(f"Quote item not found: {item_id}")
+    def list_items_window(self, quote_id: str, offset: int = 0, limit: int = 100) -> list[QuoteItemRow]:
+        """
+        Fatia [offset, offset+limit) na mesma ordem de list_items (lista virtualizada).
+        position não tem buracos, então offset = position: seek no índice, sem OFFSET.
+        """
+        if offset < 0 or limit <= 0:
+            raise ValueError("Invalid item window")
+        with self.pool.reader() as conn:
+            rows = conn.execute(
+                """
+                SELECT id, quote_id, service_name, unit,
+                    quantity,
+                    quantity_thousandths,
+                    unit_price_cents, adjustment_cents, description_client,
+                    position
+                FROM quote_items
+                WHERE quote_id = ? AND position >= ?
+                ORDER BY position ASC
+                LIMIT ?;
+                """,
+                (quote_id, int(offset), int(limit)),
+            ).fetchall()
+        return [_item_row(r) for r in rows]
 
-        quote_id = row["quote_id"]
-        self.conn.execute("DELETE FROM quote_items WHERE id = ?;", (item_id,))
+    def list_items_page(
+        self,
+        quote_id: str,
+        limit: int = 200,
+        after_position: Optional[int] = None,
+    ) -> ItemsPage:
+        """Keyset por position (igual ao histórico): a próxima página começa depois da última linha."""
+        start = 0 if after_position is None else int(after_position) + 1
+        rows = self.list_items_window(quote_id, offset=start, limit=max(1, int(limit)) + 1)
+        page_rows = rows[:limit]
+        next_position = page_rows[-1].position if len(rows) > limit else None
+        return ItemsPage(rows=page_rows, next_position=next_position)
+
+    def iter_items(self, quote_id: str, chunk_size: int = 500) -> Iterator[QuoteItemRow]:
+        """Itens em blocos (recalcular/exportar orçamentos enormes sem montar a lista inteira)."""
+        after: Optional[int] = None
+        while True:
+            page = self.list_items_page(quote_id, limit=chunk_size, after_position=after)
+            yield from page.rows
+            if page.next_position is None:
+                return
+            after = page.next_position
+
+    def get_item(self, item_id: str) -> QuoteItemRow:
+        with self.pool.reader() as conn:
+            r = conn.execute(
+                """
+                SELECT id, quote_id, service_name, unit,
+                    quantity,
+                    quantity_thousandths,
+                    unit_price_cents, adjustment_cents, description_client,
+                    position
+                FROM quote_items
+                WHERE id = ?;
+                """,
+                (item_id,),
+            ).fetchone()
+        if r is None:
+            raise ValueError(f"Quote item not found: {item_id}")
+        return _item_row(r)
 
+    def delete_item(self, item_id: str) -> None:
         now = self.now_fn().isoformat()
-        self.conn.execute("UPDATE quotes SET updated_at = ? WHERE id = ?;", (now, quote_id))
+
+        def _tx(conn: sqlite3.Connection) -> str:
+            # encontra quote_id para tocar updated_at
+            row = conn.execute("SELECT quote_id, position FROM quote_items WHERE id = ?;", (item_id,)).fetchone()
+            if row is None:
+                raise ValueError(f"Quote item not found: {item_id}")
+
+            quote_id = row["quote_id"]
+            conn.execute("DELETE FROM quote_items WHERE id = ?;", (item_id,))
+            # mantém position sem buracos (janelas por position = por offset)
+            conn.execute(
+                "UPDATE quote_items SET position = position - 1 WHERE quote_id = ? AND position > ?;",
+                (quote_id, row["position"]),
+            )
+            conn.execute("UPDATE quotes SET updated_at = ? WHERE id = ?;", (now, quote_id))
+            return quote_id
+
+        self._changed(self.pool.write(_tx))
+
+    def get_items_window(self, quote_id: str, offset: int = 0, limit: int = 100) -> tuple[int, list[QuoteItemRow]]:
+        """(total de itens, janela) do mesmo snapshot; ValueError se o orçamento não existe."""
+        with self.pool.reader(snapshot=True):
+            self.get_updated_at(quote_id)
+            return self.count_items(quote_id), self.list_items_window(quote_id, offset, limit)
+
+    def get_quote_summary(self, quote_id: str) -> tuple[QuoteHeaderRow, int]:
+        """Cabeçalho + totais + quantidade de itens, sem itens nem notes_* (mesmo snapshot)."""
+        with self.pool.reader(snapshot=True) as conn:
+            row = conn.execute(
+                """
+                SELECT id, customer_name, status, materials_included,
+                       subtotal_sale_cents, adjustments_cents, total_sale_cents,
+                       created_at, updated_at
+                  FROM quotes
+                 WHERE id = ?;
+                """,
+                (quote_id,),
+            ).fetchone()
+            if row is None:
+                raise ValueError(f"Quote not found: {quote_id}")
+            header = QuoteHeaderRow(
+                id=row["id"],
+                customer_name=row["customer_name"],
+                status=row["status"],
+                materials_included=int(row["materials_included"]),
+                subtotal_sale_cents=int(row["subtotal_sale_cents"]),
+                adjustments_cents=int(row["adjustments_cents"]),
+                total_sale_cents=int(row["total_sale_cents"]),
+                created_at=row["created_at"],
+                updated_at=row["updated_at"],
+            )
+            return header, self.count_items(quote_id)
 
     def get_quote_with_items(self, quote_id: str) -> tuple[QuoteRow, list[QuoteItemRow]]:
-        quote = self.get_by_id(quote_id)
-        items = self.list_items(quote_id)
+        # snapshot: header e itens vêm do mesmo instante do WAL
+        with self.pool.reader(snapshot=True):
+            quote = self.get_by_id(quote_id)
+            items = self.list_items(quote_id)
         return quote, items
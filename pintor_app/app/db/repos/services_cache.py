@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import bisect
+import sqlite3
+import string
+import threading
+import weakref
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, Optional
+
+from app.domain.text_index import TextIndex
+from app.db.pool import ConnectionPool
+from app.db.repos.services_repo import ServiceRow, ServicesRepo
+
+# COLLATE NOCASE do SQLite só dobra A-Z; a ordem em memória tem que bater com a do banco
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def _nocase(row: ServiceRow) -> str:
+    return row.name.translate(_ASCII_LOWER)
+
+
+@dataclass(frozen=True, slots=True)
+class CacheStats:
+    hits: int
+    misses: int
+    patches: int
+    invalidations: int
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ServiceCatalogCache:
+    """
+    Catálogo de serviços em memória (um por pool, compartilhado pelas sessões):
+    - list_all/get_by_id servem da memória depois do primeiro carregamento
+    - escritas corrigem a lista no lugar (ou invalidam) só depois do COMMIT
+    - cada mudança incrementa a versão; carregamento que começou antes dela
+      não é guardado (evita repor uma lista velha lida em paralelo)
+    - índice de busca (TextIndex) montado sob demanda, uma vez por versão
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._rows: Optional[list[ServiceRow]] = None
+        self._index: Optional[TextIndex[ServiceRow]] = None
+        self._version = 0
+        self._hits = 0
+        self._misses = 0
+        self._patches = 0
+        self._invalidations = 0
+
+    def get_all(self) -> tuple[Optional[list[ServiceRow]], int]:
+        with self._lock:
+            if self._rows is None:
+                self._misses += 1
+                return None, self._version
+            self._hits += 1
+            return list(self._rows), self._version
+
+    def get_one(self, service_id: str) -> Optional[ServiceRow]:
+        with self._lock:
+            if self._rows is not None:
+                for row in self._rows:
+                    if row.id == service_id:
+                        self._hits += 1
+                        return row
+            self._misses += 1
+            return None
+
+    def fill(self, rows: list[ServiceRow], version: int) -> None:
+        with self._lock:
+            if version == self._version:
+                self._rows = list(rows)
+                self._index = None
+
+    def search_index(self) -> Optional[TextIndex[ServiceRow]]:
+        """Índice da versão atual (None se o catálogo ainda não foi carregado)."""
+        with self._lock:
+            rows, index, version = self._rows, self._index, self._version
+        if rows is None:
+            return None
+        if index is None:
+            # monta fora do lock (O(n)); só guarda se nada mudou nesse meio tempo
+            index = TextIndex((r, r.name) for r in rows)
+            with self._lock:
+                if version == self._version:
+                    self._index = index
+        return index
+
+    def put(self, row: ServiceRow) -> None:
+        with self._lock:
+            self._version += 1
+            if self._rows is None:
+                return
+            self._rows = [r for r in self._rows if r.id != row.id]
+            bisect.insort(self._rows, row, key=_nocase)
+            self._index = None
+            self._patches += 1
+
+    def remove(self, service_id: str) -> None:
+        with self._lock:
+            self._version += 1
+            if self._rows is None:
+                return
+            self._rows = [r for r in self._rows if r.id != service_id]
+            self._index = None
+            self._patches += 1
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._rows = None
+            self._index = None
+            self._invalidations += 1
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                patches=self._patches,
+                invalidations=self._invalidations,
+            )
+
+
+_caches_lock = threading.Lock()
+_caches: "weakref.WeakKeyDictionary[ConnectionPool, ServiceCatalogCache]" = weakref.WeakKeyDictionary()
+
+
+def catalog_cache_for(pool: ConnectionPool) -> ServiceCatalogCache:
+    with _caches_lock:
+        cache = _caches.get(pool)
+        if cache is None:
+            cache = ServiceCatalogCache()
+            _caches[pool] = cache
+        return cache
+
+
+class CachedServicesRepo(ServicesRepo):
+    """
+    ServicesRepo com o catálogo em memória na frente.
+    Dentro de uma escrita (UnitOfWork) lê direto do banco: a transação pode
+    ter mudanças ainda não confirmadas, que não podem ir para o cache.
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection | ConnectionPool,
+        now_fn=lambda: datetime.utcnow(),
+        cache: Optional[ServiceCatalogCache] = None,
+    ) -> None:
+        super().__init__(conn, now_fn=now_fn)
+        self.cache = cache if cache is not None else catalog_cache_for(self.pool)
+
+    def list_all(self) -> list[ServiceRow]:
+        if self.pool.in_write():
+            return super().list_all()
+        rows, version = self.cache.get_all()
+        if rows is None:
+            rows = super().list_all()
+            self.cache.fill(rows, version)
+        return rows
+
+    def search(self, text: str, limit: int = 20) -> list[ServiceRow]:
+        if self.pool.in_write():
+            return super().search(text, limit)
+        index = self.cache.search_index()
+        if index is None:
+            self.list_all()  # carrega o catálogo (1 query) e tenta de novo
+            index = self.cache.search_index()
+        if index is None:
+            return super().search(text, limit)  # escrita concorrente invalidou; não vale esperar
+        return index.search(text, limit)
+
+    def get_by_id(self, service_id: str) -> ServiceRow:
+        if not self.pool.in_write():
+            row = self.cache.get_one(service_id)
+            if row is not None:
+                return row
+        return super().get_by_id(service_id)
+
+    def create(
+        self,
+        name: str,
+        unit: str,
+        default_unit_price_cents: int = 0,
+        service_id: Optional[str] = None,
+    ) -> str:
+        def _tx(conn: sqlite3.Connection) -> str:
+            sid = ServicesRepo.create(self, name, unit, default_unit_price_cents, service_id)
+            row = ServicesRepo.get_by_id(self, sid)
+            self.pool.after_commit(lambda: self.cache.put(row))
+            return sid
+
+        return self.pool.write(_tx)
+
+    def update_price(self, service_id: str, default_unit_price_cents: int) -> None:
+        def _tx(conn: sqlite3.Connection) -> None:
+            ServicesRepo.update_price(self, service_id, default_unit_price_cents)
+            row = ServicesRepo.get_by_id(self, service_id)
+            self.pool.after_commit(lambda: self.cache.put(row))
+
+        self.pool.write(_tx)
+
+    def delete(self, service_id: str) -> None:
+        def _tx(conn: sqlite3.Connection) -> None:
+            ServicesRepo.delete(self, service_id)
+            self.pool.after_commit(lambda: self.cache.remove(service_id))
+
+        self.pool.write(_tx)
+
+    def upsert_many(self, services: Iterable[tuple[str, str, str, int]]) -> None:
+        def _tx(conn: sqlite3.Connection) -> None:
+            ServicesRepo.upsert_many(self, services)
+            self.pool.after_commit(self.cache.invalidate)
+
+        self.pool.write(_tx)
@@ -6,6 +6,9 @@ from datetime import datetime
 from typing import Iterable, Optional
 from uuid import uuid4
 
+from app.domain.text_index import TextIndex
+from app.db.pool import ConnectionPool, as_pool
+
 
 @dataclass(frozen=True, slots=True)
 class ServiceRow:
@@ -24,8 +27,9 @@ class ServicesRepo:
     - Sem regra de negócio
     """
 
-    def __init__(self, conn: sqlite3.Connection, now_fn=lambda: datetime.utcnow()) -> None:
-        self.conn = conn
+    def __init__(self, conn: sqlite3.Connection | ConnectionPool, now_fn=lambda: datetime.utcnow()) -> None:
+        # conexão avulsa ou pool; cada chamada empresta a conexão certa (leitura/escrita)
+        self.pool = as_pool(conn)
         self.now_fn = now_fn
 
     def create(
@@ -38,38 +42,46 @@ class ServicesRepo:
         now = self.now_fn().isoformat()
         sid = service_id or str(uuid4())
 
-        self.conn.execute(
-            """
-            INSERT INTO services (id, name, unit, default_unit_price_cents, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?);
-            """,
-            (sid, name, unit, int(default_unit_price_cents), now, now),
+        self.pool.write(
+            lambda conn: conn.execute(
+                """
+                INSERT INTO services (id, name, unit, default_unit_price_cents, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?);
+                """,
+                (sid, name, unit, int(default_unit_price_cents), now, now),
+            )
         )
         return sid
 
+    def search(self, text: str, limit: int = 20) -> list[ServiceRow]:
+        """Type-ahead por nome (prefixo/trecho, sem acento). Aqui monta o índice a cada chamada."""
+        return TextIndex((r, r.name) for r in self.list_all()).search(text, limit)
+
     def update_price(self, service_id: str, default_unit_price_cents: int) -> None:
         now = self.now_fn().isoformat()
-        cur = self.conn.execute(
-            """
-            UPDATE services
-               SET default_unit_price_cents = ?, updated_at = ?
-             WHERE id = ?;
-            """,
-            (int(default_unit_price_cents), now, service_id),
+        updated = self.pool.write(
+            lambda conn: conn.execute(
+                """
+                UPDATE services
+                   SET default_unit_price_cents = ?, updated_at = ?
+                 WHERE id = ?;
+                """,
+                (int(default_unit_price_cents), now, service_id),
+            ).rowcount
         )
-        if cur.rowcount == 0:
+        if updated == 0:
             raise ValueError(f"Service not found: {service_id}")
 
     def get_by_id(self, service_id: str) -> ServiceRow:
-        cur = self.conn.execute(
-            """
-            SELECT id, name, unit, default_unit_price_cents, created_at, updated_at
-              FROM services
-             WHERE id = ?;
-            """,
-            (service_id,),
-        )
-        row = cur.fetchone()
+        with self.pool.reader() as conn:
+            row = conn.execute(
+                """
+                SELECT id, name, unit, default_unit_price_cents, created_at, updated_at
+                  FROM services
+                 WHERE id = ?;
+                """,
+                (service_id,),
+            ).fetchone()
         if row is None:
             raise ValueError(f"Service not found: {service_id}")
         return ServiceRow(
@@ -82,14 +94,14 @@ class ServicesRepo:
         )
 
     def list_all(self) -> list[ServiceRow]:
-        cur = self.conn.execute(
-            """
-            SELECT id, name, unit, default_unit_price_cents, created_at, updated_at
-              FROM services
-             ORDER BY name COLLATE NOCASE ASC;
-            """
-        )
-        rows = cur.fetchall()
+        with self.pool.reader() as conn:
+            rows = conn.execute(
+                """
+                SELECT id, name, unit, default_unit_price_cents, created_at, updated_at
+                  FROM services
+                 ORDER BY name COLLATE NOCASE ASC;
+                """
+            ).fetchall()
         return [
             ServiceRow(
                 id=r["id"],
@@ -103,8 +115,10 @@ class ServicesRepo:
         ]
 
     def delete(self, service_id: str) -> None:
-        cur = self.conn.execute("DELETE FROM services WHERE id = ?;", (service_id,))
-        if cur.rowcount == 0:
+        deleted = self.pool.write(
+            lambda conn: conn.execute("DELETE FROM services WHERE id = ?;", (service_id,)).rowcount
+        )
+        if deleted == 0:
             raise ValueError(f"Service not found: {service_id}")
 
     def upsert_many(self, services: Iterable[tuple[str, str, str, int]]) -> None:
@@ -113,15 +127,18 @@ class ServicesRepo:
         services: (id, name, unit, default_unit_price_cents)
         """
         now = self.now_fn().isoformat()
-        self.conn.executemany(
-            """
-            INSERT INTO services (id, name, unit, default_unit_price_cents, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-            ON CONFLICT(id) DO UPDATE SET
-              name = excluded.name,
-              unit = excluded.unit,
-              default_unit_price_cents = excluded.default_unit_price_cents,
-              updated_at = excluded.updated_at;
-            """,
-            [(sid, name, unit, int(price), now, now) for sid, name, unit, price in services],
+        params = [(sid, name, unit, int(price), now, now) for sid, name, unit, price in services]
+        self.pool.write(
+            lambda conn: conn.executemany(
+                """
+                INSERT INTO services (id, name, unit, default_unit_price_cents, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                  name = excluded.name,
+                  unit = excluded.unit,
+                  default_unit_price_cents = excluded.default_unit_price_cents,
+                  updated_at = excluded.updated_at;
+                """,
+                params,
+            )
         )
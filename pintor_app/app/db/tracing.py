@@ -0,0 +1,323 @@
+from __future__ import annotations
+
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+_COMMENT = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM = re.compile(r"\?\d*|:\w+|@\w+|\$\w+")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.I)
+_VALUES_ROWS = re.compile(r"(\(\s*\?(?:\s*,\s*\?)*\s*\))(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))+")
+_SPACES = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(sql: str) -> str:
+    """
+    SQL normalizado para agrupar execuções da mesma query:
+    sem comentários, literais e parâmetros viram ?, listas IN (?, ?, ...) e
+    VALUES (...), (...) colapsam, espaços unificados, ; final removido.
+    """
+    s = _COMMENT.sub(" ", sql)
+    s = _STRING.sub("?", s)
+    s = _NUMBER.sub("?", s)
+    s = _PARAM.sub("?", s)
+    s = _IN_LIST.sub("IN (...)", s)
+    s = _VALUES_ROWS.sub(r"\1, ...", s)
+    return _SPACES.sub(" ", s).strip().rstrip(";").strip()
+
+
+@dataclass(frozen=True, slots=True)
+class QueryEvent:
+    fingerprint: str
+    duration_ms: float  # execute + leitura das linhas
+    rows: int  # linhas lidas (SELECT) ou afetadas (DML)
+    statements: int  # statements que o SQLite rodou (inclui triggers), via trace callback
+    thread: str
+    at: float  # time.time() do início
+
+
+@dataclass(frozen=True, slots=True)
+class FingerprintStats:
+    fingerprint: str
+    count: int
+    total_ms: float
+    max_ms: float
+    rows: int
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+
+class SQLTracer:
+    """
+    Coletor de execuções SQL (um por processo, ligado às conexões do pool):
+    - ring buffer com os últimos `capacity` eventos
+    - agregado por fingerprint (count/total/max/linhas), sem limite de tempo
+    - slow log: eventos >= slow_ms viram uma linha em slow_log_path (gravada
+      fora do lock dos agregados: I/O não atrasa as outras threads)
+    - capture(): eventos de um trecho (qualquer thread), p/ orçamento de queries
+    """
+
+    def __init__(
+        self,
+        capacity: int = 2000,
+        slow_ms: Optional[float] = 100.0,
+        slow_log_path: Optional[Union[str, Path]] = None,
+    ) -> None:
+        self.enabled = True
+        self.slow_ms = slow_ms
+        self.slow_log_path = Path(slow_log_path) if slow_log_path is not None else None
+        self._lock = threading.Lock()
+        # só o slow log: append no arquivo nunca segura o _lock (que toda query usa)
+        self._log_lock = threading.Lock()
+        self._events: deque[QueryEvent] = deque(maxlen=max(1, capacity))
+        self._by_fp: dict[str, list] = {}  # fp -> [count, total_ms, max_ms, rows]
+        self._slow_count = 0
+        self._captures: list[list[QueryEvent]] = []
+
+    def record(self, sql: str, duration_ms: float, rows: int, statements: int, started_at: float) -> None:
+        fp = fingerprint(sql)
+        event = QueryEvent(
+            fingerprint=fp,
+            duration_ms=duration_ms,
+            rows=rows if rows > 0 else 0,
+            statements=statements,
+            thread=threading.current_thread().name,
+            at=started_at,
+        )
+        slow = self.slow_ms is not None and duration_ms >= self.slow_ms
+        with self._lock:
+            self._events.append(event)
+            agg = self._by_fp.get(fp)
+            if agg is None:
+                self._by_fp[fp] = [1, duration_ms, duration_ms, event.rows]
+            else:
+                agg[0] += 1
+                agg[1] += duration_ms
+                if duration_ms > agg[2]:
+                    agg[2] = duration_ms
+                agg[3] += event.rows
+            if slow:
+                self._slow_count += 1
+            for captured in self._captures:
+                captured.append(event)
+        if slow:
+            self._write_slow(event)
+
+    def events(self) -> list[QueryEvent]:
+        with self._lock:
+            return list(self._events)
+
+    def top(self, n: int = 10, by: str = "total_ms") -> list[FingerprintStats]:
+        with self._lock:
+            stats = [
+                FingerprintStats(fingerprint=fp, count=a[0], total_ms=a[1], max_ms=a[2], rows=a[3])
+                for fp, a in self._by_fp.items()
+            ]
+        return sorted(stats, key=lambda s: getattr(s, by), reverse=True)[:n]
+
+    @contextmanager
+    def capture(self) -> Iterator[list[QueryEvent]]:
+        """Lista que recebe os eventos gravados enquanto o bloco roda (inclusive do writer)."""
+        captured: list[QueryEvent] = []
+        with self._lock:
+            self._captures.append(captured)
+        try:
+            yield captured
+        finally:
+            with self._lock:
+                self._captures.remove(captured)
+
+    @property
+    def slow_count(self) -> int:
+        with self._lock:
+            return self._slow_count
+
+    def clear(self) -> None:
+        with self._lock:
+            self._events.clear()
+            self._by_fp.clear()
+            self._slow_count = 0
+
+    def _write_slow(self, event: QueryEvent) -> None:
+        if self.slow_log_path is None:
+            return
+        line = (
+            f"{datetime.fromtimestamp(event.at).isoformat(timespec='milliseconds')}\t"
+            f"{event.duration_ms:.1f}ms\trows={event.rows}\tstmts={event.statements}\t"
+            f"{event.thread}\t{event.fingerprint}\n"
+        )
+        try:
+            with self._log_lock:
+                self.slow_log_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.slow_log_path, "a", encoding="utf-8") as f:
+                    f.write(line)
+        except OSError:
+            pass  # log de diagnóstico não pode derrubar a query
+
+
+class TracedCursor(sqlite3.Cursor):
+    """
+    Cursor que mede cada statement: tempo do execute somado ao das leituras,
+    até esgotar o resultado (ou o próximo execute / close / coleta do cursor).
+    """
+
+    _pending: Optional[list] = None  # [sql, started_at, elapsed_s, rows, stmts_before]
+
+    def execute(self, sql, parameters=(), /):
+        self._finish()
+        tracer = self.connection.tracer
+        if tracer is None or not tracer.enabled:
+            return super().execute(sql, parameters)
+        return self._run(sql, super().execute, parameters)
+
+    def executemany(self, sql, seq_of_parameters, /):
+        self._finish()
+        tracer = self.connection.tracer
+        if tracer is None or not tracer.enabled:
+            return super().executemany(sql, seq_of_parameters)
+        return self._run(sql, super().executemany, seq_of_parameters)
+
+    def _run(self, sql, call, parameters):
+        conn = self.connection
+        stmts_before = conn.statements_run
+        started_at = time.time()
+        t0 = time.perf_counter()
+        try:
+            call(sql, parameters)
+        finally:
+            elapsed = time.perf_counter() - t0
+        if self.description is None:
+            # DML/DDL: nada para ler, rowcount já é final
+            conn.tracer.record(sql, elapsed * 1000.0, self.rowcount, conn.statements_run - stmts_before, started_at)
+        else:
+            self._pending = [sql, started_at, elapsed, 0, stmts_before]
+        return self
+
+    def _timed_fetch(self, call, *args):
+        pending = self._pending
+        if pending is None:
+            return call(*args)
+        t0 = time.perf_counter()
+        try:
+            return call(*args)
+        finally:
+            pending[2] += time.perf_counter() - t0
+
+    def fetchone(self):
+        row = self._timed_fetch(super().fetchone)
+        if self._pending is not None:
+            if row is None:
+                self._finish()
+            else:
+                self._pending[3] += 1
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._timed_fetch(super().fetchmany, self.arraysize if size is None else size)
+        if self._pending is not None:
+            self._pending[3] += len(rows)
+            if not rows:
+                self._finish()
+        return rows
+
+    def fetchall(self):
+        rows = self._timed_fetch(super().fetchall)
+        if self._pending is not None:
+            self._pending[3] += len(rows)
+            self._finish()
+        return rows
+
+    def __next__(self):
+        try:
+            row = self._timed_fetch(super().__next__)
+        except StopIteration:
+            self._finish()
+            raise
+        if self._pending is not None:
+            self._pending[3] += 1
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        # fetchone() de PK e o cursor some: fecha o evento aqui
+        try:
+            self._finish()
+        except Exception:
+            pass
+
+    def _finish(self) -> None:
+        pending, self._pending = self._pending, None
+        if pending is None:
+            return
+        sql, started_at, elapsed, rows, stmts_before = pending
+        conn = self.connection
+        conn.tracer.record(sql, elapsed * 1000.0, rows, conn.statements_run - stmts_before, started_at)
+
+
+class TracedConnection(sqlite3.Connection):
+    """
+    Conexão instrumentada (factory de sqlite3.connect):
+    - execute/executemany/cursor passam por TracedCursor
+    - commit/rollback/executescript também são medidos
+    - set_trace_callback conta os statements que o SQLite realmente roda
+      (triggers, cada comando de um script), atribuídos à chamada em curso
+    """
+
+    tracer: Optional[SQLTracer] = None
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.statements_run = 0
+        self.set_trace_callback(self._on_statement)
+
+    def attach_tracer(self, tracer: SQLTracer) -> None:
+        self.tracer = tracer
+
+    def _on_statement(self, _sql: str) -> None:
+        self.statements_run += 1
+
+    def cursor(self, factory=TracedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=(), /):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, parameters, /):
+        return self.cursor().executemany(sql, parameters)
+
+    def executescript(self, script, /):
+        return self._timed(script, lambda: super(TracedConnection, self).executescript(script))
+
+    def commit(self) -> None:
+        self._timed("COMMIT", super().commit)
+
+    def rollback(self) -> None:
+        self._timed("ROLLBACK", super().rollback)
+
+    def _timed(self, sql: str, call):
+        tracer = self.tracer
+        if tracer is None or not tracer.enabled:
+            return call()
+        stmts_before = self.statements_run
+        started_at = time.time()
+        t0 = time.perf_counter()
+        try:
+            return call()
+        finally:
+            tracer.record(sql, (time.perf_counter() - t0) * 1000.0, 0, self.statements_run - stmts_before, started_at)
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from typing import Callable, TypeVar
+
+from app.db.pool import ConnectionPool
+
+T = TypeVar("T")
+
+
+class SQLiteUnitOfWork:
+    """
+    UnitOfWork sobre o pool:
+    - `work` roda na conexão de escrita (thread do WriteQueue), dentro de um
+      BEGIN IMMEDIATE ... COMMIT
+    - repositórios chamados dentro de `work` detectam a conexão já emprestada
+      e executam na mesma transação (leituras incluídas)
+    """
+
+    def __init__(self, pool: ConnectionPool) -> None:
+        self.pool = pool
+
+    def run(self, work: Callable[[], T]) -> T:
+        return self.pool.write(lambda _conn: work())
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import AbstractContextManager
+from dataclasses import dataclass
+from typing import Callable, Optional, TypeVar
+
+from app.db.errors import DatabaseClosedError
+
+T = TypeVar("T")
+
+WriteFn = Callable[[sqlite3.Connection], T]
+BindFn = Callable[[sqlite3.Connection], AbstractContextManager]
+
+
+@dataclass(frozen=True, slots=True)
+class WriteQueueStats:
+    submitted: int
+    completed: int
+    failed: int
+    batches: int
+    max_batch: int
+    queue_depth: int
+    wait_total_ms: float
+    wait_max_ms: float
+
+    @property
+    def avg_batch(self) -> float:
+        return self.completed / self.batches if self.batches else 0.0
+
+    @property
+    def wait_avg_ms(self) -> float:
+        return self.wait_total_ms / self.completed if self.completed else 0.0
+
+
+class _Command:
+    __slots__ = ("fn", "future", "enqueued_at")
+
+    def __init__(self, fn: WriteFn, future: Future) -> None:
+        self.fn = fn
+        self.future = future
+        self.enqueued_at = time.perf_counter()
+
+
+_STOP = object()
+
+
+def run_callbacks(callbacks: list[Callable[[], None]]) -> None:
+    # callback com erro não pode derrubar a thread de escrita nem os outros callbacks
+    for cb in callbacks:
+        try:
+            cb()
+        except Exception:
+            pass
+
+
+class WriteQueue:
+    """
+    Thread única de escrita do SQLite:
+    - fila limitada (backpressure em vez de "database is locked")
+    - group commit: drena até max_batch comandos e grava tudo em um
+      BEGIN IMMEDIATE ... COMMIT; cada comando roda num SAVEPOINT próprio,
+      então a falha de um não desfaz os outros
+    - quem enfileira recebe um Future, resolvido só depois do COMMIT
+    - after_commit(cb): callbacks do comando rodam após o COMMIT (e antes de
+      resolver os Futures); descartados se o comando ou o lote falhar
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        bind: BindFn,
+        maxsize: int = 256,
+        max_batch: int = 32,
+        submit_timeout: float = 30.0,
+    ) -> None:
+        self.conn = conn
+        self._bind = bind
+        self.max_batch = max(1, max_batch)
+        self.submit_timeout = submit_timeout
+
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._stats_lock = threading.Lock()
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._batches = 0
+        self._max_batch_seen = 0
+        self._wait_total_ms = 0.0
+        self._wait_max_ms = 0.0
+        self._closed = False
+        self._abort = threading.Event()  # close() sem espaço para _STOP: para após o lote atual
+
+        # só acessados pela thread de escrita
+        self._cmd_callbacks: list[Callable[[], None]] = []
+        self._batch_callbacks: list[Callable[[], None]] = []
+
+        self._thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+        self._thread.start()
+
+    # ---------- API ----------
+
+    def submit(self, fn: WriteFn) -> Future:
+        if self._closed:
+            raise DatabaseClosedError("Write queue is closed")
+
+        fut: Future = Future()
+        if self.on_writer_thread():
+            # chamada aninhada dentro de um comando: executa na transação corrente
+            try:
+                fut.set_result(fn(self.conn))
+            except BaseException as e:
+                fut.set_exception(e)
+            return fut
+
+        with self._stats_lock:
+            self._submitted += 1
+        try:
+            self._queue.put(_Command(fn, fut), timeout=self.submit_timeout)
+        except queue.Full:
+            with self._stats_lock:
+                self._submitted -= 1
+            raise TimeoutError("Write queue is full") from None
+        return fut
+
+    def on_writer_thread(self) -> bool:
+        return threading.current_thread() is self._thread
+
+    def after_commit(self, cb: Callable[[], None]) -> None:
+        if not self.on_writer_thread():
+            raise RuntimeError("after_commit must be called from the writer thread")
+        self._cmd_callbacks.append(cb)
+
+    def stats(self) -> WriteQueueStats:
+        with self._stats_lock:
+            return WriteQueueStats(
+                submitted=self._submitted,
+                completed=self._completed,
+                failed=self._failed,
+                batches=self._batches,
+                max_batch=self._max_batch_seen,
+                queue_depth=self._queue.qsize(),
+                wait_total_ms=self._wait_total_ms,
+                wait_max_ms=self._wait_max_ms,
+            )
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """
+        Para a thread de escrita. Com espaço na fila, os comandos pendentes rodam
+        antes (_STOP vai no fim). Fila cheia por `timeout` ou writer preso: os
+        pendentes falham com DatabaseClosedError; close() nunca bloqueia além de ~2x timeout.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            self._abort.set()
+            try:
+                # fila esvaziou nesse meio tempo: acorda o writer parado no get()
+                self._queue.put_nowait(_STOP)
+            except queue.Full:
+                pass  # ainda cheia: o writer vê o _abort antes do próximo get()
+        self._thread.join(timeout)
+        if self._abort.is_set() or self._thread.is_alive():
+            # writer parou sem drenar (ou continua preso): ninguém mais vai rodar os pendentes
+            self._fail_pending()
+
+    def _fail_pending(self) -> None:
+        error = DatabaseClosedError("Write queue is closed")
+        while True:
+            try:
+                cmd = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if cmd is not _STOP and cmd.future.set_running_or_notify_cancel():
+                cmd.future.set_exception(error)
+
+    # ---------- thread de escrita ----------
+
+    def _run(self) -> None:
+        while True:
+            if self._abort.is_set():
+                self._fail_pending()
+                return
+            first = self._queue.get()
+            if first is _STOP:
+                return
+
+            batch: list[_Command] = [first]
+            stop = False
+            while len(batch) < self.max_batch:
+                try:
+                    nxt = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is _STOP:
+                    stop = True
+                    break
+                batch.append(nxt)
+
+            self._run_batch(batch)
+            if stop:
+                return
+
+    def _run_batch(self, batch: list[_Command]) -> None:
+        started = time.perf_counter()
+        waits = [(started - c.enqueued_at) * 1000.0 for c in batch]
+        outcomes: list[tuple[bool, object]] = []
+        self._batch_callbacks = []
+
+        try:
+            self.conn.execute("BEGIN IMMEDIATE;")
+            with self._bind(self.conn):
+                for cmd in batch:
+                    if not cmd.future.set_running_or_notify_cancel():
+                        outcomes.append((False, None))
+                        continue
+                    self.conn.execute("SAVEPOINT write_cmd;")
+                    self._cmd_callbacks = []
+                    try:
+                        result = cmd.fn(self.conn)
+                    except BaseException as e:
+                        self.conn.execute("ROLLBACK TO write_cmd;")
+                        self.conn.execute("RELEASE write_cmd;")
+                        outcomes.append((False, e))
+                    else:
+                        self.conn.execute("RELEASE write_cmd;")
+                        outcomes.append((True, result))
+                        self._batch_callbacks.extend(self._cmd_callbacks)
+                    self._cmd_callbacks = []
+            self.conn.commit()
+        except BaseException as e:
+            # falha de BEGIN/COMMIT: nada do lote foi gravado
+            if self.conn.in_transaction:
+                self.conn.rollback()
+            for cmd in batch:
+                if cmd.future.done():
+                    continue
+                if cmd.future.running() or cmd.future.set_running_or_notify_cancel():
+                    cmd.future.set_exception(e)
+            self._record(batch, waits, failed=len(batch))
+            return
+
+        run_callbacks(self._batch_callbacks)
+        self._batch_callbacks = []
+
+        failed = 0
+        for cmd, (ok, value) in zip(batch, outcomes):
+            if not cmd.future.running():
+                continue  # cancelado antes de rodar
+            if ok:
+                cmd.future.set_result(value)
+            else:
+                failed += 1
+                cmd.future.set_exception(value)  # type: ignore[arg-type]
+        self._record(batch, waits, failed=failed)
+
+    def _record(self, batch: list[_Command], waits: list[float], failed: int) -> None:
+        with self._stats_lock:
+            self._batches += 1
+            self._completed += len(batch)
+            self._failed += failed
+            self._max_batch_seen = max(self._max_batch_seen, len(batch))
+            self._wait_total_ms += sum(waits)
+            self._wait_max_ms = max([self._wait_max_ms, *waits])
@@ -0,0 +1,103 @@
+# app/domain/batch_totals.py
+"""
+Totais de muitos orçamentos de uma vez, em colunas (uma posição por item).
+
+Com NumPy instalado a conta é vetorizada (int64, sem float); sem ele, o
+mesmo cálculo roda num laço sobre array('q'). As duas saídas são idênticas
+a calculate_quote_totals / pricing.line_subtotal_cents: bloco cujos valores
+estourariam o int64 vai para o laço (inteiros do Python não estouram).
+"""
+from __future__ import annotations
+
+from array import array
+from typing import Optional, Sequence
+
+from app.domain.pricing import THOUSANDTHS, normalize_thousandths
+
+try:  # dependência opcional
+    import numpy as np
+except ImportError:  # pragma: no cover - depende do ambiente
+    np = None
+
+
+INT64_MAX = 2**63 - 1
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+def normalize_quantities(quantity_thousandths: array, units: Sequence[str]) -> array:
+    """Milésimos como gravados -> escala do cálculo (mesma regra de Quantity.from_thousandths)."""
+    return array("q", (normalize_thousandths(q, u) for q, u in zip(quantity_thousandths, units)))
+
+
+def _fits_int64(unit_price_cents: array, quantity_thousandths: array, adjustment_cents: array) -> bool:
+    # pior caso de cada etapa do caminho vetorizado: produto (+ meio) e somas por orçamento
+    n = len(unit_price_cents)
+    if n == 0:
+        return True
+
+    def max_abs(col: array) -> int:
+        # int() antes de negar: -int64_min não cabe no int64
+        v = np.frombuffer(col, dtype=np.int64)
+        return max(int(v.max()), -int(v.min()))
+
+    raw = max_abs(unit_price_cents) * max_abs(quantity_thousandths)
+    return (
+        raw + THOUSANDTHS // 2 <= INT64_MAX
+        and n * (raw // THOUSANDTHS + 1) <= INT64_MAX
+        and n * max_abs(adjustment_cents) <= INT64_MAX
+    )
+
+
+def compute_batch_totals(
+    n_quotes: int,
+    item_owner: array,
+    unit_price_cents: array,
+    quantity_thousandths: array,
+    adjustment_cents: array,
+    use_numpy: Optional[bool] = None,
+) -> tuple[list[int], list[int]]:
+    """
+    item_owner[i] = índice (0..n_quotes-1) do orçamento do item i.
+    Devolve (subtotal_cents, adjustments_cents) por orçamento.
+    """
+    if use_numpy is None:
+        use_numpy = numpy_available()
+    if use_numpy:
+        if np is None:
+            raise RuntimeError("NumPy is not installed")
+        if _fits_int64(unit_price_cents, quantity_thousandths, adjustment_cents):
+            return _compute_numpy(n_quotes, item_owner, unit_price_cents, quantity_thousandths, adjustment_cents)
+        # int64 estouraria (e daria a volta em silêncio): mesmo resultado, exato
+    return _compute_python(n_quotes, item_owner, unit_price_cents, quantity_thousandths, adjustment_cents)
+
+
+def _compute_numpy(n_quotes, item_owner, unit_price_cents, quantity_thousandths, adjustment_cents):
+    subtotals = np.zeros(n_quotes, dtype=np.int64)
+    adjustments = np.zeros(n_quotes, dtype=np.int64)
+    if len(item_owner):
+        # frombuffer: sem cópia, array('q') já é int64
+        owner = np.frombuffer(item_owner, dtype=np.int64)
+        raw = np.frombuffer(unit_price_cents, dtype=np.int64) * np.frombuffer(quantity_thousandths, dtype=np.int64)
+
+        # ROUND_HALF_UP em inteiros (meio para longe do zero), como div_round_half_up
+        lines = np.sign(raw) * ((np.abs(raw) + THOUSANDTHS // 2) // THOUSANDTHS)
+
+        # add.at soma em int64 (bincount usaria float64 e perderia precisão)
+        np.add.at(subtotals, owner, lines)
+        np.add.at(adjustments, owner, np.frombuffer(adjustment_cents, dtype=np.int64))
+    return subtotals.tolist(), adjustments.tolist()
+
+
+def _compute_python(n_quotes, item_owner, unit_price_cents, quantity_thousandths, adjustment_cents):
+    subtotals = [0] * n_quotes
+    adjustments = [0] * n_quotes
+    half = THOUSANDTHS // 2
+    for owner, price, qty, adj in zip(item_owner, unit_price_cents, quantity_thousandths, adjustment_cents):
+        raw = price * qty
+        line = (raw + half) // THOUSANDTHS if raw >= 0 else -((-raw + half) // THOUSANDTHS)
+        subtotals[owner] += line
+        adjustments[owner] += adj
+    return subtotals, adjustments
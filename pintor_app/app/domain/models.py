@@ -17,8 +17,11 @@ class QuoteItem:
     adjustment: Money = Money(0)
     description_client: str = ""
 
+    def line_subtotal(self) -> Money:
+        return self.unit_price.mul_thousandths(self.quantity.thousandths)
+
     def line_total(self) -> Money:
-        return self.unit_price.mul_decimal(self.quantity.value) + self.adjustment
+        return self.line_subtotal() + self.adjustment
 
 
 
@@ -34,8 +37,8 @@ def calculate_quote_totals(items: list[QuoteItem]) -> QuoteTotals:
     adjustments = Money(0)
 
     for it in items:
-        subtotal += it.unit_price.mul_decimal(it.quantity.value)
-
+        subtotal += it.line_subtotal()
+        adjustments += it.adjustment
 
 
     total = subtotal + adjustments
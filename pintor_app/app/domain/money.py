@@ -1,6 +1,8 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from decimal import Decimal, ROUND_HALF_UP
+from decimal import Decimal
+
+from app.domain.pricing import line_subtotal_cents, mul_decimal_cents
 
 @dataclass(frozen=True, slots=True)
 class Money:
@@ -26,8 +28,10 @@ class Money:
 
 
 
+    def mul_thousandths(self, qty_thousandths: int) -> "Money":
+        # caminho quente: preço x quantidade em milésimos, só inteiros
+        return Money(line_subtotal_cents(self.cents, qty_thousandths), self.currency)
+
     def mul_decimal(self, qty: Decimal) -> "Money":
-        raw = Decimal(self.cents) * qty
-        rounded = raw.quantize(Decimal("1"), rounding=ROUND_HALF_UP)
-        return Money(int(rounded))
+        return Money(mul_decimal_cents(self.cents, qty), self.currency)
 
@@ -0,0 +1,72 @@
+# app/domain/pricing.py
+"""
+Núcleo de cálculo em inteiros (cents e milésimos de quantidade).
+
+Mesmos resultados do Decimal com ROUND_HALF_UP (meio arredonda para longe
+do zero), sem construir Decimal nem chamar quantize a cada linha.
+Decimal só aparece na borda (entrada digitada) e é convertido uma vez.
+"""
+from __future__ import annotations
+
+from decimal import Decimal
+
+THOUSANDTHS = 1000  # quantidades são gravadas em milésimos (0,001)
+
+
+def div_round_half_up(num: int, den: int) -> int:
+    """num / den arredondado como Decimal ROUND_HALF_UP (den > 0)."""
+    q, r = divmod(abs(num), den)
+    if r * 2 >= den:
+        q += 1
+    return q if num >= 0 else -q
+
+
+def decimal_ratio(value: Decimal) -> tuple[int, int]:
+    """Decimal finito -> (numerador, denominador potência de 10), exato."""
+    sign, digits, exponent = value.as_tuple()
+    if not isinstance(exponent, int):
+        raise ValueError("Quantity must be a finite number")
+
+    num = 0
+    for d in digits:
+        num = num * 10 + d
+    if sign:
+        num = -num
+
+    if exponent >= 0:
+        return num * 10**exponent, 1
+    return num, 10**-exponent
+
+
+def scale_decimal(value: Decimal, places: int) -> int:
+    """round_half_up(value * 10**places) em inteiro (ex.: places=3 -> milésimos)."""
+    num, den = decimal_ratio(value)
+    return div_round_half_up(num * 10**places, den)
+
+
+def quantity_to_thousandths(value: Decimal, unit: str) -> int:
+    # M2 aceita 3 casas; demais unidades (DAY, ROOM, UNIT) são inteiras
+    if unit == "M2":
+        return scale_decimal(value, 3)
+    return scale_decimal(value, 0) * THOUSANDTHS
+
+
+def normalize_thousandths(qty_thousandths: int, unit: str) -> int:
+    """Valor gravado -> mesma escala de quantity_to_thousandths (unidades inteiras arredondam)."""
+    if unit == "M2":
+        return int(qty_thousandths)
+    return div_round_half_up(int(qty_thousandths), THOUSANDTHS) * THOUSANDTHS
+
+
+def line_subtotal_cents(unit_price_cents: int, qty_thousandths: int) -> int:
+    return div_round_half_up(int(unit_price_cents) * int(qty_thousandths), THOUSANDTHS)
+
+
+def line_total_cents(unit_price_cents: int, qty_thousandths: int, adjustment_cents: int = 0) -> int:
+    return line_subtotal_cents(unit_price_cents, qty_thousandths) + int(adjustment_cents)
+
+
+def mul_decimal_cents(cents: int, qty: Decimal) -> int:
+    """cents * qty arredondado (qualquer número de casas), sem aritmética Decimal."""
+    num, den = decimal_ratio(qty)
+    return div_round_half_up(int(cents) * num, den)
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import bisect
+import heapq
+import re
+import unicodedata
+from typing import Generic, Hashable, Iterable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+
+_WORD = re.compile(r"\w+")
+
+
+def fold(text: str) -> str:
+    """Minúsculas sem acento: "Pintura Acrílica" -> "pintura acrilica" (ç -> c, ã -> a...)."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class TextIndex(Generic[K]):
+    """
+    Índice em memória para type-ahead (nomes curtos, milhares de entradas):
+    - prefixo de palavra: lista ordenada (palavra, doc) + bisect
+    - trecho no meio da palavra: trigramas -> docs, conferido com `in`
+    Busca e nome passam por fold(), então "acrilica" acha "Acrílica".
+    Cada palavra da busca tem que casar (AND). Ranking: nome começa com a
+    busca > todas as palavras por prefixo > trecho; depois nome mais curto.
+    Imutável: mudou o catálogo, monta outro (O(n), barato para milhares).
+    """
+
+    def __init__(self, entries: Iterable[tuple[K, str]]) -> None:
+        self._keys: list[K] = []
+        self._folded: list[str] = []
+        postings: dict[str, set[int]] = {}
+        self._grams: dict[str, set[int]] = {}
+
+        for doc, (key, text) in enumerate(entries):
+            folded = fold(text)
+            self._keys.append(key)
+            self._folded.append(folded)
+            for word in _WORD.findall(folded):
+                postings.setdefault(word, set()).add(doc)
+            for gram in _trigrams(folded):
+                self._grams.setdefault(gram, set()).add(doc)
+
+        # palavras distintas ordenadas (bisect) e docs de cada uma
+        self._words = sorted(postings)
+        self._word_docs = [postings[w] for w in self._words]
+        # desempate fixo (nome mais curto, depois alfabético) pré-calculado:
+        # o ranking da busca vira comparação de inteiros
+        n = len(self._folded)
+        by_name = sorted(range(n), key=lambda d: (len(self._folded[d]), self._folded[d]))
+        self._order = [0] * n
+        for pos, doc in enumerate(by_name):
+            self._order[doc] = pos
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def search(self, query: str, limit: int = 20) -> list[K]:
+        folded = fold(query).strip()
+        tokens = _WORD.findall(folded)
+        if not tokens or limit <= 0:
+            return []
+
+        prefix_all: set[int] | None = None  # docs em que toda palavra casou por prefixo
+        matched: set[int] | None = None  # docs em que toda palavra casou (prefixo ou trecho)
+        for token in tokens:
+            by_prefix = self._prefix_docs(token)
+            # trecho (3+ letras) já inclui quem casa por prefixo
+            any_match = self._substring_docs(token) if len(token) >= 3 else by_prefix
+            prefix_all = by_prefix if prefix_all is None else prefix_all & by_prefix
+            matched = any_match if matched is None else matched & any_match
+            if not matched:
+                return []
+
+        n, order, names = len(self._keys), self._order, self._folded
+
+        def rank(doc: int) -> int:
+            if names[doc].startswith(folded):
+                return order[doc]
+            if doc in prefix_all:
+                return n + order[doc]
+            return 2 * n + order[doc]
+
+        return [self._keys[d] for d in heapq.nsmallest(limit, matched, key=rank)]
+
+    def _prefix_docs(self, token: str) -> set[int]:
+        lo = bisect.bisect_left(self._words, token)
+        # "\uffff" fecha o intervalo: tudo que começa com token fica antes
+        hi = bisect.bisect_left(self._words, token + "\uffff", lo)
+        if hi - lo == 1:
+            return self._word_docs[lo]  # só leitura: quem chama não altera
+        return set().union(*self._word_docs[lo:hi])
+
+    def _substring_docs(self, token: str) -> set[int]:
+        # só para 3+ letras (1-2 letras ficam no prefixo: trecho casaria quase tudo)
+        postings = [self._grams.get(gram) for gram in _trigrams(token)]
+        if not all(postings):
+            return set()
+        # menor lista primeiro: a interseção nunca cresce
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for docs in postings[1:]:
+            candidates &= docs
+        return {d for d in candidates if token in self._folded[d]}
@@ -25,6 +25,17 @@ def main(page: ft.Page):
     # Guardar no page para controllers acessarem (sem global solto)
     page.data = {"container": container}
 
+    def on_close(_):
+        # sessão encerrada: cancela a carga em andamento e devolve a referência do
+        # pool compartilhado (o último a sair fecha writer, readers e DBExecutor).
+        # on_disconnect não serve: a sessão pode reconectar com o mesmo page
+        loads = page.data.get("load_scheduler")
+        if loads is not None:
+            loads.cancel()
+        container.close()
+
+    page.on_close = on_close
+
     router = build_router(page)
     page.data["router"] = router
     shell = AppShell(page=page, router=router)
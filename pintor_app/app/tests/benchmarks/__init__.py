@@ -0,0 +1,13 @@
+"""
+Benchmarks de repos, use cases e domínio sobre bancos sintéticos.
+
+    python -m app.tests.benchmarks --scale 1k                    # roda e imprime
+    python -m app.tests.benchmarks --scale 1k --save-baseline     # grava baseline
+    python -m app.tests.benchmarks --scale 1k --out run.json      # compara com o baseline
+
+Bancos gerados ficam em --data-dir (padrão: data/bench) e são reaproveitados.
+Baseline por escala em app/tests/benchmarks/baselines/<escala>.json. O 1k.json
+versionado é só referência (a máquina está no próprio arquivo): numa máquina
+diferente, grave um baseline local com --save-baseline antes de comparar.
+Sai com código 1 se algum caso regredir além de --threshold.
+"""
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from app.core.config import load_config
+from app.db.tracing import SQLTracer
+from app.tests.benchmarks.compare import compare, read_json, results_document, write_json
+from app.tests.benchmarks.datagen import SCALES, ensure_database
+from app.tests.benchmarks.suite import BenchResult, run_suite
+
+BASELINES_DIR = Path(__file__).resolve().parent / "baselines"
+
+
+def _print_result(r: BenchResult) -> None:
+    print(f"{r.name:<42} {r.median_ms:10.3f} ms  (min {r.min_ms:.3f}, p95 {r.p95_ms:.3f}, n={r.iterations})")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.tests.benchmarks")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="1k")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--only", help="só casos cujo nome contém este texto")
+    parser.add_argument("--data-dir", type=Path, default=None, help="onde ficam os bancos gerados")
+    parser.add_argument("--rebuild", action="store_true", help="gera o banco de novo")
+    parser.add_argument("--out", type=Path, help="grava os resultados (JSON)")
+    parser.add_argument("--baseline", type=Path, help="baseline (padrão: baselines/<escala>.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="grava os resultados como baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="regressão: mediana > baseline * (1 + t)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.05)
+    parser.add_argument("--trace", action="store_true", help="liga o SQLTracer e mostra as queries mais caras")
+    args = parser.parse_args(argv)
+
+    scale = SCALES[args.scale]
+    data_dir = args.data_dir or load_config().data_dir / "bench"
+    print(f"banco: escala {scale.name} ({scale.quotes} orçamentos), seed {args.seed}")
+    db_path = ensure_database(data_dir, scale, args.seed, rebuild=args.rebuild)
+
+    tracer = SQLTracer(slow_ms=None) if args.trace else None
+    results = run_suite(db_path, iterations=args.iterations, only=args.only, progress=_print_result, tracer=tracer)
+    document = results_document(results, scale.name, args.seed)
+    if args.out:
+        write_json(args.out, document)
+
+    if tracer is not None:
+        # tempos com instrumentação não valem contra o baseline
+        print("\nSQL por tempo total:")
+        for stat in tracer.top(10):
+            print(f"{stat.total_ms:>10.1f} ms {stat.count:>8}x  {stat.fingerprint[:100]}")
+        return 0
+
+    baseline_path = args.baseline or BASELINES_DIR / f"{scale.name}.json"
+    if args.save_baseline:
+        write_json(baseline_path, document)
+        print(f"baseline gravado em {baseline_path}")
+        return 0
+    if not baseline_path.exists():
+        print(f"sem baseline em {baseline_path} (use --save-baseline)")
+        return 0
+
+    rows, regressions = compare(document, read_json(baseline_path), args.threshold, args.min_delta_ms)
+    print(f"\ncomparação com {baseline_path} (limite +{args.threshold:.0%}):")
+    for c in rows:
+        mark = "  REGRESSÃO" if c in regressions else ""
+        print(f"{c.name:<42} {c.baseline_ms:10.3f} -> {c.current_ms:10.3f} ms  ({c.ratio:5.2f}x){mark}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""Resultados em JSON e comparação com baseline gravado."""
+from __future__ import annotations
+
+import json
+import platform
+import sqlite3
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable
+
+from app.tests.benchmarks.suite import BenchResult
+
+FORMAT_VERSION = 1
+
+
+@dataclass(frozen=True, slots=True)
+class Comparison:
+    name: str
+    baseline_ms: float
+    current_ms: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current_ms / self.baseline_ms if self.baseline_ms > 0 else float("inf")
+
+
+def results_document(results: Iterable[BenchResult], scale: str, seed: int) -> dict:
+    return {
+        "format": FORMAT_VERSION,
+        "scale": scale,
+        "seed": seed,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "results": {r.name: r.to_dict() for r in results},
+    }
+
+
+def write_json(path: Path, document: dict) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(document, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+
+def read_json(path: Path) -> dict:
+    document = json.loads(Path(path).read_text(encoding="utf-8"))
+    if document.get("format") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported benchmark file format: {document.get('format')!r}")
+    return document
+
+
+def compare(
+    current: dict,
+    baseline: dict,
+    threshold: float = 0.2,
+    min_delta_ms: float = 0.05,
+) -> tuple[list[Comparison], list[Comparison]]:
+    """
+    (todas as comparações, regressões). Regressão: mediana acima de
+    baseline * (1 + threshold) E mais de min_delta_ms acima (casos de
+    microssegundos variam mais que 20% só de ruído). Casos sem baseline ficam fora.
+    """
+    if current.get("scale") != baseline.get("scale"):
+        raise ValueError(
+            f"Baseline scale {baseline.get('scale')!r} does not match results scale {current.get('scale')!r}"
+        )
+    rows: list[Comparison] = []
+    regressions: list[Comparison] = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        cmp = Comparison(name=name, baseline_ms=base["median_ms"], current_ms=result["median_ms"])
+        rows.append(cmp)
+        if cmp.current_ms > cmp.baseline_ms * (1 + threshold) and cmp.current_ms - cmp.baseline_ms > min_delta_ms:
+            regressions.append(cmp)
+    return rows, regressions
@@ -0,0 +1,198 @@
+"""
+Bancos sintéticos para benchmark (determinísticos por escala + seed).
+
+Itens por orçamento seguem cauda longa (Pareto, 1..MAX_ITEMS): a maioria tem
+poucos itens, alguns têm centenas. Para os casos extremos existirem em toda
+escala, cada banco também tem orçamentos fixos:
+- BIG_QUOTE_ID:     MAX_ITEMS itens (pior caso de detalhes/listagem)
+- TYPICAL_QUOTE_ID: 20 itens
+- WRITE_QUOTE_ID:   alvo das escritas do benchmark (itens removidos depois)
+"""
+from __future__ import annotations
+
+import random
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator
+
+from app.db.database import connect_sqlite
+from app.db.migrations import get_migrations, run_migrations
+from app.domain.pricing import line_subtotal_cents, normalize_thousandths
+
+MAX_ITEMS = 5_000
+BIG_QUOTE_ID = "bench-big"
+TYPICAL_QUOTE_ID = "bench-typical"
+WRITE_QUOTE_ID = "bench-write"
+
+_UNITS = ("M2", "M2", "M2", "DAY", "ROOM", "UNIT")
+_STATUSES = ("DRAFT", "DRAFT", "SENT", "APPROVED")
+_SERVICES = (
+    "Pintura acrílica", "Pintura látex", "Massa corrida", "Lixamento", "Selador",
+    "Textura", "Grafiato", "Verniz", "Esmalte sintético", "Impermeabilização",
+)
+_NAMES = ("Ana", "João", "Maria", "José", "Luíza", "Pedro", "Carla", "Marcos", "Fernanda", "Antônio")
+_SURNAMES = ("Silva", "Souza", "Oliveira", "Santos", "Pereira", "Lima", "Gonçalves", "Araújo")
+
+_BATCH = 20_000
+
+
+@dataclass(frozen=True, slots=True)
+class Scale:
+    name: str
+    quotes: int
+    services: int = 200
+    pareto_alpha: float = 1.2  # menor = cauda mais longa
+
+
+SCALES: dict[str, Scale] = {
+    "tiny": Scale("tiny", quotes=50, services=20),  # testes da própria suíte
+    "1k": Scale("1k", quotes=1_000),
+    "100k": Scale("100k", quotes=100_000),
+    "1m": Scale("1m", quotes=1_000_000),
+}
+
+
+def database_path(data_dir: Path, scale: Scale, seed: int) -> Path:
+    return Path(data_dir) / f"bench_{scale.name}_s{seed}.db"
+
+
+def ensure_database(data_dir: Path, scale: Scale, seed: int = 42, rebuild: bool = False) -> Path:
+    """Gera o banco da escala se ainda não existir (gerar 1m leva minutos)."""
+    path = database_path(data_dir, scale, seed)
+    ignore = Path(data_dir) / ".gitignore"
+    if not ignore.exists():
+        # bancos gerados (centenas de MB) nunca vão para o git
+        ignore.parent.mkdir(parents=True, exist_ok=True)
+        ignore.write_text("*\n", encoding="utf-8")
+    if rebuild or not path.exists():
+        generate(path, scale, seed)
+    return path
+
+
+def _items_count(rng: random.Random, scale: Scale) -> int:
+    return min(MAX_ITEMS, int(rng.paretovariate(scale.pareto_alpha)))
+
+
+def _item_rows(rng: random.Random, quote_id: str, n: int) -> Iterator[tuple]:
+    for pos in range(n):
+        unit = rng.choice(_UNITS)
+        qty = normalize_thousandths(rng.randrange(500, 200_000), unit)
+        price = rng.randrange(500, 20_000)
+        adj = rng.choice((0, 0, 0, -500, 1_000))
+        yield (
+            f"{quote_id}-{pos}",
+            quote_id,
+            rng.choice(_SERVICES),
+            unit,
+            qty // 1000,
+            qty,
+            price,
+            adj,
+            "",
+            pos,
+        )
+
+
+def generate(path: Path, scale: Scale, seed: int = 42) -> None:
+    path = Path(path)
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{path}{suffix}").unlink(missing_ok=True)
+
+    conn = connect_sqlite(path)
+    conn.isolation_level = None  # BEGIN/COMMIT explícitos
+    try:
+        run_migrations(conn, get_migrations())
+        _fill(conn, scale, random.Random(seed))
+    finally:
+        conn.close()
+
+
+def _fill(conn: sqlite3.Connection, scale: Scale, rng: random.Random) -> None:
+    # carga em massa sem os triggers de FTS; o índice é reconstruído no fim
+    triggers = conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND name LIKE '%_fts_%';"
+    ).fetchall()
+    conn.execute("PRAGMA synchronous = OFF;")
+    conn.execute("BEGIN;")
+    for t in triggers:
+        conn.execute(f"DROP TRIGGER {t['name']};")
+
+    start = datetime(2024, 1, 1)
+    conn.executemany(
+        "INSERT INTO services (id, name, unit, default_unit_price_cents, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?);",
+        [
+            (
+                f"svc-{n}",
+                f"{_SERVICES[n % len(_SERVICES)]} {n}",
+                rng.choice(_UNITS),
+                rng.randrange(500, 20_000),
+                start.isoformat(),
+                start.isoformat(),
+            )
+            for n in range(scale.services)
+        ],
+    )
+
+    fixed = [(BIG_QUOTE_ID, MAX_ITEMS), (TYPICAL_QUOTE_ID, 20), (WRITE_QUOTE_ID, 0)]
+    plan = fixed + [(f"q{n:07d}", _items_count(rng, scale)) for n in range(scale.quotes)]
+
+    quotes: list[tuple] = []
+    items: list[tuple] = []
+    for n, (quote_id, n_items) in enumerate(plan):
+        rows = list(_item_rows(rng, quote_id, n_items))
+        subtotal = sum(line_subtotal_cents(r[6], r[5]) for r in rows)
+        adjustments = sum(r[7] for r in rows)
+        created = (start + timedelta(minutes=n)).isoformat()
+        quotes.append(
+            (
+                quote_id,
+                f"{rng.choice(_NAMES)} {rng.choice(_SURNAMES)}",
+                rng.choice(_STATUSES),
+                rng.randrange(2),
+                subtotal,
+                adjustments,
+                subtotal + adjustments,
+                created,
+                created,
+            )
+        )
+        items.extend(rows)
+        if len(items) >= _BATCH or len(quotes) >= _BATCH:
+            _flush(conn, quotes, items)
+    _flush(conn, quotes, items)
+
+    for t in triggers:
+        conn.execute(t["sql"])
+    conn.execute("INSERT INTO quotes_fts(quotes_fts) VALUES('rebuild');")
+    conn.execute("INSERT INTO quote_items_fts(quote_items_fts) VALUES('rebuild');")
+    conn.execute("COMMIT;")
+    conn.execute("ANALYZE;")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+
+
+def _flush(conn: sqlite3.Connection, quotes: list[tuple], items: list[tuple]) -> None:
+    conn.executemany(
+        """
+        INSERT INTO quotes (
+          id, customer_name, status, materials_included,
+          subtotal_sale_cents, adjustments_cents, total_sale_cents,
+          created_at, updated_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?);
+        """,
+        quotes,
+    )
+    conn.executemany(
+        """
+        INSERT INTO quote_items (
+          id, quote_id, service_name, unit,
+          quantity, quantity_thousandths,
+          unit_price_cents, adjustment_cents, description_client,
+          position
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+        """,
+        items,
+    )
+    quotes.clear()
+    items.clear()
@@ -0,0 +1,196 @@
+"""Casos de benchmark: repos, use cases e o cálculo de totais do domínio."""
+from __future__ import annotations
+
+import gc
+import random
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from functools import partial
+from decimal import ROUND_HALF_UP, Decimal
+from pathlib import Path
+from typing import Callable, Optional
+
+from app.core.use_cases.add_item_to_quote import AddItemToQuote, AddItemToQuoteInput
+from app.core.cache import VersionedCache
+from app.core.use_cases.get_quote_details import GetQuoteDetails
+from app.core.use_cases.get_quote_notes import GetQuoteNotes
+from app.core.use_cases.get_quote_summary import GetQuoteSummary
+from app.core.use_cases.list_quote_items import ListQuoteItems, ListQuoteItemsRequest
+from app.db.pool import SQLitePool
+from app.db.tracing import SQLTracer
+from app.db.repos.quick_quotes_repo import QuickQuotesRepo
+from app.db.repos.services_repo import ServicesRepo
+from app.db.unit_of_work import SQLiteUnitOfWork
+from app.domain.models import QuoteItem, calculate_quote_totals
+from app.domain.money import Money
+from app.domain.pricing import line_subtotal_cents
+from app.domain.quantity import Quantity
+from app.tests.benchmarks.datagen import BIG_QUOTE_ID, TYPICAL_QUOTE_ID, WRITE_QUOTE_ID
+
+
+PRICING_LINES = 10_000
+
+
+@dataclass(frozen=True, slots=True)
+class BenchResult:
+    name: str
+    iterations: int
+    min_ms: float
+    median_ms: float
+    p95_ms: float
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def measure(name: str, fn: Callable[[], object], iterations: int, warmup: int = 2) -> BenchResult:
+    """Tempo por chamada; GC desligado durante a medição (menos ruído entre execuções)."""
+    for _ in range(warmup):
+        fn()
+    samples: list[float] = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(iterations):
+            t0 = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - t0) * 1000.0)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    samples.sort()
+    return BenchResult(
+        name=name,
+        iterations=iterations,
+        min_ms=samples[0],
+        median_ms=statistics.median(samples),
+        p95_ms=samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+    )
+
+
+def _domain_items(repo: QuickQuotesRepo, quote_id: str) -> list[QuoteItem]:
+    return [
+        QuoteItem(
+            id=r.id,
+            quote_id=r.quote_id,
+            service_name=r.service_name,
+            unit=r.unit,
+            quantity=Quantity.from_thousandths(int(r.quantity_thousandths), unit=r.unit),
+            unit_price=Money(int(r.unit_price_cents)),
+            adjustment=Money(int(r.adjustment_cents)),
+        )
+        for r in repo.list_items(quote_id)
+    ]
+
+
+def _open_quote(summary: GetQuoteSummary, notes: GetQuoteNotes, items: ListQuoteItems, quote_id: str) -> object:
+    # o que a tela de detalhes faz: resumo + observações + primeira janela da lista virtual
+    summary.execute(quote_id)
+    notes.execute(quote_id)
+    return items.execute(ListQuoteItemsRequest(quote_id, offset=0, limit=50))
+
+
+def _pricing_lines(n: int, seed: int = 42) -> list[tuple[int, int]]:
+    # (unit_price_cents, quantity_thousandths) sem banco: custo puro por linha
+    rng = random.Random(seed)
+    return [(rng.randrange(100, 500_000), rng.randrange(1, 2_000_000)) for _ in range(n)]
+
+
+def _decimal_line(price_cents: int, qty_thousandths: int) -> int:
+    # cálculo antigo (Decimal), referência para o núcleo inteiro
+    raw = Decimal(price_cents) * (Decimal(qty_thousandths) / Decimal(1000))
+    return int(raw.quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+
+def _sum_lines(line_fn: Callable[[int, int], int], lines: list[tuple[int, int]]) -> int:
+    return sum(line_fn(p, q) for p, q in lines)
+
+
+def _cold(cache: VersionedCache, open_quote: Callable[[], object]) -> object:
+    cache.clear()
+    return open_quote()
+
+
+def run_suite(
+    db_path: Path,
+    iterations: int = 30,
+    only: Optional[str] = None,
+    progress: Optional[Callable[[BenchResult], None]] = None,
+    tracer: Optional[SQLTracer] = None,
+) -> list[BenchResult]:
+    """
+    Roda todos os casos (ou os que contêm `only` no nome) sobre um banco da datagen.
+    Com tracer, as conexões são instrumentadas (tempos incluem o custo do rastreio).
+    """
+    pool = SQLitePool(db_path, readers=2, tracer=tracer)
+    try:
+        services = ServicesRepo(pool)
+        quotes = QuickQuotesRepo(pool)
+        uow = SQLiteUnitOfWork(pool)
+        details = GetQuoteDetails(quotes)
+        views: VersionedCache = VersionedCache()
+        summary = GetQuoteSummary(quotes, views)
+        notes = GetQuoteNotes(quotes, views)
+        items = ListQuoteItems(quotes, views)
+        open_big = partial(_open_quote, summary, notes, items, BIG_QUOTE_ID)
+        add_item = AddItemToQuote(quotes, uow)
+        big_items = _domain_items(quotes, BIG_QUOTE_ID)
+        pricing_lines = _pricing_lines(PRICING_LINES)
+        line_decimal = partial(_sum_lines, _decimal_line, pricing_lines)
+        line_int = partial(_sum_lines, line_subtotal_cents, pricing_lines)
+        if line_decimal() != line_int():
+            raise AssertionError("line_subtotal_cents diverge do cálculo em Decimal")
+
+        line = AddItemToQuoteInput(
+            quote_id=WRITE_QUOTE_ID,
+            service_name="Pintura acrílica",
+            unit="M2",
+            quantity=Decimal("12.5"),
+            unit_price_cents=2_500,
+        )
+
+        cases: list[tuple[str, Callable[[], object]]] = [
+            ("repo.ServicesRepo.list_all", services.list_all),
+            ("repo.QuickQuotesRepo.list_history", lambda: quotes.list_history(limit=50)),
+            ("repo.QuickQuotesRepo.list_items[20]", lambda: quotes.list_items(TYPICAL_QUOTE_ID)),
+            ("repo.QuickQuotesRepo.list_items[5000]", lambda: quotes.list_items(BIG_QUOTE_ID)),
+            ("use_case.AddItemToQuote", lambda: add_item.execute(line)),
+            ("use_case.GetQuoteDetails[20]", lambda: details.execute(TYPICAL_QUOTE_ID)),
+            ("use_case.GetQuoteDetails[5000]", lambda: details.execute(BIG_QUOTE_ID)),
+            # abrir pela tela: cold = cache de resumo/janelas limpo a cada chamada;
+            # cached = só as validações por updated_at
+            ("use_case.OpenQuote[5000,cold]", lambda: _cold(views, open_big)),
+            ("use_case.OpenQuote[5000,cached]", open_big),
+            ("domain.calculate_quote_totals[5000]", lambda: calculate_quote_totals(big_items)),
+            # custo por linha: Decimal (antigo) x núcleo inteiro
+            (f"domain.line_subtotal[{PRICING_LINES},decimal]", line_decimal),
+            (f"domain.line_subtotal[{PRICING_LINES},int]", line_int),
+        ]
+
+        results = []
+        try:
+            for name, fn in cases:
+                if only and only not in name:
+                    continue
+                result = measure(name, fn, iterations)
+                results.append(result)
+                if progress is not None:
+                    progress(result)
+        finally:
+            _reset_write_quote(pool)
+        return results
+    finally:
+        pool.close()
+
+
+def _reset_write_quote(pool: SQLitePool) -> None:
+    # banco gerado é reaproveitado entre execuções: desfaz as escritas do benchmark
+    def _tx(conn) -> None:
+        conn.execute("DELETE FROM quote_items WHERE quote_id = ?;", (WRITE_QUOTE_ID,))
+        conn.execute(
+            "UPDATE quotes SET subtotal_sale_cents = 0, adjustments_cents = 0, total_sale_cents = 0 WHERE id = ?;",
+            (WRITE_QUOTE_ID,),
+        )
+
+    pool.write(_tx)
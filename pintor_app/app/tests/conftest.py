@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+
+import pytest
+
+from app.db.database import connect_sqlite
+from app.db.migrations import get_migrations, run_migrations
+from app.db.pool import SQLitePool
+from app.db.tracing import QueryEvent, SQLTracer
+
+# controle de transação não conta no orçamento (vem do UoW/pool, não do use case)
+_TRANSACTION_CONTROL = ("BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE", "END")
+
+
+@pytest.fixture()
+def db_path(tmp_path):
+    path = tmp_path / "test.db"
+    conn = connect_sqlite(path)
+    run_migrations(conn, get_migrations())
+    conn.close()
+    return path
+
+
+@pytest.fixture()
+def pool(db_path):
+    p = SQLitePool(db_path, readers=2)
+    yield p
+    p.close()
+
+
+class QueryBudget:
+    """
+    Statements de uma chamada (capturados pelo SQLTracer do pool):
+    - queries: sem BEGIN/COMMIT/SAVEPOINT...
+    - repeated: fingerprints que aparecem mais de uma vez (provável N+1)
+    """
+
+    def __init__(self, events: list[QueryEvent]) -> None:
+        self.events = events
+
+    @property
+    def queries(self) -> list[QueryEvent]:
+        return [e for e in self.events if not e.fingerprint.upper().startswith(_TRANSACTION_CONTROL)]
+
+    def repeated(self, allow: Iterable[str] = ()) -> dict[str, int]:
+        allowed = tuple(allow)
+        counts = Counter(e.fingerprint for e in self.queries)
+        return {fp: n for fp, n in counts.items() if n > 1 and not any(a in fp for a in allowed)}
+
+    def describe(self) -> str:
+        return "\n".join(f"  {e.rows:>5} rows  {e.fingerprint}" for e in self.queries)
+
+
+@pytest.fixture()
+def sql_tracer():
+    return SQLTracer(capacity=10_000, slow_ms=None)
+
+
+@pytest.fixture()
+def traced_pool(db_path, sql_tracer):
+    p = SQLitePool(db_path, readers=2, tracer=sql_tracer)
+    yield p
+    p.close()
+
+
+@pytest.fixture()
+def query_budget(sql_tracer):
+    """
+    with query_budget(3): ...  -> falha se o bloco rodar mais de 3 queries ou
+    repetir o mesmo formato de statement (allow_repeats: trechos de fingerprint
+    que podem repetir, ex.: leitura em blocos).
+    """
+
+    @contextmanager
+    def check(max_queries: int, allow_repeats: Iterable[str] = ()) -> Iterator[QueryBudget]:
+        with sql_tracer.capture() as events:
+            budget = QueryBudget(events)
+            yield budget
+        queries = budget.queries
+        assert len(queries) <= max_queries, (
+            f"{len(queries)} queries (orçamento: {max_queries}):\n{budget.describe()}"
+        )
+        repeated = budget.repeated(allow_repeats)
+        assert not repeated, "possível N+1 (mesmo statement repetido na chamada):\n" + "\n".join(
+            f"  {n}x {fp}" for fp, n in repeated.items()
+        )
+
+    return check
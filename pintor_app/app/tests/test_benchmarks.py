@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from app.tests.benchmarks.compare import compare, read_json, results_document, write_json
+from app.tests.benchmarks.datagen import BIG_QUOTE_ID, MAX_ITEMS, SCALES, WRITE_QUOTE_ID, ensure_database
+from app.tests.benchmarks.suite import BenchResult, run_suite
+
+
+def _doc(**medians: float) -> dict:
+    return results_document(
+        [BenchResult(name=n, iterations=1, min_ms=v, median_ms=v, p95_ms=v) for n, v in medians.items()],
+        scale="tiny",
+        seed=1,
+    )
+
+
+def test_compare_flags_only_regressions_above_threshold_and_noise():
+    baseline = _doc(slow=10.0, fast=0.01, same=5.0)
+    current = _doc(slow=13.0, fast=0.03, same=5.5, new=1.0)
+
+    rows, regressions = compare(current, baseline, threshold=0.2, min_delta_ms=0.05)
+    assert {c.name for c in rows} == {"slow", "fast", "same"}
+    # fast triplicou, mas 0,02 ms está abaixo do piso de ruído
+    assert [c.name for c in regressions] == ["slow"]
+
+    with pytest.raises(ValueError):
+        compare(current, {**baseline, "scale": "1k"})
+
+
+def test_results_round_trip(tmp_path):
+    path = tmp_path / "out" / "run.json"
+    write_json(path, _doc(a=1.5))
+    assert read_json(path)["results"]["a"]["median_ms"] == 1.5
+
+
+def test_tiny_database_and_suite_run(tmp_path):
+    db_path = ensure_database(tmp_path, SCALES["tiny"], seed=1)
+    conn = sqlite3.connect(db_path)
+    try:
+        (big,) = conn.execute("SELECT COUNT(*) FROM quote_items WHERE quote_id = ?", (BIG_QUOTE_ID,)).fetchone()
+        (quotes,) = conn.execute("SELECT COUNT(*) FROM quotes").fetchone()
+        # FTS reconstruído depois da carga sem triggers
+        (hits,) = conn.execute("SELECT COUNT(*) FROM quote_items_fts WHERE quote_items_fts MATCH 'pintura'").fetchone()
+    finally:
+        conn.close()
+    assert big == MAX_ITEMS
+    assert quotes == SCALES["tiny"].quotes + 3
+    assert hits > 0
+
+    results = run_suite(db_path, iterations=2)
+    assert all(r.median_ms >= 0 for r in results)
+    assert any(r.name == "use_case.AddItemToQuote" for r in results)
+
+    # escritas do benchmark são desfeitas: o banco serve para a próxima execução
+    conn = sqlite3.connect(db_path)
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM quote_items WHERE quote_id = ?", (WRITE_QUOTE_ID,)).fetchone() == (0,)
+    finally:
+        conn.close()
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from types import SimpleNamespace
+
+import flet as ft
+import pytest
+
+from app.core.metrics import MetricsRegistry
+from app.db.errors import DatabaseClosedError
+from app.db.tracing import SQLTracer
+from app.ui.components.keyed import KeyedList, set_props
+from app.ui.components.type_ahead import TypeAhead
+from app.ui.components.virtual_list import VirtualList, WindowedSource
+from app.ui.controllers.quick_quote_history_controller import QuickQuoteHistoryController
+from app.ui.controllers.quote_edit_controller import QuoteEditController
+from app.ui.pages.perf_page import PerfPage
+from app.ui.perf import count_controls, timed_render
+from app.ui.viewmodels.quote_edit_vm import QuoteEditVM
+from app.ui.viewmodels.quote_history_vm import QuoteHistoryVM
+
+
+@dataclass(slots=True)
+class _Row:
+    item_id: str
+    label: str
+
+
+def _keyed():
+    built = []
+
+    def build(row):
+        built.append(row.item_id)
+        return ft.Text(row.label)
+
+    rows = KeyedList(
+        key=lambda r: r.item_id,
+        build=build,
+        patch=lambda ctrl, r: set_props(ctrl, value=r.label),
+    )
+    return rows, built
+
+
+def test_keyed_list_reuses_unchanged_rows_and_patches_changed_ones():
+    rows, built = _keyed()
+    rows.sync([_Row("a", "A"), _Row("b", "B"), _Row("c", "C")])
+    a, b, c = rows.control.controls
+
+    stats = rows.sync([_Row("a", "A"), _Row("c", "C2"), _Row("d", "D")])
+
+    assert (stats.added, stats.updated, stats.removed, stats.kept) == (1, 1, 1, 1)
+    assert built == ["a", "b", "c", "d"]
+    assert rows.control.controls[0] is a and rows.control.controls[1] is c
+    assert c.value == "C2" and len(rows) == 3
+
+
+def test_keyed_list_keeps_control_list_when_nothing_moved():
+    rows, _ = _keyed()
+    rows.sync([_Row("a", "A"), _Row("b", "B")])
+    before = rows.control.controls
+
+    rows.sync([_Row("a", "A"), _Row("b", "B!")])
+    assert rows.control.controls is before
+
+    rows.sync([_Row("b", "B!"), _Row("a", "A")])
+    assert [t.value for t in rows.control.controls] == ["B!", "A"]
+
+    with pytest.raises(ValueError):
+        rows.sync([_Row("a", "A"), _Row("a", "A")])
+
+
+class _Page:
+    def update(self) -> None:
+        pass
+
+    def run_task(self, fn, *args):
+        return asyncio.ensure_future(fn(*args))
+
+
+def test_history_reenter_recovers_from_a_load_cancelled_by_navigation():
+    gate = asyncio.Event()
+    calls = []
+
+    async def execute(req):
+        calls.append(req.cursor)
+        await gate.wait()
+        row = SimpleNamespace(id="q1", customer_name="Ana", status="DRAFT", total_sale_cents=1000, updated_at="t1")
+        return SimpleNamespace(quotes=[row], next_cursor=None)
+
+    page = _Page()
+    page.data = {"container": SimpleNamespace(list_quote_history=SimpleNamespace(execute=execute))}
+    vm = QuoteHistoryVM()
+    ctrl = QuickQuoteHistoryController(page, vm)
+
+    async def scenario():
+        ctrl.on_route_enter()
+        await asyncio.sleep(0)
+        ctrl._loads.cancel()  # saiu da rota com a carga em andamento
+        await asyncio.sleep(0)
+        assert not vm.is_loading and vm.rows == []
+
+        gate.set()
+        ctrl.on_route_reenter()
+        await asyncio.sleep(0.01)
+
+    asyncio.run(scenario())
+
+    assert calls == [None, None]
+    assert [r.quote_id for r in vm.rows] == ["q1"]
+    assert not vm.is_loading and not vm.is_loading_more
+
+
+@pytest.mark.parametrize("error", [TimeoutError("Write queue is full"), DatabaseClosedError("Write queue is closed")])
+def test_edit_save_failure_in_the_db_layer_unlocks_the_form(error):
+    async def execute(inp):
+        raise error
+
+    page = _Page()
+    page.data = {"container": SimpleNamespace(add_item_to_quote=SimpleNamespace(execute=execute))}
+    vm = QuoteEditVM()
+    ctrl = QuoteEditController(page, vm, "q1")
+
+    asyncio.run(ctrl._add_item_async("Parede", "M2", 3, 1000, 0))
+
+    assert not vm.is_saving
+    assert vm.form_error == "Não foi possível salvar agora. Tente novamente."
+
+
+def test_edit_save_bug_is_not_reported_as_a_db_failure():
+    async def execute(inp):
+        raise RuntimeError("bug no caminho de salvar")
+
+    page = _Page()
+    page.data = {"container": SimpleNamespace(add_item_to_quote=SimpleNamespace(execute=execute))}
+    vm = QuoteEditVM()
+    ctrl = QuoteEditController(page, vm, "q1")
+
+    with pytest.raises(RuntimeError, match="bug"):
+        asyncio.run(ctrl._add_item_async("Parede", "M2", 3, 1000, 0))
+    assert not vm.is_saving  # mesmo assim o form não trava
+
+
+def test_virtual_list_materializes_only_the_visible_window():
+    data = [_Row(f"i{n}", f"Linha {n}") for n in range(5000)]
+    fetched = []
+
+    async def fetch(offset, limit):
+        fetched.append(offset)
+        return data[offset : offset + limit], len(data)
+
+    source = WindowedSource(fetch, page_size=50, max_pages=4)
+    rows = VirtualList(_Page(), source, key=lambda r: r.item_id, build=lambda r: ft.Text(r.label),
+                       row_height=20, height=200, overscan=5)
+    rows._scroll.delay = 0
+
+    async def scroll(pixels):
+        rows._on_scroll(SimpleNamespace(pixels=pixels))
+        await asyncio.sleep(0.01)
+
+    async def scenario():
+        rows.reload()
+        await asyncio.sleep(0.01)
+        first = rows._rows.control.controls[0]
+        await scroll(40)  # ainda dentro da janela: nada muda
+        assert rows._rows.control.controls[0] is first
+        await scroll(20 * 2000)
+
+    asyncio.run(scenario())
+
+    assert rows.materialized == 20  # 10 visíveis + 5 de cada lado
+    assert (rows.start, rows.end) == (1995, 2015)
+    assert rows._top.height == 1995 * 20 and rows._bottom.height == (5000 - 2015) * 20
+    assert rows._rows.control.controls[5].content.value == "Linha 2000"
+    assert fetched == [0, 1950, 2000]
+
+
+def test_type_ahead_searches_once_per_burst_and_picks_a_suggestion():
+    names = ["Pintura", "Pintura acrílica", "Massa"]
+    queries, picked = [], []
+
+    async def search(text):
+        queries.append(text)
+        return [n for n in names if n.lower().startswith(text.lower())]
+
+    box = TypeAhead(_Page(), search=search, key=lambda n: n, label=lambda n: n, on_select=picked.append)
+    box._debounce.delay = 0.01
+
+    async def scenario():
+        for text in ["p", "pi", "pin", "pint"]:
+            box._on_change(SimpleNamespace(control=SimpleNamespace(value=text)))
+        await asyncio.sleep(0.05)
+
+    asyncio.run(scenario())
+
+    assert queries == ["pint"]
+    assert box.suggestions == 2
+    option = box._results.control.controls[1]
+    option.on_click(SimpleNamespace(control=option))
+    assert picked == ["Pintura acrílica"]
+    assert box.field.value == "Pintura acrílica" and box.suggestions == 0
+
+
+def test_timed_render_records_time_and_control_count():
+    metrics = MetricsRegistry()
+    page = SimpleNamespace(data={"container": SimpleNamespace(metrics=metrics)})
+
+    root = ft.Column(controls=[ft.Text("a"), ft.Container(content=ft.Text("b"))])
+    assert count_controls(root) == 4
+
+    calls = []
+    render = timed_render(page, "X", lambda: calls.append(1), root)
+    render()
+    render()
+    snaps = {s.name: s for s in metrics.snapshot()}
+    assert len(calls) == 2
+    assert snaps["render.X"].count == 2
+    assert (snaps["render.X.controls"].count, snaps["render.X.controls"].max) == (2, 4)
+
+
+def test_perf_page_sql_toggle_label_follows_the_tracer():
+    tracer = SQLTracer(slow_ms=None)
+    page = _Page()
+    page.data = {"container": SimpleNamespace(metrics=MetricsRegistry(), pool=SimpleNamespace(tracer=tracer))}
+    toolbar = PerfPage(page).content.controls[0]
+    button = toolbar.controls[-1]
+    assert button.content == "Pausar SQL"
+
+    button.on_click(SimpleNamespace(control=button))
+    assert not tracer.enabled and button.content == "Retomar SQL"
+
+    button.on_click(SimpleNamespace(control=button))
+    assert tracer.enabled and button.content == "Pausar SQL"
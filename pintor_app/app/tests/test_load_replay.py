@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.core.config import AppConfig
+from app.core.state import AppContainer
+from app.tools.load_replay import LoadReplay, Workload, _prepare_db, parse_mix
+
+
+def test_parse_mix():
+    assert parse_mix("add_item=8, history=2") == {"add_item": 8.0, "history": 2.0}
+    with pytest.raises(ValueError):
+        parse_mix("add_item")
+
+
+def test_replay_runs_mix_through_container(tmp_path):
+    db_path = tmp_path / "load.db"
+    _prepare_db(db_path, fresh=True)
+    cfg = AppConfig(project_root=tmp_path, data_dir=tmp_path, db_path=db_path, sql_trace=False)
+    container = AppContainer.build(cfg)
+    try:
+        with pytest.raises(ValueError):
+            LoadReplay(container, Workload(mix={"bogus": 1}))
+
+        report = asyncio.run(LoadReplay(container, Workload(painters=4, duration_s=0.3, think_ms=0)).run())
+    finally:
+        container.close()
+
+    assert report.ops > 0 and report.errors == 0
+    assert report.throughput > 0
+    # todo tipo de operação do mix padrão rodou e tem percentis
+    assert set(report.by_op) == {"create", "add_item", "paste", "open_quote", "history", "search", "services"}
+    assert all(s.p50_ms <= s.p95_ms <= s.p99_ms <= s.max_ms for s in report.by_op.values())
+    assert report.write_commands >= report.by_op["add_item"].count
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import asyncio
+
+from app.core.metrics import Histogram, MetricsRegistry, metrics_for
+
+
+def test_histogram_percentiles_within_bucket_error():
+    h = Histogram("x")
+    for v in range(1, 10_001):
+        h.record(v)
+    snap = h.snapshot()
+    assert (snap.count, snap.min, snap.max) == (10_000, 1, 10_000)
+    # bucket log-linear: nunca abaixo do valor exato, no máximo ~1,6% acima
+    for got, exact in ((snap.p50, 5_000), (snap.p95, 9_500), (snap.p99, 9_900)):
+        assert exact <= got <= exact * 1.016
+    assert Histogram("vazio").snapshot().p99 == 0
+
+
+def test_registry_timed_sync_and_async():
+    metrics = MetricsRegistry()
+
+    @metrics.timed("sync")
+    def work():
+        return 1
+
+    @metrics.timed()
+    async def load():
+        return 2
+
+    assert work() == 1
+    assert asyncio.run(load()) == 2
+    names = {s.name: s.count for s in metrics.snapshot()}
+    assert names["sync"] == 1
+    assert names[load.__qualname__] == 1
+
+    metrics.enabled = False
+    work()
+    assert metrics.histogram("sync").count == 1
+
+    metrics.reset()
+    assert all(s.count == 0 for s in metrics.snapshot())
+
+
+def test_metrics_for_is_shared_per_owner():
+    class Owner:
+        pass
+
+    a, b = Owner(), Owner()
+    assert metrics_for(a) is metrics_for(a)
+    assert metrics_for(a) is not metrics_for(b)
+
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import random
+from decimal import ROUND_HALF_UP, Decimal
+
+import pytest
+
+from app.domain.models import QuoteItem, calculate_quote_totals
+from app.domain.money import Money
+from app.domain.pricing import div_round_half_up, line_subtotal_cents, mul_decimal_cents
+from app.domain.quantity import Quantity
+
+
+# referências: o cálculo Decimal que o núcleo inteiro substituiu
+def _ref_subtotal(price_cents: int, qty_thousandths: int) -> int:
+    raw = Decimal(price_cents) * (Decimal(qty_thousandths) / Decimal(1000))
+    return int(raw.quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+
+def _ref_mul_decimal(cents: int, qty: Decimal) -> int:
+    return int((Decimal(cents) * qty).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+
+def _ref_thousandths(value: Decimal, unit: str) -> int:
+    scale = Decimal("0.001") if unit == "M2" else Decimal("1")
+    q = value.quantize(scale, rounding=ROUND_HALF_UP)
+    return int((q * Decimal(1000)).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+
+@pytest.mark.parametrize("num", range(-25, 26))
+def test_div_round_half_up_matches_decimal(num):
+    expected = int((Decimal(num) / Decimal(10)).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+    assert div_round_half_up(num, 10) == expected
+
+
+def test_line_subtotal_matches_decimal_reference():
+    rng = random.Random(20260101)
+    edges = [(1, 500), (1, 499), (3, 500), (999_999, 1), (12345, 12_345_678), (0, 1000)]
+    cases = edges + [(rng.randrange(0, 10_000_000), rng.randrange(0, 100_000_000)) for _ in range(20_000)]
+
+    for price, qty in cases:
+        assert line_subtotal_cents(price, qty) == _ref_subtotal(price, qty), (price, qty)
+        assert Money(price).mul_thousandths(qty).cents == _ref_subtotal(price, qty)
+
+
+def test_decimal_boundary_matches_decimal_reference():
+    rng = random.Random(7)
+    for _ in range(5_000):
+        value = Decimal(rng.randrange(0, 10_000_000)).scaleb(-rng.randrange(0, 6))
+        cents = rng.randrange(-1_000_000, 1_000_000)
+        for unit in ("M2", "DAY"):
+            assert Quantity.from_decimal(value, unit).thousandths == _ref_thousandths(value, unit), (value, unit)
+        assert mul_decimal_cents(cents, value) == _ref_mul_decimal(cents, value), (cents, value)
+
+
+def test_quantity_keeps_decimal_view():
+    q = Quantity.from_decimal(Decimal("12.5"), "M2")
+    assert q.thousandths == 12500
+    assert q.value == Decimal("12.5")
+    assert Quantity.from_thousandths(2500, unit="UNIT").thousandths == 3000
+
+
+def test_quote_totals_include_line_adjustments():
+    # regra desde user-004: ajustes das linhas entram no total (antes ficavam em zero)
+    items = [
+        QuoteItem("a", "q", "Parede", "M2", Quantity.from_decimal(Decimal("12.5"), "M2"), Money(2500), Money(-250)),
+        QuoteItem("b", "q", "Teto", "DAY", Quantity.from_decimal(Decimal("2"), "DAY"), Money(35000), Money(1000)),
+        QuoteItem("c", "q", "Porta", "UNIT", Quantity.from_decimal(Decimal("1"), "UNIT"), Money(5000)),
+    ]
+
+    totals = calculate_quote_totals(items)
+
+    assert totals.subtotal_sale.cents == 31250 + 70000 + 5000
+    assert totals.adjustments.cents == 750
+    assert totals.total_sale.cents == 106250 + 750
+    assert totals.total_sale.cents == sum(it.line_total().cents for it in items)
+
+
+def test_batch_totals_engines_match_line_kernel():
+    from array import array
+
+    from app.domain.batch_totals import compute_batch_totals, numpy_available
+
+    rng = random.Random(3)
+    owner = array("q", sorted(rng.randrange(0, 50) for _ in range(2_000)))
+    price = array("q", (rng.randrange(0, 1_000_000) for _ in owner))
+    qty = array("q", (rng.randrange(0, 10_000_000) for _ in owner))
+    adj = array("q", (rng.randrange(-5_000, 5_000) for _ in owner))
+
+    expected_sub, expected_adj = [0] * 50, [0] * 50
+    for o, p, q, a in zip(owner, price, qty, adj):
+        expected_sub[o] += line_subtotal_cents(p, q)
+        expected_adj[o] += a
+
+    engines = [False, True] if numpy_available() else [False]
+    for use_numpy in engines:
+        assert compute_batch_totals(50, owner, price, qty, adj, use_numpy=use_numpy) == (expected_sub, expected_adj)
+
+    # produto além do int64 (quantidade aceita até MAX_THOUSANDTHS): exato nos dois motores
+    big = (array("q", [0, 0]), array("q", [500_000, 3]), array("q", [2**62, 1_000]), array("q", [0, 0]))
+    expected = ([line_subtotal_cents(500_000, 2**62) + 3], [0])
+    for use_numpy in engines:
+        assert compute_batch_totals(1, *big, use_numpy=use_numpy) == expected
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+
+from app.core.use_cases.add_item_to_quote import AddItemToQuote, AddItemToQuoteInput
+from app.core.use_cases.add_items_to_quote import AddItemsToQuote, AddItemsToQuoteInput, QuoteItemLine
+from app.core.use_cases.create_quick_quote_draft import CreateQuickQuoteDraft, CreateQuickQuoteDraftInput
+from app.core.use_cases.get_quote_details import GetQuoteDetails
+from app.core.use_cases.get_quote_notes import GetQuoteNotes
+from app.core.use_cases.get_quote_summary import GetQuoteSummary
+from app.core.use_cases.list_quote_history import ListQuoteHistory, ListQuoteHistoryRequest
+from app.core.use_cases.list_quote_items import ListQuoteItems, ListQuoteItemsRequest
+from app.core.use_cases.recalculate_all_totals import RecalculateAllTotals
+from app.core.use_cases.recalculate_quote_totals import RecalculateQuoteTotals
+from app.core.use_cases.remove_item_from_quote import RemoveItemFromQuote
+from app.core.use_cases.search_quotes import SearchQuotes, SearchQuotesRequest
+from app.core.use_cases.search_services import SearchServicesRequest, SearchServicesUseCase
+from app.db.repos.quick_quotes_repo import QuickQuotesRepo
+from app.db.repos.services_cache import CachedServicesRepo
+from app.db.unit_of_work import SQLiteUnitOfWork
+
+# Orçamento de queries por chamada de use case (sem controle de transação).
+# Subir um número aqui é decisão de revisão: o teste existe para isso não
+# acontecer sem querer.
+
+QUOTES = 5
+ITEMS_PER_QUOTE = 30
+
+
+@pytest.fixture()
+def quotes_repo(traced_pool):
+    return QuickQuotesRepo(traced_pool)
+
+
+@pytest.fixture()
+def uow(traced_pool):
+    return SQLiteUnitOfWork(traced_pool)
+
+
+@pytest.fixture()
+def quote_ids(quotes_repo):
+    # base de fixture: vários orçamentos com muitos itens, para N+1 aparecer
+    ids = []
+    for n in range(QUOTES):
+        qid = quotes_repo.create_draft(f"Cliente {n}")
+        quotes_repo.add_items_many(
+            qid, [(f"Serviço {i}", "m2", 1000 * (i + 1), 500, 0, "") for i in range(ITEMS_PER_QUOTE)]
+        )
+        ids.append(qid)
+    return ids
+
+
+def _line(i: int) -> QuoteItemLine:
+    return QuoteItemLine(service_name=f"Linha {i}", unit="m2", quantity=Decimal("2"), unit_price_cents=1000)
+
+
+def test_write_use_cases_stay_within_budget(quotes_repo, uow, quote_ids, query_budget):
+    with query_budget(1):
+        CreateQuickQuoteDraft(quotes_repo, uow).execute(CreateQuickQuoteDraftInput("Novo"))
+
+    with query_budget(4):
+        AddItemToQuote(quotes_repo, uow).execute(
+            AddItemToQuoteInput(quote_ids[0], "Parede", "m2", Decimal("3"), 1000)
+        )
+
+    # lote: mesmo número de statements para 1 ou 40 linhas
+    with query_budget(4):
+        AddItemsToQuote(quotes_repo, uow).execute(AddItemsToQuoteInput(quote_ids[1], [_line(i) for i in range(40)]))
+
+    item_id = quotes_repo.list_items(quote_ids[2])[0].id
+    with query_budget(6):
+        RemoveItemFromQuote(quotes_repo, uow).execute(item_id)
+
+    with query_budget(2):
+        RecalculateQuoteTotals(quotes_repo, uow).execute(quote_ids[3])
+
+
+def test_read_use_cases_stay_within_budget(quotes_repo, quote_ids, query_budget):
+    with query_budget(3) as q:
+        dto = GetQuoteDetails(quotes_repo).execute(quote_ids[0])
+    assert len(dto.items) == ITEMS_PER_QUOTE
+    # itens vêm de uma query só, não uma por item
+    assert max(e.rows for e in q.queries) == ITEMS_PER_QUOTE
+
+    with query_budget(2) as q:
+        GetQuoteSummary(quotes_repo).execute(quote_ids[0])
+    # cabeçalho sem notes_*: observações só por GetQuoteNotes
+    assert not any("notes_" in e.fingerprint for e in q.queries)
+
+    with query_budget(1):
+        GetQuoteNotes(quotes_repo).execute(quote_ids[0])
+
+    with query_budget(3):
+        ListQuoteItems(quotes_repo).execute(ListQuoteItemsRequest(quote_ids[0], offset=10, limit=10))
+
+    with query_budget(1):
+        ListQuoteHistory(quotes_repo).execute(ListQuoteHistoryRequest(limit=50))
+
+    with query_budget(1):
+        SearchQuotes(quotes_repo).execute(SearchQuotesRequest("Cliente"))
+
+
+def test_recalculate_all_reads_in_chunks(quotes_repo, uow, quote_ids, query_budget):
+    # por bloco de 2 orçamentos: uma leitura (orçamentos + itens) e um UPDATE em
+    # lote (add_items_many não mexe nos totais). Repetir por bloco é o desenho;
+    # o que não pode é crescer com o número de itens
+    chunks = -(-QUOTES // 2)
+    with query_budget(2 * chunks, allow_repeats=("WITH chunk AS", "UPDATE quotes SET subtotal_sale_cents")):
+        RecalculateAllTotals(quotes_repo, uow, chunk_size=2, use_numpy=False).execute()
+
+
+def test_warm_service_search_hits_no_sql(traced_pool, query_budget):
+    repo = CachedServicesRepo(traced_pool)
+    for n in range(20):
+        repo.create(f"Pintura {n}", "m2", 1000)
+    search = SearchServicesUseCase(repo)
+    search.execute(SearchServicesRequest(text="pint"))
+
+    with query_budget(0):
+        assert search.execute(SearchServicesRequest(text="pint")).services
+
+
+def test_budget_flags_repeated_statement_shapes(quotes_repo, quote_ids, query_budget):
+    # N+1 clássico: uma leitura por orçamento
+    with pytest.raises(AssertionError, match="N\\+1"):
+        with query_budget(10):
+            for qid in quote_ids:
+                quotes_repo.get_by_id(qid)
+
+    with pytest.raises(AssertionError, match="orçamento: 2"):
+        with query_budget(2):
+            for qid in quote_ids[:3]:
+                quotes_repo.get_updated_at(qid)
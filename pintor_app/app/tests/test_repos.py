@@ -0,0 +1,525 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+from contextlib import nullcontext
+from datetime import datetime
+
+import pytest
+
+from app.core.config import AppConfig
+from app.core.state import AppContainer
+from app.db.database import connect_sqlite
+from app.db.errors import DatabaseClosedError
+from app.db.executor import DBExecutor
+from app.db.migrations import get_migrations, run_migrations
+from app.db.pool import SingleConnectionPool, _BasePool
+from app.db.write_queue import WriteQueue
+from app.db.repos.quick_quotes_repo import QuickQuotesRepo
+from app.db.repos.services_cache import CachedServicesRepo
+from app.db.repos.services_repo import ServicesRepo
+
+
+def test_services_crud_through_pool(pool):
+    repo = ServicesRepo(pool)
+    sid = repo.create("Pintura parede", "M2", 2500)
+    repo.update_price(sid, 3000)
+
+    assert repo.get_by_id(sid).default_unit_price_cents == 3000
+    assert [s.id for s in repo.list_all()] == [sid]
+
+    repo.delete(sid)
+    with pytest.raises(ValueError):
+        repo.get_by_id(sid)
+
+
+def test_quote_with_items_through_pool(pool):
+    repo = QuickQuotesRepo(pool)
+    qid = repo.create_draft("Maria")
+    repo.add_item(qid, "Pintura", "M2", quantity_thousandths=12500, unit_price_cents=1000)
+
+    quote, items = repo.get_quote_with_items(qid)
+    assert quote.customer_name == "Maria"
+    assert [i.quantity_thousandths for i in items] == [12500]
+
+
+def test_writes_are_committed_and_visible_to_other_connections(pool, db_path):
+    QuickQuotesRepo(pool).create_draft("João")
+
+    other = sqlite3.connect(db_path)
+    try:
+        assert other.execute("SELECT COUNT(*) FROM quotes;").fetchone()[0] == 1
+    finally:
+        other.close()
+
+
+def test_reader_connections_are_query_only(pool):
+    with pool.reader() as conn:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM quotes;")
+
+
+def test_failed_write_rolls_back(pool):
+    repo = QuickQuotesRepo(pool)
+
+    def _tx(conn):
+        repo.create_draft("Rollback")
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        pool.write(_tx)
+
+    assert repo.list_history() == []
+
+
+def test_reader_stats_track_checkouts_and_waits(pool):
+    repo = ServicesRepo(pool)
+    repo.create("Massa corrida", "M2", 1500)
+
+    release = threading.Event()
+    holding = threading.Event()
+
+    def hold_readers():
+        with pool.reader():
+            holding.set()
+            release.wait(1)
+
+    holders = [threading.Thread(target=hold_readers) for _ in range(2)]
+    for t in holders:
+        t.start()
+    holding.wait(1)
+    threading.Timer(0.05, release.set).start()
+    repo.list_all()
+    for t in holders:
+        t.join()
+
+    stats = pool.stats().reader
+    assert stats.checkouts == 3
+    assert stats.wait_max_ms >= 20
+    assert stats.in_use == 0
+
+
+def _block_writer(pool):
+    running, gate = threading.Event(), threading.Event()
+
+    def _hold(conn):
+        running.set()
+        gate.wait(1)
+
+    blocker = pool.submit_write(_hold)
+    running.wait(1)
+    return blocker, gate
+
+
+def test_write_queue_group_commits_concurrent_writes(pool):
+    blocker, gate = _block_writer(pool)
+
+    # enfileiradas enquanto o writer está ocupado: devem sair num único lote
+    futures = [
+        pool.submit_write(lambda conn, i=i: conn.execute(
+            "INSERT INTO services (id, name, unit, default_unit_price_cents, created_at, updated_at) "
+            "VALUES (?, ?, 'M2', 0, '', '');",
+            (f"s{i}", f"Serviço {i}"),
+        ).rowcount)
+        for i in range(10)
+    ]
+    gate.set()
+
+    blocker.result(timeout=2)
+    assert [f.result(timeout=2) for f in futures] == [1] * 10
+
+    stats = pool.stats().writer
+    assert stats.completed == 11
+    assert stats.batches == 2
+    assert stats.max_batch == 10
+
+
+def test_write_queue_isolates_failed_command_in_batch(pool):
+    repo = QuickQuotesRepo(pool)
+    blocker, gate = _block_writer(pool)
+
+    ok = pool.submit_write(lambda conn: repo.create_draft("Fica"))
+    bad = pool.submit_write(lambda conn: repo.update_status("nao-existe", "SENT"))
+    gate.set()
+
+    blocker.result(timeout=2)
+    qid = ok.result(timeout=2)
+    with pytest.raises(ValueError):
+        bad.result(timeout=2)
+
+    assert repo.get_by_id(qid).customer_name == "Fica"
+    assert pool.stats().writer.failed == 1
+
+
+def test_write_queue_close_does_not_hang_on_a_full_queue_and_stuck_writer(db_path):
+    conn = connect_sqlite(db_path, check_same_thread=False)
+    conn.isolation_level = None
+    writes = WriteQueue(conn, bind=lambda c: nullcontext(c), maxsize=1)
+    running, gate = threading.Event(), threading.Event()
+
+    def _hold(c):
+        running.set()
+        gate.wait(5)
+
+    stuck = writes.submit(_hold)
+    running.wait(1)
+    pending = writes.submit(lambda c: 1)  # ocupa a única vaga
+
+    started = time.perf_counter()
+    writes.close(timeout=0.1)
+    assert time.perf_counter() - started < 1.0
+
+    with pytest.raises(RuntimeError, match="closed"):
+        pending.result(timeout=1)
+    with pytest.raises(RuntimeError):
+        writes.submit(lambda c: 1)
+
+    gate.set()
+    stuck.result(timeout=2)  # o comando em andamento termina normalmente
+    writes._thread.join(2)
+    assert not writes._thread.is_alive()
+    conn.close()
+
+
+def test_incomplete_pool_fails_at_construction():
+    class _NoStats(SingleConnectionPool):
+        _writer_stats = _BasePool._writer_stats
+
+    conn = connect_sqlite(":memory:")
+    try:
+        with pytest.raises(TypeError, match="_writer_stats"):
+            _NoStats(conn)
+    finally:
+        conn.close()
+
+
+def test_repo_accepts_plain_connection(db_path):
+    conn = connect_sqlite(db_path)
+    try:
+        repo = QuickQuotesRepo(conn)
+        qid = repo.create_draft("Ana")
+        assert not conn.in_transaction
+        assert repo.get_by_id(qid).status == "DRAFT"
+    finally:
+        conn.close()
+
+
+def _seed_history(repo_cls, pool, n):
+    # relógio controlado: vários quotes com o mesmo updated_at testam o desempate por id
+    ticks = iter(datetime(2026, 1, 1, 12, 0, i // 3) for i in range(n))
+    repo = repo_cls(pool, now_fn=lambda: next(ticks))
+    return [repo.create_draft(f"Cliente {i}", quote_id=f"q{i:03d}") for i in range(n)]
+
+
+def test_history_keyset_pages_cover_everything_once(pool):
+    _seed_history(QuickQuotesRepo, pool, 25)
+    repo = QuickQuotesRepo(pool)
+
+    seen, cursor = [], None
+    while True:
+        page = repo.list_history_page(limit=10, cursor=cursor)
+        seen.extend(r.id for r in page.rows)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    expected = [r.id for r in repo.list_history(limit=100)]
+    assert seen == expected
+    assert len(set(seen)) == 25
+
+
+def test_iter_history_streams_in_chunks(pool):
+    ids = _seed_history(QuickQuotesRepo, pool, 7)
+    repo = QuickQuotesRepo(pool)
+
+    streamed = list(repo.iter_history(chunk_size=3))
+
+    assert sorted(r.id for r in streamed) == sorted(ids)
+    assert pool.stats().reader.checkouts == 3
+
+
+def test_history_rejects_garbage_cursor(pool):
+    with pytest.raises(ValueError):
+        QuickQuotesRepo(pool).list_history_page(cursor="nao-e-cursor")
+
+
+def test_history_summaries_match_full_rows_and_use_covering_index(pool):
+    _seed_history(QuickQuotesRepo, pool, 5)
+    repo = QuickQuotesRepo(pool)
+    repo.update_notes("q004", "Nota longa " * 200, "interna")
+
+    summaries = repo.list_history_summaries(limit=3)
+    full = repo.list_history_page(limit=3)
+    assert [s.id for s in summaries.rows] == [r.id for r in full.rows]
+    assert summaries.next_cursor == full.next_cursor
+    assert not hasattr(summaries.rows[0], "notes_client")
+
+    with pool.reader() as conn:
+        plan = " ".join(
+            r["detail"]
+            for r in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT id, customer_name, status, total_sale_cents, created_at, updated_at "
+                "FROM quotes ORDER BY updated_at DESC, id DESC LIMIT 50;"
+            )
+        )
+    assert "COVERING INDEX" in plan
+
+    notes = repo.get_notes("q004")
+    assert notes.notes_internal == "interna"
+
+
+def test_search_quotes_ranks_names_notes_and_items(pool):
+    repo = QuickQuotesRepo(pool)
+    joao = repo.create_draft("João Pereira")
+    maria = repo.create_draft("Maria")
+    repo.add_item(maria, "Textura", "M2", 1000, 100, description_client="acabamento acetinado")
+    repo.update_notes(maria, "cliente quer pintura rápida")
+
+    # sem acento e por prefixo
+    assert [r.id for r in repo.search_quotes("joao")] == [joao]
+    assert [r.id for r in repo.search_quotes("acetin")] == [maria]
+    assert [r.id for r in repo.search_quotes("pintura")] == [maria]
+    assert repo.search_quotes("  ?! ") == []
+
+
+def test_search_quotes_pages_are_stable_and_keep_item_only_matches(pool):
+    repo = QuickQuotesRepo(pool)
+    by_name = [repo.create_draft(f"Verniz {n}") for n in range(9)]
+    by_items = []
+    for n in range(4):
+        qid = repo.create_draft(f"Cliente {n}")
+        for _ in range(6):  # vários hits no mesmo orçamento
+            repo.add_item(qid, "Verniz marítimo", "M2", 1000, 100)
+        by_items.append(qid)
+
+    everything = [r.id for r in repo.search_quotes("verniz", limit=100)]
+    assert sorted(everything) == sorted(by_name + by_items)
+
+    # páginas pequenas e profundas: mesma sequência, sem pular nem repetir
+    paged = [r.id for offset in range(0, 15, 2) for r in repo.search_quotes("verniz", limit=2, offset=offset)]
+    assert paged == everything
+
+
+def test_search_index_follows_updates_and_deletes(pool):
+    repo = QuickQuotesRepo(pool)
+    qid = repo.create_draft("Carlos")
+    item_id = repo.add_item(qid, "Grafiato", "M2", 1000, 100)
+
+    repo.delete_item(item_id)
+    assert repo.search_quotes("grafiato") == []
+
+    repo.update_notes(qid, "portão da garagem")
+    assert [r.id for r in repo.search_quotes("portao")] == [qid]
+    repo.update_notes(qid, "")
+    assert repo.search_quotes("portao") == []
+
+    repo.rebuild_search_index()
+    assert [r.id for r in repo.search_quotes("carlos")] == [qid]
+
+
+def test_services_catalog_cache_serves_warm_reads_without_queries(pool):
+    repo = CachedServicesRepo(pool)
+    a = repo.create("pintura", "M2", 2500)
+    b = repo.create("Massa", "M2", 1500)
+    assert [s.id for s in repo.list_all()] == [b, a]
+
+    # outra instância (outra sessão) no mesmo pool divide o catálogo
+    other = CachedServicesRepo(pool)
+    checkouts = pool.stats().reader.checkouts
+    assert [s.id for s in other.list_all()] == [b, a]
+    assert other.get_by_id(a).name == "pintura"
+    assert pool.stats().reader.checkouts == checkouts
+
+    # escritas corrigem o catálogo no lugar, mantendo a ordem do banco
+    c = repo.create("Grafiato", "M2", 3000)
+    repo.update_price(a, 2800)
+    repo.delete(b)
+    cached = other.list_all()
+    assert cached == ServicesRepo(pool).list_all()
+    assert [s.id for s in cached] == [c, a]
+    assert cached[1].default_unit_price_cents == 2800
+
+    stats = repo.cache.stats()
+    assert stats.misses == 1
+    assert stats.patches == 3
+
+
+def test_services_catalog_cache_ignores_rolled_back_writes(pool):
+    repo = CachedServicesRepo(pool)
+    repo.list_all()
+
+    def _tx(conn):
+        repo.create("Fantasma", "M2", 100)
+        assert [s.name for s in repo.list_all()] == ["Fantasma"]
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        pool.write(_tx)
+
+    assert repo.list_all() == []
+    repo.upsert_many([("s1", "Textura", "M2", 900)])
+    assert [s.id for s in repo.list_all()] == ["s1"]
+
+
+def test_services_search_uses_cached_index_and_follows_writes(pool):
+    repo = CachedServicesRepo(pool)
+    repo.create("Pintura acrílica", "M2", 2500)
+    repo.create("Massa corrida", "M2", 1500)
+
+    assert [s.name for s in repo.search("acrilica")] == ["Pintura acrílica"]
+    checkouts = pool.stats().reader.checkouts
+    assert [s.name for s in repo.search("corr")] == ["Massa corrida"]
+    assert pool.stats().reader.checkouts == checkouts  # índice em memória
+
+    repo.create("Acrílico fosco", "M2", 2800)
+    assert [s.name for s in repo.search("acril")] == ["Acrílico fosco", "Pintura acrílica"]
+    assert repo.search("acril") == ServicesRepo(pool).search("acril")
+
+
+def test_db_executor_keeps_event_loop_free_and_reads_through_pool_readers(pool):
+    repo = QuickQuotesRepo(pool)
+    qid = repo.create_draft("Assíncrono")
+    executor = DBExecutor(pool, workers=2)
+    started = threading.Event()
+
+    def slow_read():
+        started.set()
+        with pool.reader(snapshot=True) as conn:
+            conn.execute("SELECT COUNT(*) FROM quotes;").fetchone()
+            time.sleep(0.2)
+            return threading.current_thread().name, repo.get_by_id(qid).customer_name
+
+    async def scenario():
+        ticks = 0
+        task = asyncio.ensure_future(executor.run(slow_read))
+        while not task.done():
+            ticks += 1
+            await asyncio.sleep(0.01)
+        return ticks, await task, await executor.run(repo.get_updated_at, qid)
+
+    try:
+        ticks, (thread_name, name), version = asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+
+    assert ticks >= 5  # o loop continuou rodando durante a query
+    assert thread_name.startswith("sqlite-io")
+    assert name == "Assíncrono" and version
+    # workers leem pelas readers do pool (a leitura aninhada reaproveita a conexão)
+    assert pool.stats().reader.checkouts == 2
+
+
+def test_db_executor_shutdown_surfaces_as_database_closed(pool):
+    executor = DBExecutor(pool, workers=1)
+    gate = threading.Event()
+
+    async def scenario():
+        busy = asyncio.ensure_future(executor.run(gate.wait, 1))
+        queued = asyncio.ensure_future(executor.run(lambda: 1))
+        await asyncio.sleep(0.01)
+        executor.shutdown(wait=False)  # cancela o que ainda estava na fila
+        gate.set()
+        await busy
+        with pytest.raises(DatabaseClosedError):
+            await queued
+        with pytest.raises(DatabaseClosedError):
+            await executor.run(lambda: 1)
+
+        # cancelamento de quem espera continua sendo CancelledError
+        waiter = asyncio.ensure_future(other.run(time.sleep, 0.05))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    other = DBExecutor(pool, workers=1)
+    try:
+        asyncio.run(scenario())
+    finally:
+        other.shutdown()
+    assert executor.stats().completed == 2
+
+
+def test_items_window_slices_list_items_in_order(pool):
+    repo = QuickQuotesRepo(pool)
+    qid = repo.create_draft("Obra grande")
+    repo.add_items_many(qid, [(f"Item {i}", "UNIT", 1000, 100, 0, "") for i in range(30)])
+
+    total, window = repo.get_items_window(qid, offset=10, limit=5)
+
+    assert total == 30
+    assert window == repo.list_items(qid)[10:15]
+    assert repo.list_items_window(qid, offset=28, limit=5) == repo.list_items(qid)[28:]
+    with pytest.raises(ValueError):
+        repo.get_items_window("nao-existe")
+
+
+def test_item_positions_stay_dense_and_drive_keyset_pages(pool):
+    repo = QuickQuotesRepo(pool)
+    qid = repo.create_draft("Obra grande")
+    ids = repo.add_items_many(qid, [(f"Item {i}", "UNIT", 1000, 100, 0, "") for i in range(7)])
+    repo.add_item(qid, "Último", "UNIT", 1000, 100)
+    repo.delete_item(ids[2])
+
+    items = repo.list_items(qid)
+    assert [i.position for i in items] == list(range(7))
+    assert [i.service_name for i in items][2:4] == ["Item 3", "Item 4"]
+    assert repo.list_items_window(qid, offset=6, limit=5)[0].service_name == "Último"
+
+    first = repo.list_items_page(qid, limit=3)
+    assert first.next_position == 2
+    assert list(repo.iter_items(qid, chunk_size=3)) == items
+
+    quote, count = repo.get_quote_summary(qid)
+    assert quote.id == qid and count == 7
+
+
+def test_position_migration_backfills_insertion_order(tmp_path):
+    conn = connect_sqlite(tmp_path / "old.db")
+    try:
+        run_migrations(conn, [m for m in get_migrations() if m[0] < 6])
+        conn.execute("INSERT INTO quotes (id, customer_name, status, created_at, updated_at) VALUES ('q', 'Ana', 'DRAFT', '', '');")
+        for item_id in ("c", "a", "b"):  # vale a ordem de inserção (rowid), não o id
+            conn.execute(
+                "INSERT INTO quote_items (id, quote_id, service_name, unit, quantity, unit_price_cents) "
+                "VALUES (?, 'q', 'Item', 'UNIT', 1, 100);",
+                (item_id,),
+            )
+        conn.commit()
+
+        run_migrations(conn, get_migrations())
+        repo = QuickQuotesRepo(conn)
+        assert [(i.id, i.position) for i in repo.list_items("q")] == [("c", 0), ("a", 1), ("b", 2)]
+    finally:
+        conn.close()
+
+
+def test_fresh_install_builds_only_the_history_cover_indexes(tmp_path):
+    conn = connect_sqlite(tmp_path / "fresh.db")
+    try:
+        run_migrations(conn, get_migrations())
+        indexes = {r["name"] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index';")}
+    finally:
+        conn.close()
+    assert {"idx_quotes_history_cover", "idx_quotes_status_history_cover"} <= indexes
+    assert not indexes & {"idx_quotes_status_updated", "idx_quotes_updated_id", "idx_quotes_status_updated_id"}
+    # a antiga versão 3 foi absorvida pela 4
+    assert 3 not in {v for v, _ in get_migrations()}
+
+
+def test_shared_pool_closes_when_the_last_container_closes(tmp_path, db_path):
+    cfg = AppConfig(project_root=tmp_path, data_dir=tmp_path, db_path=db_path)
+    first, second = AppContainer.build(cfg), AppContainer.build(cfg)
+    assert first.pool is second.pool
+
+    first.close()
+    first.close()  # on_close repetido não libera a referência da outra sessão
+    with second.pool.reader() as conn:
+        conn.execute("SELECT 1;")
+
+    second.close()
+    with pytest.raises(RuntimeError):
+        with second.pool.reader():
+            pass
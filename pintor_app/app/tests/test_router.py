@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+
+import flet as ft
+
+from app.core.router import Router
+from app.ui.shell import AppShell
+
+
+class _FakePage:
+    def __init__(self) -> None:
+        self.data: dict = {}
+        self.updates = 0
+
+    def update(self) -> None:
+        self.updates += 1
+
+    # usados pelo AppShell
+    width = 1200
+    controls: list
+
+    def add(self, *controls) -> None:
+        self.controls.extend(controls)
+
+    def run_task(self, fn, *args):
+        return asyncio.ensure_future(fn(*args))
+
+
+class _Controller:
+    def __init__(self) -> None:
+        self.reentered = 0
+
+    def on_route_reenter(self) -> None:
+        self.reentered += 1
+
+
+def test_keep_alive_reuses_views_and_evicts_lru():
+    built: list[str] = []
+
+    def builder(name):
+        def _build():
+            built.append(name)
+            return ft.Text(name), _Controller()
+
+        return _build
+
+    routes = {"/a": builder("a"), "/b": builder("b"), "/c": builder("c"), "/form": builder("form")}
+    router = Router(_FakePage(), routes, max_alive=2)
+    router.set_container(ft.Container())
+    router.keep_alive("/a", "/b", "/c")
+
+    router.go("/a")
+    first = router.container.content
+    router.go("/form")
+    router.go("/a")
+    assert router.container.content is first
+    assert router._alive["/a"].controller.reentered == 1
+
+    router.go("/form")  # sem opt-in: sempre remonta
+    router.go("/b")
+    router.go("/c")  # LRU: "/a" sai
+    router.go("/a")
+    router.refresh()  # view guardada: só on_route_reenter
+    router.go("/a", rebuild=True)
+
+    assert built == ["a", "form", "form", "b", "c", "a", "a"]
+
+
+def test_shell_resize_is_debounced_and_relayouts_only_across_breakpoint():
+    page = _FakePage()
+    page.controls = []
+    router = Router(page, {"/": lambda: ft.Text("home")})
+    shell = AppShell(page, router)
+    shell._resize.delay = 0.01
+    renders = []
+    original = shell._render
+    shell._render = lambda: (renders.append(page.width), original())
+
+    async def drag(widths):
+        for w in widths:
+            page.width = w
+            page.on_resize(None)
+        await asyncio.sleep(0.05)
+
+    async def scenario():
+        shell.mount()
+        await drag(range(1200, 950, -10))  # continua desktop: nada
+        await drag(range(950, 600, -10))  # cruzou: uma remontagem
+        await drag([650, 700, 800])
+
+    asyncio.run(scenario())
+
+    assert renders == [1200, 610]
+    assert shell._resize.calls == 63 and shell._resize.runs == 3
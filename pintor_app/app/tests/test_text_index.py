@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from app.domain.text_index import TextIndex, fold
+
+
+NAMES = [
+    "Pintura acrílica parede",
+    "Textura grafiato",
+    "Massa corrida",
+    "Pintura de portão",
+    "Impermeabilização de laje",
+    "Acrílico fosco teto",
+]
+
+
+def _index():
+    return TextIndex(enumerate(NAMES))
+
+
+def test_fold_removes_portuguese_accents():
+    assert fold("Impermeabilização Açaí PORTÃO") == "impermeabilizacao acai portao"
+
+
+def test_search_folds_accents_and_ranks_prefix_first():
+    idx = _index()
+
+    assert [NAMES[i] for i in idx.search("acril")] == ["Acrílico fosco teto", "Pintura acrílica parede"]
+    assert [NAMES[i] for i in idx.search("PORTAO")] == ["Pintura de portão"]
+    # todas as palavras precisam casar, em qualquer ordem
+    assert [NAMES[i] for i in idx.search("parede pint")] == ["Pintura acrílica parede"]
+
+
+def test_search_matches_inside_words_and_respects_limit():
+    idx = _index()
+
+    assert [NAMES[i] for i in idx.search("fiato")] == ["Textura grafiato"]
+    assert [NAMES[i] for i in idx.search("zacao")] == ["Impermeabilização de laje"]
+    assert len(idx.search("a", limit=2)) == 2
+    assert idx.search("xyz") == [] and idx.search("  ") == []
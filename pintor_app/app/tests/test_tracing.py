@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from app.core.config import load_config
+from app.db.pool import SQLitePool
+from app.db.repos.quick_quotes_repo import QuickQuotesRepo
+from app.db.tracing import SQLTracer, fingerprint
+
+
+def test_fingerprint_normalizes_literals_and_lists():
+    assert fingerprint("SELECT *  FROM t\n WHERE id = 42 AND name = 'Ana'") == (
+        "SELECT * FROM t WHERE id = ? AND name = ?"
+    )
+    assert fingerprint("SELECT id FROM t WHERE id IN (?, ?, ?);") == fingerprint(
+        "SELECT id FROM t WHERE id IN (?,?)"
+    )
+    assert fingerprint("INSERT INTO t(a, b) VALUES (?, ?), (?, ?)") == "INSERT INTO t(a, b) VALUES (?, ?), ..."
+
+
+def test_tracer_records_rows_and_statements(db_path):
+    tracer = SQLTracer(capacity=100, slow_ms=None)
+    pool = SQLitePool(db_path, readers=1, tracer=tracer)
+    try:
+        repo = QuickQuotesRepo(pool)
+        qid = repo.create_draft("Ana")
+        repo.add_items_many(qid, [("Parede", "m2", 3000, 1000, 0, ""), ("Teto", "m2", 1000, 2000, 0, "")])
+        tracer.clear()
+
+        total, rows = repo.get_items_window(qid, 0, 10)
+        assert (total, len(rows)) == (2, 2)
+        events = tracer.events()
+        by_fp = {e.fingerprint: e for e in events}
+        select = next(e for fp, e in by_fp.items() if "LIMIT" in fp)
+        assert select.rows == 2
+        assert select.duration_ms >= 0
+        assert all(e.statements >= 1 for e in events if e.fingerprint.startswith("SELECT"))
+        top = tracer.top(3, by="count")
+        assert top and top[0].count >= 1
+    finally:
+        pool.close()
+
+
+def test_ring_buffer_and_slow_log(tmp_path, db_path):
+    log = tmp_path / "logs" / "slow.log"
+    tracer = SQLTracer(capacity=5, slow_ms=0.0, slow_log_path=log)
+    pool = SQLitePool(db_path, readers=1, tracer=tracer)
+    try:
+        with pool.reader() as conn:
+            for i in range(10):
+                conn.execute("SELECT ? AS n", (i,)).fetchone()
+        assert len(tracer.events()) == 5
+        assert tracer.slow_count >= 10
+        lines = log.read_text(encoding="utf-8").splitlines()
+        assert any(line.endswith("SELECT ? AS n") for line in lines)
+    finally:
+        pool.close()
+
+
+def test_slow_log_write_does_not_block_other_queries(tmp_path):
+    tracer = SQLTracer(slow_ms=10.0, slow_log_path=tmp_path / "slow.log")
+    tracer._log_lock.acquire()  # simula disco lento no append do slow log
+    try:
+        slow = threading.Thread(target=tracer.record, args=("SELECT lenta", 50.0, 1, 1, time.time()))
+        slow.start()
+        while tracer.slow_count == 0:
+            time.sleep(0.001)
+
+        # agregado já gravado e lock livre: outra thread registra e lê sem esperar o arquivo
+        fast = threading.Thread(target=tracer.record, args=("SELECT 1", 0.1, 1, 1, time.time()))
+        fast.start()
+        fast.join(1)
+        assert not fast.is_alive()
+        assert {s.fingerprint for s in tracer.top()} == {"SELECT lenta", "SELECT ?"}
+        assert slow.is_alive()
+    finally:
+        tracer._log_lock.release()
+    slow.join(1)
+    assert "SELECT lenta" in (tmp_path / "slow.log").read_text(encoding="utf-8")
+
+
+def test_disabled_tracer_records_nothing(db_path):
+    tracer = SQLTracer(capacity=10)
+    tracer.enabled = False
+    pool = SQLitePool(db_path, readers=1, tracer=tracer)
+    try:
+        with pool.reader() as conn:
+            assert conn.execute("SELECT 1").fetchone()[0] == 1
+        assert tracer.events() == []
+    finally:
+        pool.close()
+
+
+def test_sql_trace_is_opt_in(monkeypatch):
+    monkeypatch.delenv("PINTOR_SQL_TRACE", raising=False)
+    assert load_config().sql_trace is False
+
+    monkeypatch.setenv("PINTOR_SQL_TRACE", "1")
+    assert load_config().sql_trace is True
@@ -0,0 +1,328 @@
+from __future__ import annotations
+
+import asyncio
+from decimal import Decimal
+
+import pytest
+
+from app.core.async_use_case import AsyncUseCase
+from app.core.cache import VersionedCache
+from app.core.errors import ConsistencyError, NotFoundError, ValidationError
+from app.core.metrics import MetricsRegistry
+from app.core.single_flight import SingleFlight
+from app.core.use_cases.add_item_to_quote import AddItemToQuote, AddItemToQuoteInput
+from app.core.use_cases.add_items_to_quote import AddItemsToQuote, AddItemsToQuoteInput, QuoteItemLine
+from app.core.use_cases.create_quick_quote_draft import CreateQuickQuoteDraft, CreateQuickQuoteDraftInput
+from app.core.use_cases.get_quote_details import GetQuoteDetails
+from app.core.use_cases.get_quote_notes import GetQuoteNotes
+from app.core.use_cases.get_quote_summary import GetQuoteSummary
+from app.core.use_cases.list_quote_items import ListQuoteItems, ListQuoteItemsRequest
+from app.core.use_cases.recalculate_all_totals import RecalculateAllTotals
+from app.core.use_cases.recalculate_quote_totals import RecalculateQuoteTotals
+from app.core.use_cases.remove_item_from_quote import RemoveItemFromQuote
+from app.core.use_cases.search_quotes import SearchQuotes, SearchQuotesRequest
+from app.db.executor import DBExecutor
+from app.db.repos.quick_quotes_repo import QuickQuotesRepo
+from app.db.unit_of_work import SQLiteUnitOfWork
+
+
+@pytest.fixture()
+def quotes_repo(pool):
+    return QuickQuotesRepo(pool)
+
+
+@pytest.fixture()
+def uow(pool):
+    return SQLiteUnitOfWork(pool)
+
+
+def _item(quote_id: str, **kw) -> AddItemToQuoteInput:
+    data = dict(
+        quote_id=quote_id,
+        service_name="Pintura parede",
+        unit="M2",
+        quantity=Decimal("12.5"),
+        unit_price_cents=2500,
+    )
+    data.update(kw)
+    return AddItemToQuoteInput(**data)
+
+
+def test_add_item_updates_totals(quotes_repo, uow):
+    qid = CreateQuickQuoteDraft(quotes_repo, uow).execute(CreateQuickQuoteDraftInput("Maria"))
+    AddItemToQuote(quotes_repo, uow).execute(_item(qid))
+
+    quote = quotes_repo.get_by_id(qid)
+    assert quote.subtotal_sale_cents == 31250
+    assert quote.total_sale_cents == 31250
+
+
+def test_add_item_unknown_quote_raises_not_found(quotes_repo, uow):
+    with pytest.raises(NotFoundError):
+        AddItemToQuote(quotes_repo, uow).execute(_item("nao-existe"))
+
+
+def test_add_item_is_atomic_when_insert_fails(pool, uow):
+    class FailingInsertRepo(QuickQuotesRepo):
+        def add_item(self, *args, **kwargs):
+            raise RuntimeError("falha simulada")
+
+    repo = FailingInsertRepo(pool)
+    qid = repo.create_draft("Atômico")
+
+    with pytest.raises(RuntimeError):
+        AddItemToQuote(repo, uow).execute(_item(qid))
+
+    # o delta dos totals foi desfeito junto
+    assert repo.get_by_id(qid).total_sale_cents == 0
+
+
+def test_incremental_totals_match_full_recalculation(quotes_repo, uow):
+    qid = quotes_repo.create_draft("Delta")
+    add = AddItemToQuote(quotes_repo, uow)
+    add.execute(_item(qid, quantity=Decimal("3.333"), unit_price_cents=999, adjustment_cents=-150))
+    add.execute(_item(qid, unit="DAY", quantity=Decimal("2"), unit_price_cents=35000, adjustment_cents=500))
+    add.execute(_item(qid, quantity=Decimal("0.5"), unit_price_cents=1))
+
+    incremental = quotes_repo.get_by_id(qid)
+    full = RecalculateQuoteTotals(quotes_repo, uow).execute(qid)
+
+    assert incremental.subtotal_sale_cents == full.subtotal_sale.cents == 3330 + 70000 + 1
+    assert incremental.adjustments_cents == full.adjustments.cents == 350
+    assert incremental.total_sale_cents == full.total_sale.cents
+
+
+def test_remove_item_subtracts_line_from_totals(quotes_repo, uow):
+    qid = quotes_repo.create_draft("Remover")
+    add = AddItemToQuote(quotes_repo, uow, verify_totals=True)
+    keep = add.execute(_item(qid, adjustment_cents=100))
+    drop = add.execute(_item(qid, quantity=Decimal("1"), unit_price_cents=5000, adjustment_cents=-200))
+
+    RemoveItemFromQuote(quotes_repo, uow).execute(drop)
+
+    quote = quotes_repo.get_by_id(qid)
+    assert [i.id for i in quotes_repo.list_items(qid)] == [keep]
+    assert (quote.subtotal_sale_cents, quote.adjustments_cents, quote.total_sale_cents) == (31250, 100, 31350)
+
+    with pytest.raises(NotFoundError):
+        RemoveItemFromQuote(quotes_repo, uow).execute(drop)
+
+
+def test_verify_totals_rejects_a_delta_that_disagrees_with_full_recalculation(quotes_repo, uow):
+    qid = quotes_repo.create_draft("Verificação")
+    add = AddItemToQuote(quotes_repo, uow, verify_totals=True)
+    add.execute(_item(qid, adjustment_cents=100))
+    # totals corrompidos fora do fluxo normal: o próximo delta parte deles
+    quotes_repo.set_totals(qid, 1, 2, 3)
+
+    with pytest.raises(ConsistencyError):
+        add.execute(_item(qid))
+
+    # transação desfeita: nem item novo nem delta
+    assert len(quotes_repo.list_items(qid)) == 1
+    assert quotes_repo.get_by_id(qid).total_sale_cents == 3
+
+
+def test_add_items_many_inserts_batch_and_updates_totals_once(quotes_repo, uow):
+    qid = quotes_repo.create_draft("Lote")
+    lines = [QuoteItemLine(f"Serviço {i}", "M2", Decimal("1.5"), 1000, adjustment_cents=10) for i in range(50)]
+
+    out = AddItemsToQuote(quotes_repo, uow).execute(AddItemsToQuoteInput(qid, lines))
+
+    assert out.added_count == 50
+    assert [i.id for i in quotes_repo.list_items(qid)] == out.item_ids
+    quote = quotes_repo.get_by_id(qid)
+    assert (quote.subtotal_sale_cents, quote.adjustments_cents) == (75000, 500)
+    assert quote.total_sale_cents == RecalculateQuoteTotals(quotes_repo, uow).execute(qid).total_sale.cents
+
+
+def test_single_add_normalizes_unit_like_the_paste_path(quotes_repo, uow):
+    typed = quotes_repo.create_draft("Digitado")
+    pasted = quotes_repo.create_draft("Colado")
+    AddItemToQuote(quotes_repo, uow).execute(_item(typed, unit=" m2 ", quantity=Decimal("2.4")))
+    line = QuoteItemLine("Pintura parede", "m2", Decimal("2.4"), 2500)
+    AddItemsToQuote(quotes_repo, uow).execute(AddItemsToQuoteInput(pasted, [line]))
+
+    assert [i.unit for i in quotes_repo.list_items(typed)] == ["M2"]
+    assert quotes_repo.get_by_id(typed).total_sale_cents == quotes_repo.get_by_id(pasted).total_sale_cents
+
+    for bad in (dict(unit="litro"), dict(quantity=float("nan")), dict(quantity="abc")):
+        with pytest.raises(ValidationError):
+            AddItemToQuote(quotes_repo, uow).execute(_item(typed, **bad))
+    assert len(quotes_repo.list_items(typed)) == 1
+
+
+def test_add_items_many_validates_every_line_before_writing(quotes_repo, uow):
+    qid = quotes_repo.create_draft("Lote inválido")
+    lines = [
+        QuoteItemLine("Ok", "M2", Decimal("1"), 1000),
+        QuoteItemLine("", "M2", Decimal("1"), 1000),
+        QuoteItemLine("Sem quantidade", "M2", Decimal("0"), 1000),
+        QuoteItemLine("Colado", "M2", Decimal("NaN"), 1000),
+        QuoteItemLine("Enorme", "M2", Decimal("1e30"), 1000),
+        QuoteItemLine("Unidade", "litro", Decimal("1"), 1000),
+        QuoteItemLine("Minúscula", "m2", Decimal("1"), 1000),
+        QuoteItemLine("Float", "M2", float("nan"), 1000),
+    ]
+
+    with pytest.raises(ValidationError) as exc:
+        AddItemsToQuote(quotes_repo, uow).execute(AddItemsToQuoteInput(qid, lines))
+
+    message = str(exc.value)
+    assert [f"Linha {n}" in message for n in range(1, 9)] == [False, True, True, True, True, True, False, True]
+    assert quotes_repo.list_items(qid) == []
+
+
+def test_search_quotes_paginates_by_offset(quotes_repo):
+    for i in range(5):
+        quotes_repo.create_draft(f"Condomínio {i}")
+    search = SearchQuotes(quotes_repo)
+
+    first = search.execute(SearchQuotesRequest("condominio", limit=3))
+    second = search.execute(SearchQuotesRequest("condominio", limit=3, offset=first.next_offset))
+
+    assert first.next_offset == 3
+    assert second.next_offset is None
+    assert len({q.id for q in [*first.quotes, *second.quotes]}) == 5
+
+    with pytest.raises(ValidationError):
+        search.execute(SearchQuotesRequest("   "))
+
+
+def test_quote_view_cache_revalidates_by_updated_at(pool, quotes_repo, uow):
+    qid = CreateQuickQuoteDraft(quotes_repo, uow).execute(CreateQuickQuoteDraftInput("Maria"))
+    AddItemToQuote(quotes_repo, uow).execute(_item(qid))
+    cache = VersionedCache(maxsize=8)
+    quotes_repo.add_change_listener(cache.pop)
+    summary = GetQuoteSummary(quotes_repo, cache)
+    items = ListQuoteItems(quotes_repo, cache)
+    window = ListQuoteItemsRequest(qid, offset=0, limit=10)
+
+    first = summary.execute(qid)
+    page = items.execute(window)
+    checkouts = pool.stats().reader.checkouts
+    assert summary.execute(qid) is first
+    assert items.execute(window) is page
+    assert isinstance(page.items, tuple)  # compartilhado: não dá para mutar
+    # só os SELECT updated_at
+    assert pool.stats().reader.checkouts == checkouts + 2
+
+    # mutação pelo mesmo repo: listener remove a entrada
+    AddItemToQuote(quotes_repo, uow).execute(_item(qid, unit_price_cents=100))
+    assert len(cache) == 0
+    assert summary.execute(qid).item_count == 2
+    assert items.execute(window).total == 2
+
+    # mutação por outra sessão (sem listener): a versão denuncia a entrada velha
+    notes = GetQuoteNotes(quotes_repo, cache)
+    assert notes.execute(qid).notes_client == ""
+    assert notes.execute(qid) is notes.execute(qid)
+    stale = summary.execute(qid)
+    QuickQuotesRepo(pool).update_notes(qid, "nova nota")
+    assert summary.execute(qid).updated_at != stale.updated_at
+    assert notes.execute(qid).notes_client == "nova nota"
+
+    with pytest.raises(NotFoundError):
+        summary.execute("nao-existe")
+
+
+def test_recalculate_all_totals_matches_per_quote_recalculation(pool, quotes_repo, uow):
+    add = AddItemToQuote(quotes_repo, uow)
+    ids = []
+    for n in range(7):
+        qid = quotes_repo.create_draft(f"Cliente {n}")
+        for k in range(n):
+            add.execute(_item(qid, quantity=Decimal(f"{k}.{n}05"), unit_price_cents=999 + k, adjustment_cents=-k))
+        ids.append(qid)
+    # unidade inteira gravada fora da escala (legado): 2,5 dias contam como 3
+    quotes_repo.add_item(ids[1], "Diária", "DAY", 2500, 10_000)
+    # simula totals gravados com a regra antiga
+    for qid in ids[:4]:
+        quotes_repo.set_totals(qid, 1, 2, 3)
+
+    out = RecalculateAllTotals(quotes_repo, uow, chunk_size=3, use_numpy=False).execute()
+
+    assert (out.quotes_scanned, out.items_scanned, out.quotes_updated) == (7, 22, 4)
+    batch = {qid: quotes_repo.get_by_id(qid) for qid in ids}
+    for qid in ids:
+        expected = RecalculateQuoteTotals(quotes_repo, uow).execute(qid)
+        assert batch[qid].subtotal_sale_cents == expected.subtotal_sale.cents
+        assert batch[qid].total_sale_cents == expected.total_sale.cents
+
+    # segunda passada: nada mudou, nada é regravado
+    assert RecalculateAllTotals(quotes_repo, uow, use_numpy=False).execute().quotes_updated == 0
+
+
+def test_async_use_case_coalesces_reads_and_invalidates_after_writes(pool, quotes_repo, uow):
+    qid = CreateQuickQuoteDraft(quotes_repo, uow).execute(CreateQuickQuoteDraftInput("Maria"))
+    executor = DBExecutor(pool, workers=2)
+    flights = SingleFlight()
+    details = AsyncUseCase(GetQuoteDetails(quotes_repo), executor, flights=flights, read_only=True)
+    add = AsyncUseCase(AddItemToQuote(quotes_repo, uow), executor, flights=flights)
+
+    async def scenario():
+        same = await asyncio.gather(*(details.execute(qid) for _ in range(5)))
+        await add.execute(_item(qid))
+        after = await details.execute(qid)
+        return same, after
+
+    try:
+        same, after = asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+
+    assert all(dto is same[0] for dto in same)
+    assert flights.stats().executions == 2
+    assert flights.stats().shared == 4
+    # leitura depois da escrita não reaproveita execução antiga
+    assert len(after.items) == 1 and not same[0].items
+
+
+def test_list_quote_items_returns_window_and_total(quotes_repo, uow):
+    qid = CreateQuickQuoteDraft(quotes_repo, uow).execute(CreateQuickQuoteDraftInput("Obra"))
+    for n in range(4):
+        AddItemToQuote(quotes_repo, uow).execute(_item(qid, service_name=f"Parede {n}"))
+    use_case = ListQuoteItems(quotes_repo)
+
+    resp = use_case.execute(ListQuoteItemsRequest(qid, offset=1, limit=2))
+    full = GetQuoteDetails(quotes_repo).execute(qid)
+
+    assert resp.total == 4
+    assert list(resp.items) == full.items[1:3]
+    with pytest.raises(ValidationError):
+        use_case.execute(ListQuoteItemsRequest(qid, limit=0))
+    with pytest.raises(NotFoundError):
+        use_case.execute(ListQuoteItemsRequest("nao-existe"))
+
+
+def test_quote_summary_has_totals_and_count_without_items(quotes_repo, uow):
+    qid = CreateQuickQuoteDraft(quotes_repo, uow).execute(CreateQuickQuoteDraftInput("Obra"))
+    AddItemToQuote(quotes_repo, uow).execute(_item(qid))
+    AddItemToQuote(quotes_repo, uow).execute(_item(qid, adjustment_cents=-250))
+    summary = GetQuoteSummary(quotes_repo)
+
+    first = summary.execute(qid)
+    assert first.item_count == 2
+    assert first.total_sale_cents == GetQuoteDetails(quotes_repo).execute(qid).total_sale_cents
+    assert not hasattr(first, "items")
+    assert not hasattr(first, "notes_client")  # observações: GetQuoteNotes
+    assert summary.execute(qid) == first  # sem escrita: mesma versão
+
+    with pytest.raises(NotFoundError):
+        summary.execute("nao-existe")
+
+
+def test_async_use_case_records_latency_and_errors(pool, quotes_repo):
+    metrics = MetricsRegistry()
+    executor = DBExecutor(pool, workers=1)
+    details = AsyncUseCase(GetQuoteDetails(quotes_repo), executor, metrics=metrics)
+    try:
+        with pytest.raises(NotFoundError):
+            asyncio.run(details.execute("nao-existe"))
+    finally:
+        executor.shutdown()
+
+    counts = {s.name: s.count for s in metrics.snapshot()}
+    assert counts["use_case.GetQuoteDetails"] == 1
+    assert counts["use_case.GetQuoteDetails.await"] == 1
+    assert metrics.counters()["use_case.GetQuoteDetails.errors"] == 1
@@ -0,0 +1,387 @@
+"""
+Load replay sem Flet: N pintores simultâneos usando os use cases reais do
+AppContainer (mesmo pool, DBExecutor e WriteQueue do modo web).
+
+    python -m app.tools.load_replay --painters 20 --duration 30
+    python -m app.tools.load_replay --sweep 1,4,16,64 --duration 15 --think-ms 200
+    python -m app.tools.load_replay --mix add_item=8,open_quote=4,history=2 --json out.json
+
+Cada pintor é uma tarefa no event loop (como uma sessão Flet): escolhe uma
+operação pelo peso do mix, aguarda o use case e "pensa" (exponencial, média
+--think-ms) antes da próxima. Por estágio: vazão, p50/p95/p99 por operação,
+espera na fila de escrita / checkout de leitura e erros "database is locked".
+--sweep roda um estágio por concorrência: onde a vazão para de subir e o p95
+dispara é o ponto de saturação.
+
+Banco padrão: data/load_replay.db (--fresh recria). Para histórico grande,
+aponte --db para um banco de `python -m app.tests.benchmarks`.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sqlite3
+import sys
+import time
+from dataclasses import asdict, dataclass, field, replace
+from decimal import Decimal
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+from app.core.config import load_config
+from app.core.metrics import HistogramSnapshot, MetricsRegistry
+from app.core.state import AppContainer
+from app.core.use_cases.add_item_to_quote import AddItemToQuoteInput
+from app.core.use_cases.add_items_to_quote import AddItemsToQuoteInput, QuoteItemLine
+from app.core.use_cases.create_quick_quote_draft import CreateQuickQuoteDraftInput
+from app.core.use_cases.list_quote_history import ListQuoteHistoryRequest
+from app.core.use_cases.list_quote_items import ListQuoteItemsRequest
+from app.core.use_cases.search_quotes import SearchQuotesRequest
+from app.core.use_cases.search_services import SearchServicesRequest
+from app.db.database import connect_sqlite
+from app.db.migrations import get_migrations, run_migrations
+from app.db.pool import PoolStats
+
+DEFAULT_MIX: dict[str, float] = {
+    "create": 1,  # novo rascunho
+    "add_item": 6,  # item pelo formulário
+    "paste": 1,  # colar 5-30 linhas
+    "open_quote": 4,  # resumo + observações + primeira janela de itens (tela de detalhes)
+    "history": 3,  # primeira página do histórico (às vezes a segunda)
+    "search": 1,  # busca textual de orçamentos
+    "services": 2,  # type-ahead do catálogo
+}
+
+_SERVICES = ("Pintura acrílica", "Massa corrida", "Lixamento", "Textura", "Verniz", "Selador")
+_UNITS = ("M2", "M2", "M2", "DAY", "ROOM", "UNIT")
+_CUSTOMERS = ("Ana", "João", "Maria", "José", "Luíza", "Pedro", "Carla", "Marcos")
+_PREFIXES = ("pin", "mas", "lix", "tex", "ver", "sel")
+
+
+@dataclass(frozen=True, slots=True)
+class Workload:
+    painters: int = 10
+    duration_s: float = 30.0
+    think_ms: float = 500.0  # média; 0 = sem pausa (saturação pura)
+    ramp_s: float = 0.0  # pintores entram espalhados nesse intervalo
+    mix: dict[str, float] = field(default_factory=lambda: dict(DEFAULT_MIX))
+    seed: int = 42
+
+
+@dataclass(frozen=True, slots=True)
+class OpStats:
+    count: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+
+@dataclass(frozen=True, slots=True)
+class StageReport:
+    painters: int
+    elapsed_s: float
+    ops: int
+    errors: int
+    lock_errors: int  # sqlite3.OperationalError "database is locked"
+    throughput: float  # operações/s
+    by_op: dict[str, OpStats]
+    write_commands: int
+    write_batches: int
+    write_wait_avg_ms: float  # espera na fila da WriteQueue até a execução
+    read_checkouts: int
+    read_wait_total_ms: float
+    queue_p95_ms: dict[str, float]  # use case: p95 do await (fila + execução) x execução
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class _Painter:
+    def __init__(self, n: int, seed: int) -> None:
+        self.name = f"Pintor {n}"
+        self.rng = random.Random(seed * 1_000 + n)
+        self.quotes: list[str] = []
+
+
+class LoadReplay:
+    def __init__(self, container: AppContainer, workload: Workload) -> None:
+        unknown = set(workload.mix) - set(DEFAULT_MIX)
+        if unknown:
+            raise ValueError(f"Unknown operation(s) in mix: {', '.join(sorted(unknown))}")
+        if workload.painters < 1:
+            raise ValueError("Workload needs at least 1 painter")
+        self.container = container
+        self.workload = workload
+        self._ops: dict[str, Callable[[_Painter], Awaitable[None]]] = {
+            "create": self._create,
+            "add_item": self._add_item,
+            "paste": self._paste,
+            "open_quote": self._open_quote,
+            "history": self._history,
+            "search": self._search,
+            "services": self._services,
+        }
+        self._names = [name for name, w in workload.mix.items() if w > 0]
+        self._weights = [workload.mix[name] for name in self._names]
+
+    async def run(self) -> StageReport:
+        w = self.workload
+        metrics = MetricsRegistry()
+        use_cases = self.container.metrics
+        use_cases.reset()
+        before = self.container.pool.stats()
+        painters = [_Painter(n, w.seed) for n in range(w.painters)]
+        # todo pintor começa com um rascunho próprio (fora da medição)
+        for p in painters:
+            await self._create(p)
+
+        deadline = time.perf_counter() + w.duration_s
+        started = time.perf_counter()
+        await asyncio.gather(*(self._loop(p, n, metrics, deadline) for n, p in enumerate(painters)))
+        elapsed = time.perf_counter() - started
+        return self._report(metrics, elapsed, before, self.container.pool.stats())
+
+    async def _loop(self, p: _Painter, n: int, metrics: MetricsRegistry, deadline: float) -> None:
+        w = self.workload
+        if w.ramp_s > 0:
+            await asyncio.sleep(w.ramp_s * n / w.painters)
+        while time.perf_counter() < deadline:
+            name = p.rng.choices(self._names, self._weights)[0]
+            t0 = time.perf_counter()
+            try:
+                await self._ops[name](p)
+            except sqlite3.OperationalError as e:
+                metrics.counter(f"{name}.errors").inc()
+                if "locked" in str(e):
+                    metrics.counter("lock_errors").inc()
+            except Exception:
+                metrics.counter(f"{name}.errors").inc()
+            else:
+                metrics.record_duration(f"op.{name}", t0)
+            if w.think_ms > 0:
+                await asyncio.sleep(p.rng.expovariate(1000.0 / w.think_ms))
+
+    # ---------- operações (o que a UI faz em cada tela) ----------
+
+    def _quote(self, p: _Painter) -> str:
+        # maioria mexe no orçamento mais recente
+        return p.quotes[-1] if p.rng.random() < 0.8 else p.rng.choice(p.quotes)
+
+    def _line(self, p: _Painter) -> QuoteItemLine:
+        rng = p.rng
+        unit = rng.choice(_UNITS)
+        qty = Decimal(rng.randrange(1, 400)) / (Decimal(10) if unit == "M2" else Decimal(1))
+        return QuoteItemLine(rng.choice(_SERVICES), unit, qty, rng.randrange(500, 20_000))
+
+    async def _create(self, p: _Painter) -> None:
+        qid = await self.container.create_quick_quote_draft.execute(
+            CreateQuickQuoteDraftInput(f"{p.rng.choice(_CUSTOMERS)} ({p.name})")
+        )
+        p.quotes.append(qid)
+
+    async def _add_item(self, p: _Painter) -> None:
+        line = self._line(p)
+        await self.container.add_item_to_quote.execute(
+            AddItemToQuoteInput(self._quote(p), line.service_name, line.unit, line.quantity, line.unit_price_cents)
+        )
+
+    async def _paste(self, p: _Painter) -> None:
+        lines = [self._line(p) for _ in range(p.rng.randrange(5, 31))]
+        await self.container.add_items_to_quote.execute(AddItemsToQuoteInput(self._quote(p), lines))
+
+    async def _open_quote(self, p: _Painter) -> None:
+        qid = self._quote(p)
+        await self.container.get_quote_summary.execute(qid)
+        await self.container.get_quote_notes.execute(qid)
+        await self.container.list_quote_items.execute(ListQuoteItemsRequest(quote_id=qid, offset=0, limit=50))
+
+    async def _history(self, p: _Painter) -> None:
+        page = await self.container.list_quote_history.execute(ListQuoteHistoryRequest(limit=50))
+        if page.next_cursor and p.rng.random() < 0.3:
+            await self.container.list_quote_history.execute(ListQuoteHistoryRequest(limit=50, cursor=page.next_cursor))
+
+    async def _search(self, p: _Painter) -> None:
+        await self.container.search_quotes.execute(SearchQuotesRequest(p.rng.choice(_CUSTOMERS)))
+
+    async def _services(self, p: _Painter) -> None:
+        await self.container.search_services.execute(SearchServicesRequest(p.rng.choice(_PREFIXES)))
+
+    # ---------- relatório ----------
+
+    def _report(self, metrics: MetricsRegistry, elapsed: float, before: PoolStats, after: PoolStats) -> StageReport:
+        counters = metrics.counters()
+        by_op: dict[str, OpStats] = {}
+        for s in metrics.snapshot():
+            name = s.name.removeprefix("op.")
+            by_op[name] = _op_stats(s, counters.get(f"{name}.errors", 0))
+        for name in self._names:
+            errors = counters.get(f"{name}.errors", 0)
+            if name not in by_op and errors:
+                by_op[name] = OpStats(0, errors, 0.0, 0.0, 0.0, 0.0)
+
+        ops = sum(s.count for s in by_op.values())
+        errors = sum(s.errors for s in by_op.values())
+        writes = after.writer.completed - before.writer.completed
+        write_wait = after.writer.wait_total_ms - before.writer.wait_total_ms
+
+        queue_p95: dict[str, float] = {}
+        uc = {s.name: s for s in self.container.metrics.snapshot()}
+        for name, s in uc.items():
+            if name.endswith(".await") and s.count:
+                exec_s = uc.get(name.removesuffix(".await"))
+                queue_us = max(s.p95 - (exec_s.p95 if exec_s else 0), 0)
+                queue_p95[name.removeprefix("use_case.").removesuffix(".await")] = round(queue_us / 1000.0, 3)
+
+        return StageReport(
+            painters=self.workload.painters,
+            elapsed_s=round(elapsed, 3),
+            ops=ops,
+            errors=errors,
+            lock_errors=counters.get("lock_errors", 0),
+            throughput=round(ops / elapsed, 1) if elapsed > 0 else 0.0,
+            by_op=by_op,
+            write_commands=writes,
+            write_batches=after.writer.batches - before.writer.batches,
+            write_wait_avg_ms=round(write_wait / writes, 3) if writes else 0.0,
+            read_checkouts=after.reader.checkouts - before.reader.checkouts,
+            read_wait_total_ms=round(after.reader.wait_total_ms - before.reader.wait_total_ms, 3),
+            queue_p95_ms=queue_p95,
+        )
+
+
+def _op_stats(s: HistogramSnapshot, errors: int) -> OpStats:
+    return OpStats(
+        count=s.count,
+        errors=errors,
+        p50_ms=s.p50 / 1000.0,
+        p95_ms=s.p95 / 1000.0,
+        p99_ms=s.p99 / 1000.0,
+        max_ms=s.max / 1000.0,
+    )
+
+
+def parse_mix(text: str) -> dict[str, float]:
+    """"add_item=8,history=2" -> pesos; operações ausentes ficam fora do mix."""
+    mix: dict[str, float] = {}
+    for part in filter(None, (p.strip() for p in text.split(","))):
+        name, sep, weight = part.partition("=")
+        if not sep:
+            raise ValueError(f"Invalid mix entry (expected name=weight): {part!r}")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+def print_report(r: StageReport) -> None:
+    print(
+        f"\n== {r.painters} pintores, {r.elapsed_s:.1f}s: {r.ops} ops ({r.throughput} ops/s), "
+        f"{r.errors} erros, {r.lock_errors} locked"
+    )
+    print(f"{'operação':<12} {'n':>7} {'erros':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'máx':>9}  (ms)")
+    for name, s in sorted(r.by_op.items()):
+        print(
+            f"{name:<12} {s.count:>7} {s.errors:>6} {s.p50_ms:>9.2f} {s.p95_ms:>9.2f} {s.p99_ms:>9.2f} {s.max_ms:>9.2f}"
+        )
+    avg_batch = r.write_commands / r.write_batches if r.write_batches else 0.0
+    print(
+        f"escrita: {r.write_commands} comandos em {r.write_batches} commits (média {avg_batch:.1f}/commit), "
+        f"espera média na fila {r.write_wait_avg_ms:.2f} ms"
+    )
+    # workers do DBExecutor leem por conexão fixa: checkout aqui é leitura fora deles
+    print(f"leitura: {r.read_checkouts} checkouts, espera total {r.read_wait_total_ms:.2f} ms")
+    if r.queue_p95_ms:
+        worst = sorted(r.queue_p95_ms.items(), key=lambda kv: kv[1], reverse=True)[:3]
+        print("fila do DBExecutor (p95 await - p95 execução): " + ", ".join(f"{k} {v:.2f} ms" for k, v in worst))
+
+
+def _prepare_db(path: Path, fresh: bool) -> None:
+    if fresh:
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{path}{suffix}").unlink(missing_ok=True)
+    conn = connect_sqlite(path)
+    try:
+        run_migrations(conn, get_migrations())
+    finally:
+        conn.close()
+
+
+async def run_stages(container: AppContainer, workloads: list[Workload]) -> list[StageReport]:
+    reports = []
+    for w in workloads:
+        report = await LoadReplay(container, w).run()
+        print_report(report)
+        reports.append(report)
+    return reports
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.tools.load_replay")
+    parser.add_argument("--painters", type=int, default=10)
+    parser.add_argument("--sweep", help="concorrências em sequência, ex.: 1,4,16,64 (ignora --painters)")
+    parser.add_argument("--duration", type=float, default=30.0, help="segundos por estágio")
+    parser.add_argument("--think-ms", type=float, default=500.0)
+    parser.add_argument("--ramp", type=float, default=0.0, help="segundos para todos os pintores entrarem")
+    parser.add_argument("--mix", help="pesos, ex.: add_item=6,history=3 (padrão: " + ",".join(
+        f"{k}={v:g}" for k, v in DEFAULT_MIX.items()) + ")")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", type=Path, help="banco alvo (padrão: data/load_replay.db)")
+    parser.add_argument("--fresh", action="store_true", help="apaga o banco antes")
+    parser.add_argument("--readers", type=int, help="conexões de leitura do pool")
+    parser.add_argument("--workers", type=int, help="threads do DBExecutor")
+    parser.add_argument("--trace", action="store_true", help="liga o SQLTracer e mostra as queries mais caras")
+    parser.add_argument("--json", type=Path, help="grava os relatórios (JSON)")
+    args = parser.parse_args(argv)
+
+    cfg = load_config()
+    db_path = args.db or cfg.data_dir / "load_replay.db"
+    cfg = replace(
+        cfg,
+        db_path=db_path,
+        db_readers=args.readers or cfg.db_readers,
+        db_workers=args.workers or cfg.db_workers,
+        sql_trace=cfg.sql_trace or args.trace,
+    )
+    _prepare_db(db_path, args.fresh)
+
+    base = Workload(
+        painters=args.painters,
+        duration_s=args.duration,
+        think_ms=args.think_ms,
+        ramp_s=args.ramp,
+        mix=parse_mix(args.mix) if args.mix else dict(DEFAULT_MIX),
+        seed=args.seed,
+    )
+    levels = [int(n) for n in args.sweep.split(",")] if args.sweep else [args.painters]
+    workloads = [replace(base, painters=n) for n in levels]
+
+    print(f"banco: {db_path} | readers {cfg.db_readers}, workers {cfg.db_workers}")
+    container = AppContainer.build(cfg)
+    try:
+        reports = asyncio.run(run_stages(container, workloads))
+        tracer = container.pool.tracer
+        if tracer is not None:
+            print("\nSQL por tempo total:")
+            for stat in tracer.top(10):
+                print(f"{stat.total_ms:>10.1f} ms {stat.count:>8}x  {stat.fingerprint[:100]}")
+    finally:
+        container.close()
+
+    if len(reports) > 1:
+        print(f"\n{'pintores':>8} {'ops/s':>9} {'p95 máx (ms)':>13} {'locked':>7}")
+        for r in reports:
+            worst = max((s.p95_ms for s in r.by_op.values()), default=0.0)
+            print(f"{r.painters:>8} {r.throughput:>9.1f} {worst:>13.2f} {r.lock_errors:>7}")
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(
+            json.dumps([r.to_dict() for r in reports], indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
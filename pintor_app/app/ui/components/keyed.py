@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, Hashable, Iterable, Optional, TypeVar
+
+import flet as ft
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True, slots=True)
+class SyncStats:
+    added: int
+    updated: int
+    removed: int
+    kept: int
+
+
+def set_props(control: ft.Control, **props: Any) -> ft.Control:
+    """Atribui só o que mudou (o diff do Flet ignora valor igual, aqui fica explícito)."""
+    for name, value in props.items():
+        if getattr(control, name) != value:
+            setattr(control, name, value)
+    return control
+
+
+class KeyedList(Generic[T]):
+    """
+    Lista de controles reconciliada por chave (ex.: item_id):
+    - item novo: build(item)
+    - item igual ao anterior (==): reaproveita o controle, sem patch
+    - item mudou: patch(controle, item) no lugar (ou build de novo, sem patch)
+    - chave sumiu: sai da lista
+    O Flet manda só a diferença dos controles que continuam os mesmos objetos,
+    então o update cresce com o tamanho da mudança, não da lista.
+    """
+
+    def __init__(
+        self,
+        key: Callable[[T], Hashable],
+        build: Callable[[T], ft.Control],
+        patch: Optional[Callable[[ft.Control, T], None]] = None,
+        **column_kwargs: Any,
+    ) -> None:
+        self.key = key
+        self.build = build
+        self.patch = patch
+        self.control = ft.Column(**column_kwargs)
+        self._rows: dict[Hashable, tuple[T, ft.Control]] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def sync(self, items: Iterable[T]) -> SyncStats:
+        added = updated = kept = 0
+        rows: dict[Hashable, tuple[T, ft.Control]] = {}
+
+        for item in items:
+            k = self.key(item)
+            if k in rows:
+                raise ValueError(f"Duplicate key in keyed list: {k!r}")
+            prev = self._rows.get(k)
+            if prev is None:
+                ctrl = self.build(item)
+                added += 1
+            elif prev[0] == item:
+                ctrl = prev[1]
+                kept += 1
+            elif self.patch is not None:
+                ctrl = prev[1]
+                self.patch(ctrl, item)
+                updated += 1
+            else:
+                ctrl = self.build(item)
+                updated += 1
+            rows[k] = (item, ctrl)
+
+        removed = sum(1 for k in self._rows if k not in rows)
+        self._rows = rows
+
+        controls = [ctrl for _, ctrl in rows.values()]
+        current = self.control.controls
+        # mesma sequência de objetos: não toca na lista (nenhuma operação de lista no patch)
+        if len(controls) != len(current) or any(a is not b for a, b in zip(controls, current)):
+            self.control.controls = controls
+        return SyncStats(added=added, updated=updated, removed=removed, kept=kept)
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from typing import Any, Awaitable, Callable, Generic, Hashable, Optional, TypeVar
+
+import flet as ft
+
+from app.ui.components.keyed import KeyedList, set_props
+from app.ui.debounce import Debouncer
+
+T = TypeVar("T")
+
+
+class TypeAhead(Generic[T]):
+    """
+    Campo de busca com sugestões (substitui Dropdown com o catálogo inteiro):
+    - digitação passa por Debouncer; só o texto final vira busca
+    - search(texto) devolve o top-K (índice em memória); resposta de um texto
+      que já mudou é descartada
+    - sugestões reconciliadas por chave; escolher uma chama on_select(item)
+    """
+
+    DEBOUNCE_S = 0.15
+
+    def __init__(
+        self,
+        page: ft.Page,
+        search: Callable[[str], Awaitable[list[T]]],
+        key: Callable[[T], Hashable],
+        label: Callable[[T], str],
+        on_select: Callable[[T], None],
+        field_label: str = "Buscar",
+        width: Optional[float] = None,
+    ) -> None:
+        self.page = page
+        self.search = search
+        self.label = label
+        self.on_select = on_select
+        self._query = ""
+        self._debounce = Debouncer(page, self.DEBOUNCE_S)
+
+        self.field = ft.TextField(label=field_label, width=width, on_change=self._on_change)
+        self._results = KeyedList(
+            key=key,
+            build=self._build_option,
+            patch=lambda ctrl, item: set_props(ctrl, data=item, title=ft.Text(label(item))),
+            spacing=0,
+        )
+        self.control = ft.Column(spacing=0, width=width, controls=[self.field, self._results.control])
+
+    @property
+    def suggestions(self) -> int:
+        return len(self._results)
+
+    def set_text(self, text: str) -> None:
+        """Mostra um valor escolhido por fora, sem disparar busca."""
+        self._debounce.cancel()
+        self._query = text
+        self.field.value = text
+        self._results.sync([])
+
+    def clear(self) -> None:
+        self.set_text("")
+
+    def _on_change(self, e: Any) -> None:
+        self._query = e.control.value or ""
+        self._debounce.call(self._run_search, self._query)
+
+    async def _run_search(self, text: str) -> None:
+        items = await self.search(text) if text.strip() else []
+        if text != self._query:
+            return  # digitou mais durante a busca: a próxima resposta vale
+        self._results.sync(items)
+        self.page.update()
+
+    def _build_option(self, item: T) -> ft.Control:
+        return ft.ListTile(
+            title=ft.Text(self.label(item)),
+            dense=True,
+            data=item,
+            on_click=lambda e: self._pick(e.control.data),
+        )
+
+    def _pick(self, item: T) -> None:
+        self.set_text(self.label(item))
+        self.on_select(item)
+        self.page.update()
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import math
+from typing import Any, Awaitable, Callable, Generic, Hashable, Optional, TypeVar
+
+import flet as ft
+
+from app.core.cache import LRUCache
+from app.ui.components.keyed import KeyedList
+from app.ui.debounce import Debouncer
+
+T = TypeVar("T")
+
+# fetch(offset, limit) -> (linhas, total de linhas da lista)
+FetchFn = Callable[[int, int], Awaitable[tuple[list[T], int]]]
+
+
+class WindowedSource(Generic[T]):
+    """
+    Fonte paginada para lista virtual: busca páginas de page_size sob demanda
+    e guarda só as últimas max_pages (LRU). total vem junto da primeira página.
+    """
+
+    def __init__(self, fetch: FetchFn, page_size: int = 50, max_pages: int = 8) -> None:
+        self.fetch = fetch
+        self.page_size = page_size
+        self.total: Optional[int] = None
+        self._pages: LRUCache[int, list[T]] = LRUCache(max_pages)
+        self.fetches = 0
+
+    def invalidate(self) -> None:
+        self.total = None
+        self._pages.clear()
+
+    async def window(self, start: int, end: int) -> list[T]:
+        """Linhas [start, end), limitadas ao total."""
+        if self.total is None:
+            await self._page(0)
+        end = min(end, self.total or 0)
+        if start >= end:
+            return []
+
+        rows: list[T] = []
+        first, last = start // self.page_size, (end - 1) // self.page_size
+        for n in range(first, last + 1):
+            page = await self._page(n)
+            base = n * self.page_size
+            rows.extend(page[max(start - base, 0) : end - base])
+        return rows
+
+    async def _page(self, n: int) -> list[T]:
+        page = self._pages.get(n)
+        if page is None:
+            self.fetches += 1
+            page, self.total = await self.fetch(n * self.page_size, self.page_size)
+            self._pages.put(n, page)
+        return page
+
+
+class VirtualList(Generic[T]):
+    """
+    ListView de altura fixa que só materializa as linhas visíveis (+ overscan):
+    espaçadores em cima e embaixo ocupam a altura do resto, então a barra de
+    rolagem representa a lista inteira. Rolar busca a janela nova na fonte
+    (latest-wins) e reconcilia por chave: linhas que continuam visíveis são
+    os mesmos controles.
+    """
+
+    SCROLL_DEBOUNCE_S = 0.05
+
+    def __init__(
+        self,
+        page: ft.Page,
+        source: WindowedSource[T],
+        key: Callable[[T], Hashable],
+        build: Callable[[T], ft.Control],
+        patch: Optional[Callable[[ft.Control, T], None]] = None,
+        row_height: float = 40,
+        height: float = 400,
+        overscan: int = 10,
+    ) -> None:
+        self.page = page
+        self.source = source
+        self.row_height = row_height
+        self.height = height
+        self.overscan = overscan
+        self.start = 0
+        self.end = 0
+
+        self._rows = KeyedList(
+            key=key,
+            build=lambda item: ft.Container(height=row_height, content=build(item)),
+            patch=(lambda ctrl, item: patch(ctrl.content, item)) if patch else None,
+            spacing=0,
+        )
+        self._top = ft.Container(height=0)
+        self._bottom = ft.Container(height=0)
+        self._first_visible = 0
+        self._scroll = Debouncer(page, self.SCROLL_DEBOUNCE_S)
+        self.control = ft.ListView(
+            height=height,
+            spacing=0,
+            scroll_interval=50,
+            on_scroll=self._on_scroll,
+            controls=[self._top, self._rows.control, self._bottom],
+        )
+
+    @property
+    def materialized(self) -> int:
+        return len(self._rows)
+
+    def reload(self) -> None:
+        """Dados mudaram (ex.: item adicionado): descarta as páginas e refaz a janela atual."""
+        self.source.invalidate()
+        self._scroll.call(self._show, self._first_visible, True)
+
+    def _on_scroll(self, e: Any) -> None:
+        first = max(int(e.pixels // self.row_height), 0)
+        self._first_visible = first
+        visible_end = min(first + math.ceil(self.height / self.row_height), self.source.total or 0)
+        if self.start <= first and visible_end <= self.end:
+            return  # tudo que aparece já está materializado
+        self._scroll.call(self._show, first)
+
+    async def _show(self, first: int, force: bool = False) -> None:
+        visible = math.ceil(self.height / self.row_height)
+        start = max(first - self.overscan, 0)
+        end = first + visible + self.overscan
+        if not force and (start, end) == (self.start, self.end):
+            return
+
+        rows = await self.source.window(start, end)
+        total = self.source.total or 0
+        self.start, self.end = start, start + len(rows)
+        self._rows.sync(rows)
+        self._top.height = self.start * self.row_height
+        self._bottom.height = max(total - self.end, 0) * self.row_height
+        self.page.update()
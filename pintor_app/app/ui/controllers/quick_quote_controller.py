@@ -12,10 +12,16 @@ class QuickQuoteController:
         self.router = router
 
     def create_quote(self, customer_name: str, materials_included: bool) -> None:
+        async def _job():
+            await self._create_quote_async(customer_name, materials_included)
+
+        self.page.run_task(_job)
+
+    async def _create_quote_async(self, customer_name: str, materials_included: bool) -> None:
         container = self.page.data["container"]
 
         try:
-            quote_id = container.create_quick_quote_draft.execute(
+            quote_id = await container.create_quick_quote_draft.execute(
                 CreateQuickQuoteDraftInput(
                     customer_name=customer_name,
                     materials_included=materials_included,
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import flet as ft
+
+from app.core.errors import ApplicationError
+from app.core.use_cases.list_quote_history import ListQuoteHistoryRequest
+from app.core.use_cases.search_quotes import SearchQuotesRequest
+from app.ui.load_scheduler import LoadScheduler
+from app.ui.viewmodels.quote_history_vm import QuoteHistoryRowVM, QuoteHistoryVM
+
+
+class QuickQuoteHistoryController:
+    PAGE_SIZE = 50
+    SEARCH_PAGE_SIZE = 20
+
+    def __init__(self, page: ft.Page, vm: QuoteHistoryVM):
+        self.page = page
+        self.vm = vm
+        self._render_fn = None
+        self._loads = LoadScheduler.for_page(page)
+
+    def bind_render(self, render_fn):
+        self._render_fn = render_fn
+
+    def _render(self):
+        if self._render_fn:
+            self._render_fn()
+
+    def on_route_enter(self) -> None:
+        self._loads.start(self._load_async)
+
+    def on_route_reenter(self) -> None:
+        # view reaproveitada: só troca a lista se a primeira página mudou
+        self._loads.start(self._refresh_async)
+
+    async def _refresh_async(self):
+        # carga anterior cancelada ao sair da rota (flags presos / lista vazia): recarrega
+        vm = self.vm
+        if vm.is_searching or vm.is_loading or vm.is_loading_more or not vm.rows:
+            await self._load_async()
+            return
+
+        container = self.page.data["container"]
+        try:
+            resp = await container.list_quote_history.execute(ListQuoteHistoryRequest(limit=self.PAGE_SIZE))
+        except ApplicationError:
+            return
+
+        head = [(q.id, q.updated_at) for q in resp.quotes]
+        if head == [(r.quote_id, r.updated_at) for r in self.vm.rows[: len(head)]]:
+            return
+
+        self.vm.rows = []
+        self.vm.error = None
+        self._append_rows(resp.quotes)
+        self.vm.next_cursor = resp.next_cursor
+        self._render()
+
+    def set_query(self, text: str) -> None:
+        self.vm.query = text or ""
+
+    def search(self) -> None:
+        # query vazia volta para o histórico normal
+        self._loads.start(self._load_async)
+
+    def clear_search(self) -> None:
+        self.vm.query = ""
+        self._loads.start(self._load_async)
+
+    def load_more(self) -> None:
+        if not self.vm.has_more or self.vm.is_loading_more:
+            return
+        self._loads.start(self._load_more_async)
+
+    async def _load_async(self):
+        self.vm.is_loading = True
+        self.vm.is_loading_more = False  # "carregar mais" pendente foi cancelado
+        self.vm.error = None
+        self.vm.rows = []
+        self.vm.next_cursor = None
+        self.vm.next_offset = None
+        self._render()
+
+        try:
+            if self.vm.is_searching:
+                await self._fetch_search(offset=0)
+            else:
+                await self._fetch_page(cursor=None)
+        finally:
+            # cancelada (saída da rota) também libera a tela
+            self.vm.is_loading = False
+        self._render()
+
+    async def _load_more_async(self):
+        self.vm.is_loading_more = True
+        self._render()
+
+        try:
+            if self.vm.is_searching:
+                await self._fetch_search(offset=self.vm.next_offset or 0)
+            else:
+                await self._fetch_page(cursor=self.vm.next_cursor)
+        finally:
+            self.vm.is_loading_more = False
+        self._render()
+
+    async def _fetch_page(self, cursor: str | None) -> None:
+        container = self.page.data["container"]
+        try:
+            resp = await container.list_quote_history.execute(
+                ListQuoteHistoryRequest(limit=self.PAGE_SIZE, cursor=cursor)
+            )
+        except ApplicationError as e:
+            self.vm.error = str(e)
+            return
+
+        self._append_rows(resp.quotes)
+        self.vm.next_cursor = resp.next_cursor
+
+    async def _fetch_search(self, offset: int) -> None:
+        container = self.page.data["container"]
+        try:
+            resp = await container.search_quotes.execute(
+                SearchQuotesRequest(text=self.vm.query, limit=self.SEARCH_PAGE_SIZE, offset=offset)
+            )
+        except ApplicationError as e:
+            self.vm.error = str(e)
+            return
+
+        self._append_rows(resp.quotes)
+        self.vm.next_offset = resp.next_offset
+
+    def _append_rows(self, quotes) -> None:
+        self.vm.rows.extend(
+            QuoteHistoryRowVM(
+                quote_id=q.id,
+                customer_name=q.customer_name,
+                status=q.status,
+                total_sale_brl=self._fmt_brl(q.total_sale_cents),
+                updated_at=q.updated_at,
+            )
+            for q in quotes
+        )
+
+    def _fmt_brl(self, cents: int) -> str:
+        neg = cents < 0
+        cents = abs(int(cents))
+        inteiro = cents // 100
+        frac = cents % 100
+
+        s = str(inteiro)
+        parts = []
+        while s:
+            parts.append(s[-3:])
+            s = s[:-3]
+        inteiro_fmt = ".".join(reversed(parts))
+        out = f"{inteiro_fmt},{frac:02d}"
+        return f"-{out}" if neg else out
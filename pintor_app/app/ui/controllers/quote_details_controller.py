@@ -3,6 +3,8 @@ from __future__ import annotations
 import flet as ft
 
 from app.core.errors import ApplicationError
+from app.core.use_cases.list_quote_items import ListQuoteItemsRequest
+from app.ui.load_scheduler import LoadScheduler
 from app.ui.viewmodels.quote_details_vm import QuoteDetailsVM, QuoteItemVM
 
 
@@ -14,14 +16,40 @@ class QuoteDetailsController:
 
         # será setado pela Page
         self._render_fn = None
+        self._loads = LoadScheduler.for_page(page)
+        self._dto = None  # último DTO renderizado (freshness check no reenter)
 
     def bind_render(self, render_fn):
         """A Page registra uma função para re-renderizar a região dela."""
         self._render_fn = render_fn
 
     def on_route_enter(self) -> None:
-        # agenda o carregamento para depois do build (evita update durante construção)
-        self.page.run_task(self._load_async)
+        # agenda o carregamento para depois do build (evita update durante construção);
+        # carga anterior ainda em andamento é cancelada
+        self._loads.start(self._load_async)
+
+    def on_route_reenter(self) -> None:
+        # view reaproveitada pelo Router: só confere se o orçamento mudou
+        self._loads.start(self._refresh_async)
+
+    async def _refresh_async(self):
+        container = self.page.data["container"]
+        try:
+            # summary: cabeçalho + item_count; igual ao anterior => nada mudou
+            dto = await container.get_quote_summary.execute(self.quote_id)
+        except ApplicationError:
+            await self._load_async()
+            return
+
+        if dto == self._dto:
+            return
+        try:
+            notes = await container.get_quote_notes.execute(self.quote_id)
+        except ApplicationError:
+            await self._load_async()
+            return
+        self._apply(dto, notes)
+        self._render()
 
     async def _load_async(self):
         self.vm.is_loading = True
@@ -31,41 +59,58 @@ class QuoteDetailsController:
         container = self.page.data["container"]
 
         try:
-            dto = container.get_quote_details.execute(self.quote_id)
+            # sem itens: a lista virtual busca só a janela visível
+            dto = await container.get_quote_summary.execute(self.quote_id)
+            # observações só aqui, ao abrir (fora do cabeçalho e do histórico)
+            notes = await container.get_quote_notes.execute(self.quote_id)
         except ApplicationError as e:
             self.vm.is_loading = False
             self.vm.error = str(e)
             self._render()
             return
 
+        self._apply(dto, notes)
+        self._render()
+
+    def _apply(self, dto, notes) -> None:
+        self._dto = dto
         self.vm.is_loading = False
+        self.vm.error = None
         self.vm.quote_id = dto.id
         self.vm.customer_name = dto.customer_name
         self.vm.status = dto.status
         self.vm.materials_included = dto.materials_included
         self.vm.total_sale_cents = dto.total_sale_cents
         self.vm.total_sale_brl = self._fmt_brl(dto.total_sale_cents)
+        self.vm.notes_client = notes.notes_client
 
-        self.vm.items = []
-        for i in dto.items:
-            item_vm = QuoteItemVM(
-                service_name=i.service_name,
-                unit=i.unit,
-                quantity=i.quantity,
-                unit_price_cents=i.unit_price_cents,
-                adjustment_cents=i.adjustment_cents,
-                line_total_cents=i.line_total_cents,
-            )
-
-            # campos formatados para UI
-            item_vm.unit_price_brl = self._fmt_brl(i.unit_price_cents)
-            item_vm.adjustment_brl = self._fmt_brl(i.adjustment_cents)
-            item_vm.line_total_brl = self._fmt_brl(i.line_total_cents)
+        self.vm.item_count = dto.item_count
+        self.vm.items_version += 1  # lista virtual rebusca a janela visível
 
-            self.vm.items.append(item_vm)
-
-
-        self._render()
+    async def fetch_items(self, offset: int, limit: int) -> tuple[list[QuoteItemVM], int]:
+        """Página de itens para a lista virtual (só o que está na tela)."""
+        container = self.page.data["container"]
+        resp = await container.list_quote_items.execute(
+            ListQuoteItemsRequest(quote_id=self.quote_id, offset=offset, limit=limit)
+        )
+        return [self._item_vm(i) for i in resp.items], resp.total
+
+    def _item_vm(self, i) -> QuoteItemVM:
+        item_vm = QuoteItemVM(
+            item_id=i.id,
+            service_name=i.service_name,
+            unit=i.unit,
+            quantity=i.quantity,
+            unit_price_cents=i.unit_price_cents,
+            adjustment_cents=i.adjustment_cents,
+            line_total_cents=i.line_total_cents,
+        )
+
+        # campos formatados para UI
+        item_vm.unit_price_brl = self._fmt_brl(i.unit_price_cents)
+        item_vm.adjustment_brl = self._fmt_brl(i.adjustment_cents)
+        item_vm.line_total_brl = self._fmt_brl(i.line_total_cents)
+        return item_vm
 
     def _render(self) -> None:
         if self._render_fn:
@@ -1,13 +1,26 @@
 from __future__ import annotations
 
+import sqlite3
+from concurrent.futures import CancelledError
+
 import flet as ft
 from decimal import Decimal, InvalidOperation
 
 from app.core.errors import ApplicationError
+from app.db.errors import DatabaseClosedError
+from app.ui.load_scheduler import LoadScheduler
 from app.core.use_cases.add_item_to_quote import AddItemToQuoteInput
+from app.core.use_cases.add_items_to_quote import AddItemsToQuoteInput, QuoteItemLine
 from app.ui.viewmodels.quote_edit_vm import QuoteEditVM, QuoteEditItemVM
-from app.core.use_cases.list_services import ListServicesRequest
+from app.core.use_cases.list_quote_items import ListQuoteItemsRequest
+from app.core.use_cases.search_services import SearchServicesRequest
+from app.db.repos.services_repo import ServiceRow
 
+# falhas de infraestrutura que chegam ao await (use cases rodam no DBExecutor):
+# erro do SQLite, WriteQueue cheia (TimeoutError), pool/fila/executor encerrados
+# ou Future cancelado pelo shutdown. Outros RuntimeError são bug: sobem.
+_INFRA_ERRORS = (sqlite3.Error, TimeoutError, DatabaseClosedError, CancelledError)
+_INFRA_MESSAGE = "Não foi possível salvar agora. Tente novamente."
 
 
 class QuoteEditController:
@@ -16,8 +29,10 @@ class QuoteEditController:
         self.vm = vm
         self.quote_id = quote_id
         self._render_fn = None
-        self.services = []
+        self.services: dict[str, ServiceRow] = {}  # id -> ServiceRow das sugestões já mostradas
         self.selected_service_id: str | None = None
+        self._loads = LoadScheduler.for_page(page)
+        self._dto = None  # último DTO renderizado (freshness check no reenter)
 
 
     def bind_render(self, render_fn):
@@ -28,7 +43,25 @@ class QuoteEditController:
             self._render_fn()
 
     def on_route_enter(self) -> None:
-        self.page.run_task(self._load_async)
+        self._loads.start(self._load_async)
+
+    def on_route_reenter(self) -> None:
+        # view reaproveitada: mantém o formulário; só recarrega se o orçamento mudou
+        self._loads.start(self._refresh_async)
+
+    async def _refresh_async(self):
+        container = self.page.data["container"]
+        try:
+            # summary: cabeçalho + item_count (sem ler itens)
+            dto = await container.get_quote_summary.execute(self.quote_id)
+        except Exception:
+            await self._load_async()
+            return
+
+        if dto == self._dto:
+            return
+        self._apply(dto)
+        self._render()
 
 
     async def _load_async(self):
@@ -41,12 +74,9 @@ class QuoteEditController:
         container = self.page.data["container"]
 
         try:
-            # 1) Quote details (no seu projeto isso é SYNC)
-            dto = container.get_quote_details.execute(self.quote_id)
-
-            # 2) Services catalog (use case é ASYNC)
-            services_resp = await container.list_services.execute(ListServicesRequest())
-            self.services = list(services_resp.services)
+            # summary roda no DBExecutor (fora do event loop); itens vêm por
+            # janela na lista virtual e serviços pela busca (type-ahead)
+            dto = await container.get_quote_summary.execute(self.quote_id)
 
         except ApplicationError as e:
             self.vm.is_loading = False
@@ -60,8 +90,14 @@ class QuoteEditController:
             self._render()
             return
 
+        self._apply(dto)
+        self._render()
+
+    def _apply(self, dto) -> None:
         # preencher VM com dados do quote
+        self._dto = dto
         self.vm.is_loading = False
+        self.vm.error = None
         self.vm.quote_id = dto.id
         self.vm.customer_name = dto.customer_name
         self.vm.status = dto.status
@@ -69,29 +105,44 @@ class QuoteEditController:
         self.vm.total_sale_cents = dto.total_sale_cents
         self.vm.total_sale_brl = self._fmt_brl(dto.total_sale_cents)
 
-        self.vm.items = []
-        for i in dto.items:
-            item_vm = QuoteEditItemVM(
-                item_id=i.id,
-                service_name=i.service_name,
-                unit=i.unit,
-                quantity=i.quantity,
-                unit_price_cents=i.unit_price_cents,
-                adjustment_cents=i.adjustment_cents,
-                line_total_cents=i.line_total_cents,
-            )
-            item_vm.unit_price_brl = self._fmt_brl(i.unit_price_cents)
-            item_vm.adjustment_brl = self._fmt_brl(i.adjustment_cents)
-            item_vm.line_total_brl = self._fmt_brl(i.line_total_cents)
-            self.vm.items.append(item_vm)
-
-        self._render()
+        self.vm.item_count = dto.item_count
+        self.vm.items_version += 1  # lista virtual rebusca a janela visível
 
+    async def fetch_items(self, offset: int, limit: int) -> tuple[list[QuoteEditItemVM], int]:
+        """Página de itens para a lista virtual (só o que está na tela)."""
+        container = self.page.data["container"]
+        resp = await container.list_quote_items.execute(
+            ListQuoteItemsRequest(quote_id=self.quote_id, offset=offset, limit=limit)
+        )
+        return [self._item_vm(i) for i in resp.items], resp.total
+
+    def _item_vm(self, i) -> QuoteEditItemVM:
+        item_vm = QuoteEditItemVM(
+            item_id=i.id,
+            service_name=i.service_name,
+            unit=i.unit,
+            quantity=i.quantity,
+            unit_price_cents=i.unit_price_cents,
+            adjustment_cents=i.adjustment_cents,
+            line_total_cents=i.line_total_cents,
+        )
+        item_vm.unit_price_brl = self._fmt_brl(i.unit_price_cents)
+        item_vm.adjustment_brl = self._fmt_brl(i.adjustment_cents)
+        item_vm.line_total_brl = self._fmt_brl(i.line_total_cents)
+        return item_vm
+
+
+    async def search_services(self, text: str) -> list[ServiceRow]:
+        """Sugestões do type-ahead (top-K do índice do catálogo, em memória)."""
+        container = self.page.data["container"]
+        resp = await container.search_services.execute(SearchServicesRequest(text=text, limit=12))
+        self.services.update((s.id, s) for s in resp.services)
+        return list(resp.services)
 
     def select_service(self, service_id: str) -> None:
         self.selected_service_id = service_id
 
-        svc = next((s for s in self.services if s.id == service_id), None)
+        svc = self.services.get(service_id)
         if svc is None:
             self.vm.form_error = "Serviço selecionado não encontrado."
             self._render()
@@ -205,37 +256,121 @@ class QuoteEditController:
         self._render()
 
         try:
-            container.add_item_to_quote.execute(
-                AddItemToQuoteInput(
-                    quote_id=self.quote_id,
-                    service_name=name,
-                    unit=unit,
-                    quantity=qty,
-                    unit_price_cents=unit_price_cents,
-                    adjustment_cents=adjustment_cents,
-                    description_client="",
+            try:
+                await container.add_item_to_quote.execute(
+                    AddItemToQuoteInput(
+                        quote_id=self.quote_id,
+                        service_name=name,
+                        unit=unit,
+                        quantity=qty,
+                        unit_price_cents=unit_price_cents,
+                        adjustment_cents=adjustment_cents,
+                        description_client="",
+                    )
                 )
-            )
-        except ApplicationError as e:
+            except ApplicationError as e:
+                self.vm.form_error = str(e)
+                return
+            except _INFRA_ERRORS:
+                self.vm.form_error = _INFRA_MESSAGE
+                return
+
+            # recarga substitui qualquer outra em andamento (adds seguidos não empilham)
+            await self._loads.run(self._load_async)
+
+            self.vm.new_service_name = ""
+            self.vm.new_unit = ""
+            self.vm.new_quantity = ""
+            self.vm.new_unit_price = ""
+            self.vm.new_adjustment = "0"
+            self.selected_service_id = None
+            self.vm.unit_locked = True
+            self.vm.unit_price_locked = True
+        finally:
             self.vm.is_saving = False
-            self.vm.form_error = str(e)
+            self._render()
+
+    # colar várias linhas (planilha)
+    def set_paste_text(self, v: str) -> None:
+        self.vm.paste_text = v
+        self.vm.form_error = None
+
+    def add_items_from_text(self) -> None:
+        lines, errors = self._parse_pasted_lines(self.vm.paste_text)
+        if errors:
+            self.vm.form_error = "\n".join(errors)
+            self._render()
+            return
+        if not lines:
+            self.vm.form_error = "Cole ao menos uma linha."
             self._render()
             return
 
-        await self._load_async()
+        async def _job():
+            await self._add_items_async(lines)
 
-        self.vm.new_service_name = ""
-        self.vm.new_unit = ""
-        self.vm.new_quantity = ""
-        self.vm.new_unit_price = ""
-        self.vm.new_adjustment = "0"
-        self.vm.is_saving = False
-        self.selected_service_id = None
-        self.vm.unit_locked = True
-        self.vm.unit_price_locked = True
+        self.page.run_task(_job)
+
+    async def _add_items_async(self, lines: list[QuoteItemLine]):
+        container = self.page.data["container"]
 
+        self.vm.is_saving = True
+        self.vm.form_error = None
         self._render()
 
+        try:
+            try:
+                # uma chamada, uma transação, um recálculo de totals
+                await container.add_items_to_quote.execute(AddItemsToQuoteInput(quote_id=self.quote_id, lines=lines))
+            except ApplicationError as e:
+                self.vm.form_error = str(e)
+                return
+            except _INFRA_ERRORS:
+                self.vm.form_error = _INFRA_MESSAGE
+                return
+
+            # um único reload para o lote inteiro
+            await self._loads.run(self._load_async)
+            self.vm.paste_text = ""
+        finally:
+            # erro inesperado ou cancelamento não deixa o editor travado
+            self.vm.is_saving = False
+            self._render()
+
+    def _parse_pasted_lines(self, raw: str) -> tuple[list[QuoteItemLine], list[str]]:
+        lines: list[QuoteItemLine] = []
+        errors: list[str] = []
+
+        for n, text in enumerate((raw or "").splitlines(), start=1):
+            if not text.strip():
+                continue
+            # Excel/Sheets colam com TAB; digitado à mão costuma vir com ";"
+            cols = [c.strip() for c in (text.split("\t") if "\t" in text else text.split(";"))]
+            if len(cols) < 4:
+                errors.append(f"Linha {n}: esperado serviço; unidade; quantidade; preço[; ajuste].")
+                continue
+
+            name, unit, qty_raw, price_raw = cols[:4]
+            qty = self._parse_qty_decimal_br(qty_raw)
+            price = self._parse_brl_to_cents(price_raw, allow_empty=False)
+            adjustment = self._parse_brl_to_cents(cols[4] if len(cols) > 4 else "", allow_empty=True)
+
+            if qty is None or price is None or adjustment is None:
+                errors.append(f"Linha {n}: quantidade, preço ou ajuste inválido.")
+                continue
+
+            lines.append(
+                QuoteItemLine(
+                    service_name=name,
+                    unit=unit,
+                    quantity=qty,
+                    unit_price_cents=price,
+                    adjustment_cents=adjustment,
+                )
+            )
+
+        return lines, errors
+
     def _parse_int(self, raw: str):
         try:
             s = (raw or "").strip()
@@ -7,30 +7,51 @@ import flet as ft
 
 from app.core.state import AppContainer
 from app.core.use_cases.list_services import ListServicesRequest
+from app.core.use_cases.search_services import SearchServicesRequest
 from app.core.use_cases.create_service import CreateServiceRequest
 from app.core.use_cases.delete_service import DeleteServiceRequest
+from app.db.repos.services_repo import ServiceRow
 
+from app.ui.components.type_ahead import TypeAhead
+from app.ui.load_scheduler import LoadScheduler
 from app.ui.viewmodels.settings_vm import SettingsVM
 
 
 class SettingsController:
+    LIST_LIMIT = 100  # o resto do catálogo se acha pela busca
+
     def __init__(self, page: ft.Page, container: AppContainer) -> None:
         self.page = page
         self.container = container
         self.vm = SettingsVM()
         self._host: ft.Container | None = None
         self._pending_delete_id: str | None = None
+        self._loads = LoadScheduler.for_page(page)
 
 
 
         # refs
         self._dialog: Optional[ft.AlertDialog] = None
 
+        # criado uma vez: render_view remonta a tela, mas o campo e as sugestões ficam
+        self._service_search = TypeAhead(
+            page,
+            search=self._search_services,
+            key=lambda s: s.id,
+            label=lambda s: f"{s.name} • {s.unit} • R$ {self._cents_to_br(s.default_unit_price_cents)}",
+            on_select=lambda s: self._select_service_id(s.id),
+            field_label="Buscar serviço",
+        )
+
     # =========================
     # Router hooks
     # =========================
     def on_route_enter(self) -> None:
-        self.page.run_task(self._load_services)  # sem ()
+        self._loads.start(self._load_services)  # sem ()
+
+    def on_route_reenter(self) -> None:
+        # catálogo vem do cache em memória: recarregar não custa query
+        self._loads.start(self._load_services)
 
 
 
@@ -70,18 +91,7 @@ class SettingsController:
             spacing=12,
         )
 
-        services_dropdown = ft.Dropdown(
-            label="Serviço",
-            value=self.vm.selected_service_id,
-            options=[
-                ft.dropdown.Option(
-                    s.id,
-                    f"{s.name} • {s.unit} • R$ {self._cents_to_br(s.default_unit_price_cents)}",
-                )
-                for s in self.vm.services
-            ],
-            on_select=self._on_select_service,   # (sua versão)
-        )
+        services_search = self._service_search.control
 
         selected_card = ft.Container(
             content=ft.Column(
@@ -100,7 +110,7 @@ class SettingsController:
         )
 
         items: list[ft.Control] = []
-        for s in self.vm.services:
+        for s in self.vm.services[: self.LIST_LIMIT]:
             items.append(
                 ft.ListTile(
                     title=ft.Text(s.name),
@@ -123,7 +133,11 @@ class SettingsController:
             content=ft.Column(
                 expand=True,
                 controls=[
-                    ft.Text("Catálogo"),
+                    ft.Text(
+                        "Catálogo"
+                        if len(self.vm.services) <= self.LIST_LIMIT
+                        else f"Catálogo (mostrando {self.LIST_LIMIT} de {len(self.vm.services)}; use a busca)"
+                    ),
                     ft.Container(expand=True, content=list_view),
                 ],
             ),
@@ -143,7 +157,7 @@ class SettingsController:
                     ft.Text("Settings OK"),
                     header,
                     status_line,
-                    services_dropdown,
+                    services_search,
                     selected_card,
                     list_panel
                 ],
@@ -176,16 +190,14 @@ class SettingsController:
             self.vm.loading = False
             self.bind_render()
 
+    async def _search_services(self, text: str) -> list[ServiceRow]:
+        resp = await self.container.search_services.execute(SearchServicesRequest(text=text, limit=12))
+        return list(resp.services)
+
     def _select_service_id(self, service_id: str) -> None:
         self.vm.selected_service_id = service_id
         self.bind_render()
 
-    def _on_select_service(self, e: ft.ControlEvent) -> None:
-        value = getattr(e.control, "value", None) or getattr(e, "data", None)
-        if value:
-            self.vm.selected_service_id = value
-            self.bind_render()
-
 
     def open_new_service_dialog(self) -> None:
         self.vm.dialog_open = True
@@ -288,7 +300,7 @@ class SettingsController:
 
             # fechar dialog e recarregar
             self.close_dialog()
-            await self._load_services()
+            await self._loads.run(self._load_services)
 
         except Exception as ex:
             self.vm.error = str(ex)
@@ -320,7 +332,7 @@ class SettingsController:
         try:
             await self.container.delete_service.execute(DeleteServiceRequest(service_id=service_id))
             # após excluir, recarrega e ajusta seleção
-            await self._load_services()
+            await self._loads.run(self._load_services)
         except Exception as ex:
             self.vm.error = str(ex)
         finally:
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Optional, Union
+
+import flet as ft
+
+DebouncedFn = Callable[..., Union[None, Awaitable[None]]]
+
+
+class Debouncer:
+    """
+    Junta rajadas de eventos (resize, digitação) numa chamada só:
+    cada call() reinicia a espera; fn roda uma vez, delay segundos depois
+    do último evento, com os argumentos do último evento.
+    fn pode ser síncrona ou async; roda no loop da sessão (page.run_task).
+    """
+
+    def __init__(self, page: ft.Page, delay: float) -> None:
+        self.page = page
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._pending: Optional[Any] = None  # asyncio.Task ou concurrent Future (run_task)
+        self.calls = 0
+        self.runs = 0
+
+    def call(self, fn: DebouncedFn, *args: Any) -> None:
+        handle = self.page.run_task(self._fire, fn, *args)
+        with self._lock:
+            old, self._pending = self._pending, handle
+            self.calls += 1
+        if old is not None and not old.done():
+            old.cancel()
+
+    def cancel(self) -> None:
+        with self._lock:
+            old, self._pending = self._pending, None
+        if old is not None and not old.done():
+            old.cancel()
+
+    async def _fire(self, fn: DebouncedFn, *args: Any) -> None:
+        await asyncio.sleep(self.delay)
+        self.runs += 1
+        result = fn(*args)
+        if asyncio.iscoroutine(result):
+            await result
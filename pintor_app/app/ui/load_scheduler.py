@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+import flet as ft
+
+from app.ui.perf import page_metrics
+
+LoadFn = Callable[..., Awaitable[Any]]
+
+
+class LoadScheduler:
+    """
+    Uma carga de página por vez (por sessão):
+    - start(): dispara a carga (on_route_enter); a anterior em andamento é cancelada
+    - run(): idem, mas aguardando o fim (recarregar depois de salvar);
+      devolve False se outra carga mais nova tomou o lugar
+    Compartilhado pela sessão (for_page), então navegar para outra rota
+    também cancela a carga da página que ficou para trás.
+    Com métricas no container, cada carga concluída grava "load.<função>"
+    (ex.: load.QuoteDetailsController._load_async); cancelada só conta.
+    """
+
+    def __init__(self, page: ft.Page) -> None:
+        self.page = page
+        self._lock = threading.Lock()
+        self._current: Optional[Any] = None  # asyncio.Task ou concurrent Future (run_task)
+        self.started = 0
+        self.cancelled = 0
+        self._metrics = page_metrics(page)
+
+    @classmethod
+    def for_page(cls, page: ft.Page) -> "LoadScheduler":
+        data = page.data
+        scheduler = data.get("load_scheduler")
+        if scheduler is None:
+            scheduler = cls(page)
+            data["load_scheduler"] = scheduler
+        return scheduler
+
+    def start(self, fn: LoadFn, *args: Any) -> None:
+        if self._metrics is not None:
+            self._replace(self.page.run_task(self._timed, fn, *args))
+        else:
+            self._replace(self.page.run_task(fn, *args))
+
+    async def run(self, fn: LoadFn, *args: Any) -> bool:
+        coro = self._timed(fn, *args) if self._metrics is not None else fn(*args)
+        task = asyncio.ensure_future(coro)
+        self._replace(task)
+        try:
+            await asyncio.wait([task])
+        except asyncio.CancelledError:
+            # quem aguardava foi cancelado: a carga vai junto
+            task.cancel()
+            raise
+        if task.cancelled():
+            return False
+        task.result()  # propaga erro da carga
+        return True
+
+    async def _timed(self, fn: LoadFn, *args: Any) -> Any:
+        metrics = self._metrics
+        name = f"load.{getattr(fn, '__qualname__', type(fn).__name__)}"
+        t0 = time.perf_counter()
+        try:
+            result = await fn(*args)
+        except asyncio.CancelledError:
+            metrics.counter(f"{name}.cancelled").inc()
+            raise
+        metrics.record_duration(name, t0)
+        return result
+
+    def cancel(self) -> None:
+        self._replace(None)
+
+    def _replace(self, new: Optional[Any]) -> None:
+        with self._lock:
+            old, self._current = self._current, new
+            if new is not None:
+                self.started += 1
+        if old is not None and not old.done() and old.cancel():
+            self.cancelled += 1
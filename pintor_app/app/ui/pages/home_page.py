@@ -16,6 +16,10 @@ def HomePage(page: ft.Page) -> ft.Control:
                     "Novo orçamento rápido",
                     on_click=lambda _: router.go("/quick-quote"),
                 ),
+                ft.TextButton(
+                    "Histórico",
+                    on_click=lambda _: router.go("/history"),
+                ),
                 ft.TextButton(
                     "Login",
                     on_click=lambda _: router.go("/login"),
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import flet as ft
+
+from app.core.metrics import HistogramSnapshot
+
+
+def _fmt(value: int, unit: str) -> str:
+    # tempos em µs no histograma; na tela em ms
+    return f"{value / 1000:.1f} ms" if unit == "us" else str(value)
+
+
+def perf_rows(snapshots: list[HistogramSnapshot]) -> list[tuple[str, str, str, str, str, str]]:
+    """(operação, n, p50, p95, p99, máx), só o que já teve amostra."""
+    return [
+        (
+            s.name,
+            str(s.count),
+            _fmt(s.p50, s.unit),
+            _fmt(s.p95, s.unit),
+            _fmt(s.p99, s.unit),
+            _fmt(s.max, s.unit),
+        )
+        for s in snapshots
+        if s.count
+    ]
+
+
+def _table(headers: list[str], rows: list[tuple[str, ...]]) -> ft.Control:
+    if not rows:
+        return ft.Text("Sem amostras ainda.")
+    return ft.DataTable(
+        columns=[ft.DataColumn(ft.Text(h)) for h in headers],
+        rows=[ft.DataRow(cells=[ft.DataCell(ft.Text(v)) for v in row]) for row in rows],
+    )
+
+
+def PerfPage(page: ft.Page) -> ft.Control:
+    """
+    Rota escondida (/debug/perf, sem link no menu): percentis por operação
+    (use cases, cargas, renders), controles por render e as queries mais caras.
+    SQL só aparece com o rastreio ligado na inicialização (AppConfig.sql_trace).
+    Lê os registros do processo; "Zerar" vale para todas as sessões.
+    """
+    container = page.data["container"]
+    metrics = container.metrics
+    tracer = getattr(container.pool, "tracer", None)
+    body = ft.Column(spacing=16)
+
+    def render(_=None):
+        counters = [(name, str(value)) for name, value in metrics.counters().items() if value]
+        sections: list[ft.Control] = [
+            ft.Text("Latência por operação", weight=ft.FontWeight.BOLD),
+            _table(["Operação", "n", "p50", "p95", "p99", "máx"], perf_rows(metrics.snapshot())),
+            ft.Text("Contadores", weight=ft.FontWeight.BOLD),
+            _table(["Contador", "valor"], counters),
+        ]
+        if tracer is None:
+            sections.append(ft.Text("Rastreio SQL desligado (inicie com PINTOR_SQL_TRACE=1)."))
+        elif not tracer.enabled:
+            sections.append(ft.Text("Rastreio SQL pausado."))
+        else:
+            sql_rows = [
+                (s.fingerprint[:120], str(s.count), f"{s.avg_ms:.2f} ms", f"{s.max_ms:.1f} ms", str(s.rows))
+                for s in tracer.top(15)
+            ]
+            sections += [
+                ft.Text(f"SQL (tempo total; lentas: {tracer.slow_count})", weight=ft.FontWeight.BOLD),
+                _table(["Query", "n", "média", "máx", "linhas"], sql_rows),
+            ]
+        body.controls = sections
+        page.update()
+
+    def toggle_trace(e):
+        # instrumentação só existe com PINTOR_SQL_TRACE=1; aqui só pausa/retoma
+        tracer.enabled = not tracer.enabled
+        # TextButton do Flet 1.x: o rótulo fica em `content` (não há `text`)
+        e.control.content = "Pausar SQL" if tracer.enabled else "Retomar SQL"
+        render()
+
+    def reset(_):
+        metrics.reset()
+        if tracer is not None:
+            tracer.clear()
+        render()
+
+    view = ft.Container(
+        expand=True,
+        padding=16,
+        content=ft.Column(
+            scroll=ft.ScrollMode.AUTO,
+            controls=[
+                ft.Row(
+                    controls=[
+                        ft.Text("Desempenho", size=20, weight=ft.FontWeight.BOLD),
+                        ft.TextButton("Atualizar", on_click=render),
+                        ft.TextButton("Zerar", on_click=reset),
+                        *(
+                            [ft.TextButton("Pausar SQL" if tracer.enabled else "Retomar SQL", on_click=toggle_trace)]
+                            if tracer is not None
+                            else []
+                        ),
+                    ]
+                ),
+                body,
+            ],
+        ),
+    )
+    render()
+    return view
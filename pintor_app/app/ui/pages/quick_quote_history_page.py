@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import flet as ft
+
+from app.ui.viewmodels.quote_history_vm import QuoteHistoryVM
+from app.ui.controllers.quick_quote_history_controller import QuickQuoteHistoryController
+from app.ui.perf import timed_render
+
+
+def QuickQuoteHistoryPage(page: ft.Page, router, vm: QuoteHistoryVM, controller: QuickQuoteHistoryController) -> ft.Control:
+    body_container = ft.Container(expand=True)
+
+    search_field = ft.TextField(
+        label="Buscar (cliente, observações, serviços)",
+        value=vm.query,
+        expand=True,
+        on_change=lambda e: controller.set_query(e.control.value),
+        on_submit=lambda _: controller.search(),
+    )
+
+    def on_clear(_):
+        search_field.value = ""
+        controller.clear_search()
+
+    def render_body():
+        if vm.is_loading:
+            body_container.content = ft.Text("Carregando...")
+        elif vm.error and not vm.rows:
+            body_container.content = ft.Text(vm.error)
+        else:
+            tiles: list[ft.Control] = [
+                ft.ListTile(
+                    title=ft.Text(r.customer_name),
+                    subtitle=ft.Text(f"{r.status} • R$ {r.total_sale_brl} • {r.updated_at[:16].replace('T', ' ')}"),
+                    on_click=lambda _, qid=r.quote_id: router.go(f"/quotes/{qid}"),
+                )
+                for r in vm.rows
+            ]
+            if vm.has_more:
+                tiles.append(
+                    ft.TextButton(
+                        "Carregando..." if vm.is_loading_more else "Carregar mais",
+                        on_click=lambda _: controller.load_more(),
+                        disabled=vm.is_loading_more,
+                    )
+                )
+            body_container.content = ft.ListView(
+                expand=True,
+                controls=tiles if tiles else [
+                    ft.Text("Nenhum resultado." if vm.is_searching else "Nenhum orçamento ainda.")
+                ],
+            )
+
+        page.update()
+
+    # tempo do render (+ page.update) e controles na árvore, para /debug/perf
+    render_body = timed_render(page, "QuickQuoteHistoryPage", render_body, body_container)
+    controller.bind_render(render_body)
+
+    render_body()
+
+    controller.on_route_enter()
+
+    return ft.Container(
+        expand=True,
+        padding=20,
+        content=ft.Column(
+            expand=True,
+            controls=[
+                ft.Text("Histórico de orçamentos", size=20, weight=ft.FontWeight.BOLD),
+                ft.Row(
+                    controls=[
+                        search_field,
+                        ft.IconButton(icon=ft.Icons.SEARCH, on_click=lambda _: controller.search()),
+                        ft.IconButton(icon=ft.Icons.CLEAR, on_click=on_clear),
+                    ]
+                ),
+                body_container,
+                ft.Row(
+                    controls=[
+                        ft.TextButton("Home", on_click=lambda _: router.go("/")),
+                    ]
+                ),
+            ],
+        ),
+    )
@@ -2,50 +2,75 @@ from __future__ import annotations
 
 import flet as ft
 
-from app.ui.viewmodels.quote_details_vm import QuoteDetailsVM
+from app.ui.components.keyed import set_props
+from app.ui.components.virtual_list import VirtualList, WindowedSource
+from app.ui.viewmodels.quote_details_vm import QuoteDetailsVM, QuoteItemVM
 from app.ui.controllers.quote_details_controller import QuoteDetailsController
+from app.ui.perf import timed_render
+
+
+def _item_text(it: QuoteItemVM) -> str:
+    return (
+        f"- {it.service_name} | {it.quantity} {it.unit} | "
+        f"Preço: R$ {it.unit_price_brl} | Ajuste: R$ {it.adjustment_brl} | "
+        f"Total: R$ {it.line_total_brl}"
+    )
 
 
 def QuoteDetailsPage(page: ft.Page, router, vm: QuoteDetailsVM, controller: QuoteDetailsController) -> ft.Control:
-    body_container = ft.Container()
+    # controles montados uma vez; render_body só altera o que mudou
+    status_text = ft.Text("Carregando...")
+    quote_id = ft.Text()
+    customer = ft.Text()
+    status = ft.Text()
+    materials = ft.Text()
+    total = ft.Text()
+    notes = ft.Text()
+    items_count = ft.Text(weight=ft.FontWeight.BOLD)
+    # só as linhas visíveis existem; o resto é buscado em páginas ao rolar
+    items = VirtualList(
+        page,
+        WindowedSource(controller.fetch_items, page_size=50),
+        key=lambda it: it.item_id,
+        build=lambda it: ft.Text(_item_text(it)),
+        patch=lambda ctrl, it: set_props(ctrl, value=_item_text(it)),
+        row_height=32,
+        height=400,
+    )
+    shown_items_version = None
+    details = ft.Column(
+        spacing=8,
+        visible=False,
+        controls=[quote_id, customer, status, materials, total, notes, ft.Divider(), items_count, items.control],
+    )
+    body_container = ft.Container(content=ft.Column(spacing=0, controls=[status_text, details]))
 
     def render_body():
+        nonlocal shown_items_version
         # monta UI a partir do VM (Page pura)
-        if vm.is_loading:
-            body_container.content = ft.Text("Carregando...")
-        elif vm.error:
-            body_container.content = ft.Text(vm.error)
+        if vm.is_loading or vm.error:
+            set_props(status_text, value=vm.error or "Carregando...", visible=True)
+            set_props(details, visible=False)
         else:
-            body_container.content = ft.Column(
-                spacing=8,
-                controls=[
-                    ft.Text(f"ID: {vm.quote_id}"),
-                    ft.Text(f"Cliente: {vm.customer_name}"),
-                    ft.Text(f"Status: {vm.status}"),
-                    ft.Text(f"Com material: {'Sim' if vm.materials_included else 'Não'}"),
-                    ft.Text(f"Total: R$ {vm.total_sale_brl}"),
-
-
-                    ft.Divider(),
-                    ft.Text(f"Itens: {len(vm.items or [])}", weight=ft.FontWeight.BOLD),
-                    ft.Column(
-                        spacing=6,
-                        controls=[
-                            ft.Text(
-                                f"- {it.service_name} | {it.quantity} {it.unit} | "
-                                f"Preço: R$ {it.unit_price_brl} | Ajuste: R$ {it.adjustment_brl} | "
-                                f"Total: R$ {it.line_total_brl}"
-                            )
-                            for it in (vm.items or [])
-                        ],
-                    ),
-                ],
-            )
+            set_props(status_text, visible=False)
+            set_props(details, visible=True)
+            set_props(quote_id, value=f"ID: {vm.quote_id}")
+            set_props(customer, value=f"Cliente: {vm.customer_name}")
+            set_props(status, value=f"Status: {vm.status}")
+            set_props(materials, value=f"Com material: {'Sim' if vm.materials_included else 'Não'}")
+            set_props(total, value=f"Total: R$ {vm.total_sale_brl}")
+            set_props(notes, value=f"Observações: {vm.notes_client}", visible=bool(vm.notes_client))
+            set_props(items_count, value=f"Itens: {vm.item_count}")
+            if vm.items_version != shown_items_version:
+                shown_items_version = vm.items_version
+                items.reload()
 
         # update é após build, acionado pelo controller
         page.update()
 
     # liga o controller ao render
+    # tempo do render (+ page.update) e controles na árvore, para /debug/perf
+    render_body = timed_render(page, "QuoteDetailsPage", render_body, body_container)
     controller.bind_render(render_body)
 
     # primeira renderização (loading)
@@ -2,95 +2,151 @@ from __future__ import annotations
 
 import flet as ft
 
-from app.ui.viewmodels.quote_edit_vm import QuoteEditVM
-
+from app.ui.components.keyed import set_props
+from app.ui.components.type_ahead import TypeAhead
+from app.ui.components.virtual_list import VirtualList, WindowedSource
+from app.ui.viewmodels.quote_edit_vm import QuoteEditVM, QuoteEditItemVM
 from app.ui.controllers.quote_edit_controller import QuoteEditController
+from app.ui.perf import timed_render
+
 
+def _item_text(it: QuoteEditItemVM) -> str:
+    return (
+        f"- {it.service_name} | {it.quantity} {it.unit} | "
+        f"Preço: {it.unit_price_brl} | Ajuste: {it.adjustment_brl} | "
+        f"Total: {it.line_total_brl}"
+    )
 
 
 def QuoteEditPage(page: ft.Page, router, vm: QuoteEditVM, controller: QuoteEditController) -> ft.Control:
-    body_container = ft.Container()
+    # controles montados uma vez; render_body só altera o que mudou
+    # (travar/destravar, recarga depois de adicionar, etc. viram patches pequenos)
+    status_text = ft.Text("Carregando...")
+    quote_id = ft.Text()
+    customer = ft.Text()
+    status = ft.Text()
+    materials = ft.Text()
+    total = ft.Text()
+    items_count = ft.Text(weight=ft.FontWeight.BOLD)
+    # só as linhas visíveis existem; o resto é buscado em páginas ao rolar
+    items = VirtualList(
+        page,
+        WindowedSource(controller.fetch_items, page_size=50),
+        key=lambda it: it.item_id,
+        build=lambda it: ft.Text(_item_text(it)),
+        patch=lambda ctrl, it: set_props(ctrl, value=_item_text(it)),
+        row_height=32,
+        height=320,
+    )
+    shown_items_version = None
+
+    # busca no catálogo (top-K) em vez de um Dropdown com todos os serviços
+    service_search = TypeAhead(
+        page,
+        search=controller.search_services,
+        key=lambda s: s.id,
+        label=lambda s: s.name,
+        on_select=lambda s: controller.select_service(s.id),
+        field_label="Serviço",
+        width=398,
+    )
+    shown_selection = None
+    unit_field = ft.TextField(
+        label="Unidade (ex: m², dia)",
+        on_change=lambda e: controller.set_unit(e.control.value),
+        expand=True,
+    )
+    unit_lock = ft.OutlinedButton(on_click=lambda e: controller.toggle_unit_lock())
+    quantity_field = ft.TextField(label="Quantidade", on_change=lambda e: controller.set_quantity(e.control.value))
+    price_field = ft.TextField(
+        label="Preço unitário (R$)",
+        on_change=lambda e: controller.set_unit_price(e.control.value),
+        expand=True,
+    )
+    price_lock = ft.OutlinedButton(on_click=lambda e: controller.toggle_unit_price_lock())
+    adjustment_field = ft.TextField(label="Ajuste (R$)", on_change=lambda e: controller.set_adjustment(e.control.value))
+    form_error = ft.Text(color=ft.Colors.RED)
+    add_button = ft.ElevatedButton("Adicionar item", on_click=lambda _: controller.add_item())
+    paste_field = ft.TextField(
+        label="serviço; unidade; quantidade; preço; ajuste",
+        multiline=True,
+        min_lines=3,
+        max_lines=8,
+        width=398,
+        on_change=lambda e: controller.set_paste_text(e.control.value),
+    )
+    paste_button = ft.ElevatedButton("Adicionar linhas", on_click=lambda _: controller.add_items_from_text())
+
+    details = ft.Column(
+        spacing=8,
+        visible=False,
+        controls=[
+            quote_id,
+            customer,
+            status,
+            materials,
+            total,
+            ft.Divider(),
+            items_count,
+            items.control,
+            ft.Divider(),
+            ft.Text("Adicionar item", weight=ft.FontWeight.BOLD),
+            service_search.control,
+            ft.Row(vertical_alignment=ft.CrossAxisAlignment.START, width=398, controls=[unit_field, unit_lock]),
+            quantity_field,
+            ft.Row(vertical_alignment=ft.CrossAxisAlignment.START, width=398, controls=[price_field, price_lock]),
+            adjustment_field,
+            form_error,
+            add_button,
+            ft.Divider(),
+            ft.Text("Colar itens (planilha)", weight=ft.FontWeight.BOLD),
+            paste_field,
+            paste_button,
+        ],
+    )
+    body_container = ft.Container(content=ft.Column(spacing=0, controls=[status_text, details]))
 
     def render_body():
-        if vm.is_loading:
-            body_container.content = ft.Text("Carregando...")
-        elif vm.error:
-            body_container.content = ft.Text(vm.error)
-        else:
-            body_container.content = ft.Column(
-                spacing=8,
-                controls=[
-                    ft.Text(f"ID: {vm.quote_id}"),
-                    ft.Text(f"Cliente: {vm.customer_name}"),
-                    ft.Text(f"Status: {vm.status}"),
-                    ft.Text(f"Com material: {'Sim' if vm.materials_included else 'Não'}"),
-                    ft.Text(f"Total: R$ {vm.total_sale_brl}"),
-                    ft.Divider(),
-                    ft.Text(f"Itens: {len(vm.items or [])}", weight=ft.FontWeight.BOLD),
-                    ft.Column(
-                        spacing=6,
-                        controls=[
-                            ft.Text(
-                                f"- {it.service_name} | {it.quantity} {it.unit} | "
-                                f"Preço: {it.unit_price_brl} | Ajuste: {it.adjustment_brl} | "
-                                f"Total: {it.line_total_brl}"
-                            )
-                            for it in (vm.items or [])
-                        ],
-                    ),
-                    ft.Divider(),
-                    ft.Text("Adicionar item", weight=ft.FontWeight.BOLD),
-                    ft.Dropdown(
-                        label="Serviço",
-                        value=controller.selected_service_id,  # <- controla o que aparece selecionado
-                        options=[ft.dropdown.Option(s.id, s.name) for s in controller.services],
-                        on_select=lambda e: controller.select_service(e.data),
-                    ),
-                    ft.Row(
-                        vertical_alignment=ft.CrossAxisAlignment.START,
-                        width=398,
-                        controls=[
-                            ft.TextField(
-                                label="Unidade (ex: m², dia)",
-                                value=vm.new_unit,
-                                on_change=lambda e: controller.set_unit(e.control.value),
-                                disabled=vm.unit_locked,   # <- trava
-                                expand=True,
-                            ),
-                            ft.OutlinedButton(
-                                "Alterar" if vm.unit_locked else "Travar",
-                                on_click=lambda e: controller.toggle_unit_lock(),
-                            ),
-                        ],
-                    ),
-
-                    ft.TextField(label="Quantidade", value=vm.new_quantity, on_change=lambda e: controller.set_quantity(e.control.value)),
-                    ft.Row(
-                        vertical_alignment=ft.CrossAxisAlignment.START,
-                        width=398,
-                        controls=[
-                            ft.TextField(
-                                label="Preço unitário (R$)",
-                                value=vm.new_unit_price,
-                                on_change=lambda e: controller.set_unit_price(e.control.value),
-                                disabled=vm.unit_price_locked,  # <- trava
-                                expand=True,
-                            ),
-                            ft.OutlinedButton(
-                                "Alterar" if vm.unit_price_locked else "Travar",
-                                on_click=lambda e: controller.toggle_unit_price_lock(),
-                            ),
-                        ],
-                    ),
-
-                    ft.TextField(label="Ajuste (R$)", value=vm.new_adjustment, on_change=lambda e: controller.set_adjustment(e.control.value)),
-                    ft.Text(vm.form_error or "", color=ft.Colors.RED),
-                    ft.ElevatedButton("Adicionar item", on_click=lambda _: controller.add_item(), disabled=vm.is_saving),
-                ],
-            )
+        nonlocal shown_selection, shown_items_version
+        if vm.is_loading or vm.error:
+            set_props(status_text, value=vm.error or "Carregando...", visible=True)
+            set_props(details, visible=False)
+            page.update()
+            return
+
+        set_props(status_text, visible=False)
+        set_props(details, visible=True)
+        set_props(quote_id, value=f"ID: {vm.quote_id}")
+        set_props(customer, value=f"Cliente: {vm.customer_name}")
+        set_props(status, value=f"Status: {vm.status}")
+        set_props(materials, value=f"Com material: {'Sim' if vm.materials_included else 'Não'}")
+        set_props(total, value=f"Total: R$ {vm.total_sale_brl}")
+        set_props(items_count, value=f"Itens: {vm.item_count}")
+        if vm.items_version != shown_items_version:
+            shown_items_version = vm.items_version
+            items.reload()
+
+        # seleção limpa pelo controller (ex.: depois de adicionar) limpa o campo
+        if controller.selected_service_id != shown_selection:
+            shown_selection = controller.selected_service_id
+            if shown_selection is None:
+                service_search.clear()
+
+        set_props(unit_field, value=vm.new_unit, disabled=vm.unit_locked)  # <- trava
+        set_props(unit_lock, content="Alterar" if vm.unit_locked else "Travar")
+        set_props(quantity_field, value=vm.new_quantity)
+        set_props(price_field, value=vm.new_unit_price, disabled=vm.unit_price_locked)  # <- trava
+        set_props(price_lock, content="Alterar" if vm.unit_price_locked else "Travar")
+        set_props(adjustment_field, value=vm.new_adjustment)
+        set_props(form_error, value=vm.form_error or "")
+        set_props(add_button, disabled=vm.is_saving)
+        set_props(paste_field, value=vm.paste_text)
+        set_props(paste_button, disabled=vm.is_saving)
 
         page.update()
 
+    # tempo do render (+ page.update) e controles na árvore, para /debug/perf
+    render_body = timed_render(page, "QuoteEditPage", render_body, body_container)
     controller.bind_render(render_body)
 
     
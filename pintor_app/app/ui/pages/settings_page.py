@@ -22,3 +22,7 @@ class SettingsPage(ft.Container):
         # entra na rota e inicia carregamento
         self._controller.on_route_enter()
         self._controller.bind_render()
+
+    def on_route_reenter(self) -> None:
+        # Router reaproveitou esta view (keep-alive)
+        self._controller.on_route_reenter()
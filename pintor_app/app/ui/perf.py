@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, Optional
+
+import flet as ft
+
+from app.core.metrics import MetricsRegistry
+
+# atributos que guardam controles filhos nos controles usados pelo app
+_CHILD_ATTRS = ("content", "controls", "title", "subtitle", "leading", "trailing", "actions")
+
+
+def page_metrics(page: ft.Page) -> Optional[MetricsRegistry]:
+    """Registro de métricas do container da sessão (None fora do app, ex.: testes)."""
+    data = getattr(page, "data", None)
+    container = data.get("container") if isinstance(data, dict) else None
+    return getattr(container, "metrics", None)
+
+
+def count_controls(root: Any) -> int:
+    """Controles na árvore a partir de root (inclui root)."""
+    total = 0
+    stack = [root]
+    while stack:
+        ctrl = stack.pop()
+        if ctrl is None:
+            continue
+        if isinstance(ctrl, (list, tuple)):
+            stack.extend(ctrl)
+            continue
+        if not isinstance(ctrl, ft.Control):
+            continue
+        total += 1
+        for attr in _CHILD_ATTRS:
+            child = getattr(ctrl, attr, None)
+            if child is not None:
+                stack.append(child)
+    return total
+
+
+def timed_render(page: ft.Page, name: str, render: Callable[[], None], root: ft.Control) -> Callable[[], None]:
+    """
+    Envolve o render_body de uma Page:
+    - "render.<name>": tempo do render (inclui o page.update() que ele chama)
+    - "render.<name>.controls": controles na árvore de root depois do render
+    Sem métricas no container, devolve render como está.
+    """
+    metrics = page_metrics(page)
+    if metrics is None:
+        return render
+    timing = f"render.{name}"
+    controls = metrics.histogram(f"render.{name}.controls", unit="controls")
+
+    def timed() -> None:
+        if not metrics.enabled:
+            render()
+            return
+        t0 = time.perf_counter()
+        try:
+            render()
+        finally:
+            metrics.record_duration(timing, t0)
+        controls.record(count_controls(root))
+
+    return timed
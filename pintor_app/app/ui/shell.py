@@ -1,5 +1,7 @@
 import flet as ft
 
+from app.ui.debounce import Debouncer
+
 
 class AppShell:
     """
@@ -10,11 +12,14 @@ class AppShell:
     """
 
     BREAKPOINT = 900  # largura para trocar mobile/desktop
+    RESIZE_DEBOUNCE_S = 0.15  # espera o fim do arrasto antes de olhar a largura
 
     def __init__(self, page: ft.Page, router):
         self.page = page
         self.router = router
         self.pagelet_mobile = None
+        self._desktop = None  # layout montado hoje (None = nada montado)
+        self._resize = Debouncer(page, self.RESIZE_DEBOUNCE_S)
 
         self.content_container = ft.Container(expand=True)
 
@@ -37,17 +42,23 @@ class AppShell:
     def mount(self):
         self.router.set_container(self.content_container)
 
-        # ouvir resize para responsividade
-        self.page.on_resize = lambda _: self._render()
+        # ouvir resize para responsividade (o conteúdo com expand se ajusta
+        # sozinho no cliente; só remonta ao cruzar o BREAKPOINT)
+        self.page.on_resize = lambda _: self._resize.call(self._on_resize_settled)
 
         self._render()
 
     # ---------- render principal ----------
 
+    def _on_resize_settled(self):
+        if self._is_desktop() != self._desktop:
+            self._render()
+
     def _render(self):
         self.page.controls.clear()
+        self._desktop = self._is_desktop()
 
-        if self._is_desktop():
+        if self._desktop:
             self.page.add(ft.Container(expand=True, content=self._build_desktop_layout()))
 
         else:
@@ -171,7 +182,7 @@ class AppShell:
     # ---------- helpers ----------
 
     def _is_desktop(self) -> bool:
-        return self.page.width >= self.BREAKPOINT
+        return (self.page.width or 0) >= self.BREAKPOINT
 
     def _selected_index(self) -> int:
         path = self.router.current_path or "/"
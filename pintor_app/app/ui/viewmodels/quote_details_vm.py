@@ -2,6 +2,7 @@ from dataclasses import dataclass
 
 @dataclass(slots=True)
 class QuoteItemVM:
+    item_id: str
     service_name: str
     unit: str
     quantity: int
@@ -26,4 +27,8 @@ class QuoteDetailsVM:
     total_sale_cents: int = 0
     total_sale_brl: str = ""
 
-    items: list[QuoteItemVM] = None  # type: ignore
+    notes_client: str = ""
+
+    # linhas ficam na lista virtual (buscadas por janela); aqui só contagem e versão
+    item_count: int = 0
+    items_version: int = 0
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from dataclasses import dataclass,field
+from dataclasses import dataclass
 
 
 @dataclass(slots=True)
@@ -29,7 +29,9 @@ class QuoteEditVM:
     total_sale_brl: str = ""
 
 
-    items: list[QuoteEditItemVM] = field(default_factory=list)
+    # linhas ficam na lista virtual (buscadas por janela); aqui só contagem e versão
+    item_count: int = 0
+    items_version: int = 0
 
     new_service_name: str = ""
     new_unit: str = ""
@@ -37,6 +39,8 @@ class QuoteEditVM:
     new_unit_price: str = ""
     new_adjustment: str = "0"
     form_error: str | None = None
+    # colar linhas de planilha: "serviço; unidade; quantidade; preço; ajuste"
+    paste_text: str = ""
     # no QuoteEditVM
     unit_locked: bool = True
     unit_price_locked: bool = True
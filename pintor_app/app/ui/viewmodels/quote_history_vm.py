@@ -0,0 +1,35 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+
+
+@dataclass(slots=True)
+class QuoteHistoryRowVM:
+    quote_id: str
+    customer_name: str
+    status: str
+    total_sale_brl: str
+    updated_at: str
+
+
+@dataclass(slots=True)
+class QuoteHistoryVM:
+    is_loading: bool = True
+    is_loading_more: bool = False
+    error: str | None = None
+
+    rows: list[QuoteHistoryRowVM] = field(default_factory=list)
+    next_cursor: str | None = None  # None => não há mais páginas
+
+    # busca: com query preenchida a lista mostra resultados ranqueados (paginação por offset)
+    query: str = ""
+    next_offset: int | None = None
+
+    @property
+    def is_searching(self) -> bool:
+        return bool(self.query.strip())
+
+    @property
+    def has_more(self) -> bool:
+        if self.is_searching:
+            return self.next_offset is not None
+        return self.next_cursor is not None